@@ -34,6 +34,15 @@ data "aws_iam_policy_document" "transcribe_policy" {
   }
   statement {
     sid = "2"
+    actions = [
+      "s3:ListBucket",
+    ]
+    resources = [
+      "arn:aws:s3:::${local.transcribe_s3_bucket_name}",
+    ]
+  }
+  statement {
+    sid = "3"
     actions = [
       "transcribe:*",
     ]
@@ -0,0 +1,45 @@
+#
+# This software is Copyright ©️ 2020 The University of Southern California. All Rights Reserved.
+# Permission to use, copy, modify, and distribute this software and its documentation for educational, research and non-profit purposes, without fee, and without a written agreement is hereby granted, provided that the above copyright notice and subject to the full license file found in the root of this software deliverable. Permission to make commercial use of this software may be obtained by contacting:  USC Stevens Center for Innovation University of Southern California 1150 S. Olive Street, Suite 2300, Los Angeles, CA 90115, USA Email: accounting@stevens.usc.edu
+#
+# The full terms of this copyright and license should always be found in the root directory of this software deliverable as "license.txt" and if these terms are not found with this software, please contact the USC Stevens Center for the full license.
+#
+from unittest.mock import Mock
+
+from transcribe_aws.cleanup import Cleaner
+
+
+def test_it_deletes_objects_in_chunks_and_each_job():
+    s3_client = Mock()
+    s3_client.delete_objects.return_value = {}
+    transcribe_client = Mock()
+    cleaner = Cleaner(s3_client, transcribe_client, "bucket", linger_secs=60)
+    cleaner.delete_later(s3_keys=[f"k{i}" for i in range(2500)], job_names=["j1", "j2"])
+    assert cleaner.flush(timeout=10)
+    assert [
+        len(c.kwargs["Delete"]["Objects"])
+        for c in s3_client.delete_objects.call_args_list
+    ] == [1000, 1000, 500]
+    assert all(
+        c.kwargs["Bucket"] == "bucket" for c in s3_client.delete_objects.call_args_list
+    )
+    assert [
+        c.kwargs["TranscriptionJobName"]
+        for c in transcribe_client.delete_transcription_job.call_args_list
+    ] == ["j1", "j2"]
+    cleaner.close()
+
+
+def test_it_keeps_going_when_deletes_fail():
+    s3_client = Mock()
+    s3_client.delete_objects.side_effect = Exception("access denied")
+    transcribe_client = Mock()
+    transcribe_client.delete_transcription_job.side_effect = [
+        Exception("not found"),
+        None,
+    ]
+    cleaner = Cleaner(s3_client, transcribe_client, "bucket", linger_secs=0)
+    cleaner.delete_later(s3_keys=["k1"], job_names=["j1", "j2"])
+    assert cleaner.flush(timeout=10)
+    assert transcribe_client.delete_transcription_job.call_count == 2
+    cleaner.close()
@@ -0,0 +1,33 @@
+#
+# This software is Copyright ©️ 2020 The University of Southern California. All Rights Reserved.
+# Permission to use, copy, modify, and distribute this software and its documentation for educational, research and non-profit purposes, without fee, and without a written agreement is hereby granted, provided that the above copyright notice and subject to the full license file found in the root of this software deliverable. Permission to make commercial use of this software may be obtained by contacting:  USC Stevens Center for Innovation University of Southern California 1150 S. Olive Street, Suite 2300, Los Angeles, CA 90115, USA Email: accounting@stevens.usc.edu
+#
+# The full terms of this copyright and license should always be found in the root directory of this software deliverable as "license.txt" and if these terms are not found with this software, please contact the USC Stevens Center for the full license.
+#
+import subprocess
+import sys
+
+# deletes queued just before exit, which would otherwise linger for 60 secs
+SCRIPT = """
+from unittest.mock import Mock
+from transcribe_aws.cleanup import Cleaner
+
+s3_client = Mock()
+s3_client.delete_objects.side_effect = lambda **kwargs: print(
+    "deleted", [o["Key"] for o in kwargs["Delete"]["Objects"]]
+) or {}
+transcribe_client = Mock()
+transcribe_client.delete_transcription_job.side_effect = lambda **kwargs: print(
+    "deleted", kwargs["TranscriptionJobName"]
+)
+cleaner = Cleaner(s3_client, transcribe_client, "bucket", linger_secs=60)
+cleaner.delete_later(s3_keys=["k1", "k2"], job_names=["j1"])
+"""
+
+
+def test_it_flushes_queued_deletes_at_exit():
+    result = subprocess.run(
+        [sys.executable, "-c", SCRIPT], capture_output=True, text=True, timeout=30
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.splitlines() == ["deleted ['k1', 'k2']", "deleted j1"]
@@ -0,0 +1,91 @@
+#
+# This software is Copyright ©️ 2020 The University of Southern California. All Rights Reserved.
+# Permission to use, copy, modify, and distribute this software and its documentation for educational, research and non-profit purposes, without fee, and without a written agreement is hereby granted, provided that the above copyright notice and subject to the full license file found in the root of this software deliverable. Permission to make commercial use of this software may be obtained by contacting:  USC Stevens Center for Innovation University of Southern California 1150 S. Olive Street, Suite 2300, Los Angeles, CA 90115, USA Email: accounting@stevens.usc.edu
+#
+# The full terms of this copyright and license should always be found in the root directory of this software deliverable as "license.txt" and if these terms are not found with this software, please contact the USC Stevens Center for the full license.
+#
+import os
+from unittest.mock import patch
+
+from botocore.config import Config
+
+from transcribe import init_transcription_service
+
+from .helpers import TEST_SERVICE_CONFIG
+
+
+def _boto_configs_by_client_type(mock_boto3_client):
+    return {c.args[0]: c.kwargs["config"] for c in mock_boto3_client.call_args_list}
+
+
+@patch("boto3.client")
+def test_it_configures_boto_clients_from_config(mock_boto3_client):
+    init_transcription_service(
+        module_path="transcribe_aws",
+        config={
+            **TEST_SERVICE_CONFIG,
+            "BOTO_CONFIG": Config(user_agent_extra="my-app"),
+            "BOTO_MAX_POOL_CONNECTIONS": 20,
+            "BOTO_RETRY_MODE": "adaptive",
+            "BOTO_MAX_ATTEMPTS": 6,
+            "BOTO_CONNECT_TIMEOUT": 3,
+            "BOTO_READ_TIMEOUT": 15,
+            "BOTO_TCP_KEEPALIVE": True,
+            "UPLOAD_CONCURRENCY": 16,
+            "S3_MAX_CONCURRENCY": 2,
+        },
+    )
+    configs = _boto_configs_by_client_type(mock_boto3_client)
+    for client_type in ["s3", "transcribe"]:
+        c = configs[client_type]
+        assert c.retries == {"mode": "adaptive", "max_attempts": 6}
+        assert c.connect_timeout == 3
+        assert c.read_timeout == 15
+        assert c.tcp_keepalive is True
+        assert c.user_agent_extra == "my-app"
+    # the s3 pool is always big enough for concurrent (multipart) uploads
+    assert configs["s3"].max_pool_connections == 32
+    assert configs["transcribe"].max_pool_connections == 20
+
+
+@patch("boto3.client")
+@patch.dict(
+    os.environ,
+    {
+        "TRANSCRIBE_AWS_BOTO_MAX_POOL_CONNECTIONS": "50",
+        "TRANSCRIBE_AWS_BOTO_TCP_KEEPALIVE": "true",
+    },
+)
+def test_it_configures_boto_clients_from_env(mock_boto3_client):
+    init_transcription_service(module_path="transcribe_aws", config=TEST_SERVICE_CONFIG)
+    configs = _boto_configs_by_client_type(mock_boto3_client)
+    for client_type in ["s3", "transcribe"]:
+        c = configs[client_type]
+        assert c.max_pool_connections == 50
+        assert c.tcp_keepalive is True
+        assert c.retries == {"mode": "standard", "max_attempts": 3}
+
+
+@patch("boto3.client")
+def test_it_keeps_the_settings_of_a_boto_config_passed_in(mock_boto3_client):
+    init_transcription_service(
+        module_path="transcribe_aws",
+        config={
+            **TEST_SERVICE_CONFIG,
+            "BOTO_CONFIG": Config(
+                max_pool_connections=50,
+                retries={"mode": "adaptive", "max_attempts": 10},
+                connect_timeout=5,
+                read_timeout=300,
+            ),
+            "BOTO_MAX_ATTEMPTS": 4,
+        },
+    )
+    configs = _boto_configs_by_client_type(mock_boto3_client)
+    for client_type in ["s3", "transcribe"]:
+        c = configs[client_type]
+        # only the BOTO_* vars that are set override the config passed in
+        assert c.max_pool_connections == 50
+        assert c.retries == {"mode": "adaptive", "max_attempts": 4}
+        assert c.connect_timeout == 5
+        assert c.read_timeout == 300
@@ -0,0 +1,32 @@
+#
+# This software is Copyright ©️ 2020 The University of Southern California. All Rights Reserved.
+# Permission to use, copy, modify, and distribute this software and its documentation for educational, research and non-profit purposes, without fee, and without a written agreement is hereby granted, provided that the above copyright notice and subject to the full license file found in the root of this software deliverable. Permission to make commercial use of this software may be obtained by contacting:  USC Stevens Center for Innovation University of Southern California 1150 S. Olive Street, Suite 2300, Los Angeles, CA 90115, USA Email: accounting@stevens.usc.edu
+#
+# The full terms of this copyright and license should always be found in the root directory of this software deliverable as "license.txt" and if these terms are not found with this software, please contact the USC Stevens Center for the full license.
+#
+from unittest.mock import patch
+
+from transcribe import init_transcription_service
+
+from .helpers import TEST_SERVICE_CONFIG
+
+
+@patch("boto3.client")
+def test_it_creates_a_pooled_http_session(mock_boto3_client):
+    service = init_transcription_service(
+        module_path="transcribe_aws",
+        config={
+            **TEST_SERVICE_CONFIG,
+            "HTTP_POOL_SIZE": 4,
+            "HTTP_MAX_RETRIES": 5,
+            "HTTP_CONNECT_TIMEOUT": 2,
+            "HTTP_READ_TIMEOUT": 30,
+            "TRANSCRIPT_FETCH_CONCURRENCY": 8,
+        },
+    )
+    adapter = service.http_session.get_adapter("https://s3.amazonaws.com/x")
+    # the pool is always big enough for concurrent transcript fetches
+    assert adapter._pool_maxsize == 8
+    assert adapter.max_retries.total == 5
+    assert service.http_connect_timeout == 2
+    assert service.http_read_timeout == 30
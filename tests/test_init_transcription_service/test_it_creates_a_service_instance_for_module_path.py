@@ -4,7 +4,7 @@
 #
 # The full terms of this copyright and license should always be found in the root directory of this software deliverable as "license.txt" and if these terms are not found with this software, please contact the USC Stevens Center for the full license.
 #
-from unittest.mock import patch
+from unittest.mock import ANY, patch
 from transcribe import init_transcription_service, TranscriptionService
 from .helpers import TEST_SERVICE_CONFIG
 
@@ -20,10 +20,12 @@ def test_it_creates_a_service_instance_for_module_path(mock_boto3_client):
         region_name="fake-region",
         aws_access_key_id="fake-access-key-id",
         aws_secret_access_key="fake-secret-access-key",
+        config=ANY,
     )
     mock_boto3_client.assert_any_call(
         "transcribe",
         region_name="fake-region",
         aws_access_key_id="fake-access-key-id",
         aws_secret_access_key="fake-secret-access-key",
+        config=ANY,
     )
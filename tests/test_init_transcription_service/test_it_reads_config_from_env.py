@@ -5,7 +5,7 @@
 # The full terms of this copyright and license should always be found in the root directory of this software deliverable as "license.txt" and if these terms are not found with this software, please contact the USC Stevens Center for the full license.
 #
 import os
-from unittest.mock import patch
+from unittest.mock import ANY, patch
 
 import pytest
 
@@ -33,10 +33,12 @@ def test_it_reads_config_from_env(mock_boto3_client):
         region_name="fake-region",
         aws_access_key_id="fake-access-key-id",
         aws_secret_access_key="fake-secret-access-key",
+        config=ANY,
     )
     mock_boto3_client.assert_any_call(
         "transcribe",
         region_name="fake-region",
         aws_access_key_id="fake-access-key-id",
         aws_secret_access_key="fake-secret-access-key",
+        config=ANY,
     )
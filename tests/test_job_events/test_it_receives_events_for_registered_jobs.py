@@ -0,0 +1,47 @@
+#
+# This software is Copyright ©️ 2020 The University of Southern California. All Rights Reserved.
+# Permission to use, copy, modify, and distribute this software and its documentation for educational, research and non-profit purposes, without fee, and without a written agreement is hereby granted, provided that the above copyright notice and subject to the full license file found in the root of this software deliverable. Permission to make commercial use of this software may be obtained by contacting:  USC Stevens Center for Innovation University of Southern California 1150 S. Olive Street, Suite 2300, Los Angeles, CA 90115, USA Email: accounting@stevens.usc.edu
+#
+# The full terms of this copyright and license should always be found in the root directory of this software deliverable as "license.txt" and if these terms are not found with this software, please contact the USC Stevens Center for the full license.
+#
+import json
+import time
+
+from transcribe_aws.job_events import parse_job_event, SqsJobEventSource
+
+from tests.test_transcribe.helpers import FakeSqsQueue
+
+
+def test_it_parses_events_delivered_directly_or_through_sns():
+    event = {
+        "source": "aws.transcribe",
+        "detail": {
+            "TranscriptionJobName": "b1-u1",
+            "TranscriptionJobStatus": "FAILED",
+        },
+    }
+    expected = {"TranscriptionJobName": "b1-u1", "TranscriptionJobStatus": "FAILED"}
+    assert parse_job_event(json.dumps(event)) == expected
+    assert parse_job_event(json.dumps({"Message": json.dumps(event)})) == expected
+    assert parse_job_event("not json") is None
+    assert parse_job_event(json.dumps({"detail": {}})) is None
+
+
+def test_it_receives_events_for_registered_jobs():
+    queue = FakeSqsQueue()
+    source = SqsJobEventSource(queue, "https://fake-queue", wait_secs=1)
+    source.add_jobs(["b1-u1", "b1-u2"])
+    queue.send_job_event("other-job", "COMPLETED")
+    queue.send_job_event("b1-u2", "COMPLETED")
+    assert source.wait(["b1-u1", "b1-u2"], timeout=5) == [
+        {"TranscriptionJobName": "b1-u2", "TranscriptionJobStatus": "COMPLETED"}
+    ]
+    # events are only taken once
+    assert source.take(["b1-u2"]) == []
+    # the queue is dedicated, so the unrelated message is deleted too
+    # (rather than received again after every visibility timeout)
+    deadline = time.time() + 5
+    while len(queue.deleted) < 2 and time.time() < deadline:
+        time.sleep(0.01)
+    assert sorted(queue.deleted) == ["r1", "r2"]
+    source.close()
@@ -0,0 +1,36 @@
+#
+# This software is Copyright ©️ 2020 The University of Southern California. All Rights Reserved.
+# Permission to use, copy, modify, and distribute this software and its documentation for educational, research and non-profit purposes, without fee, and without a written agreement is hereby granted, provided that the above copyright notice and subject to the full license file found in the root of this software deliverable. Permission to make commercial use of this software may be obtained by contacting:  USC Stevens Center for Innovation University of Southern California 1150 S. Olive Street, Suite 2300, Los Angeles, CA 90115, USA Email: accounting@stevens.usc.edu
+#
+# The full terms of this copyright and license should always be found in the root directory of this software deliverable as "license.txt" and if these terms are not found with this software, please contact the USC Stevens Center for the full license.
+#
+from transcribe import requests_to_job_batch, TranscribeJobRequest, TranscribeJobStatus
+
+from transcribe_aws.job_store import JobStore
+
+IN_FLIGHT = [TranscribeJobStatus.QUEUED, TranscribeJobStatus.IN_PROGRESS]
+
+
+def test_it_indexes_jobs_by_status():
+    store = JobStore()
+    for j in requests_to_job_batch(
+        "b1",
+        [TranscribeJobRequest(jobId=f"j{i}", sourceFile="a.wav") for i in range(4)],
+    ):
+        store.add(j)
+    assert store.count(TranscribeJobStatus.NONE) == 4
+    for jid in ["b1-j2", "b1-j0", "b1-j1"]:
+        store.update(jid, TranscribeJobStatus.QUEUED)
+    store.update("b1-j0", TranscribeJobStatus.IN_PROGRESS)
+    assert store.ids(IN_FLIGHT) == ["b1-j2", "b1-j1", "b1-j0"]
+    store.update("b1-j2", TranscribeJobStatus.SUCCEEDED, "hello")
+    store.update("b1-j1", TranscribeJobStatus.FAILED)
+    assert store.ids(IN_FLIGHT) == ["b1-j0"]
+    assert store.count([TranscribeJobStatus.SUCCEEDED, TranscribeJobStatus.FAILED]) == 2
+    store.remove("b1-j2")
+    assert store.count(TranscribeJobStatus.SUCCEEDED) == 0
+    assert store.summary().jobCountsByStatus == {
+        TranscribeJobStatus.NONE: 1,
+        TranscribeJobStatus.IN_PROGRESS: 1,
+        TranscribeJobStatus.FAILED: 1,
+    }
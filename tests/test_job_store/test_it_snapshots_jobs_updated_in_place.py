@@ -0,0 +1,56 @@
+#
+# This software is Copyright ©️ 2020 The University of Southern California. All Rights Reserved.
+# Permission to use, copy, modify, and distribute this software and its documentation for educational, research and non-profit purposes, without fee, and without a written agreement is hereby granted, provided that the above copyright notice and subject to the full license file found in the root of this software deliverable. Permission to make commercial use of this software may be obtained by contacting:  USC Stevens Center for Innovation University of Southern California 1150 S. Olive Street, Suite 2300, Los Angeles, CA 90115, USA Email: accounting@stevens.usc.edu
+#
+# The full terms of this copyright and license should always be found in the root directory of this software deliverable as "license.txt" and if these terms are not found with this software, please contact the USC Stevens Center for the full license.
+#
+from transcribe import (
+    requests_to_job_batch,
+    TranscribeBatchResult,
+    TranscribeJobRequest,
+    TranscribeJobStatus,
+)
+
+from transcribe_aws.job_store import JobStore
+
+
+def _jobs():
+    return requests_to_job_batch(
+        "b1",
+        [
+            TranscribeJobRequest(jobId="j1", sourceFile="a.wav"),
+            TranscribeJobRequest(jobId="j2", sourceFile="b.wav"),
+        ],
+    )
+
+
+def test_it_updates_jobs_like_a_batch_result():
+    jobs = _jobs()
+    store = JobStore()
+    expected = TranscribeBatchResult(transcribeJobsById={})
+    for j in jobs:
+        store.add(j)
+        expected.transcribeJobsById[j.get_fq_id()] = j
+    assert store.snapshot() == expected
+    assert store.update("b1-j1", TranscribeJobStatus.SUCCEEDED, "hello")
+    assert expected.update_job(
+        "b1-j1", status=TranscribeJobStatus.SUCCEEDED, transcript="hello"
+    )
+    assert not store.update("b1-j1", TranscribeJobStatus.SUCCEEDED, "hello")
+    assert store.snapshot() == expected
+    assert store.get("b1-j1").is_resolved()
+    assert store.summary() == expected.summary()
+
+
+def test_it_reuses_unchanged_jobs_and_never_changes_a_snapshot():
+    store = JobStore()
+    for j in _jobs():
+        store.add(j)
+    before = store.snapshot()
+    store.update("b1-j2", TranscribeJobStatus.QUEUED)
+    after = store.snapshot()
+    assert before.transcribeJobsById["b1-j2"].status == TranscribeJobStatus.NONE
+    assert after.transcribeJobsById["b1-j2"].status == TranscribeJobStatus.QUEUED
+    assert after.transcribeJobsById["b1-j1"] is before.transcribeJobsById["b1-j1"]
+    store.remove("b1-j1")
+    assert list(store.snapshot().transcribeJobsById.keys()) == ["b1-j2"]
@@ -0,0 +1,57 @@
+#
+# This software is Copyright ©️ 2020 The University of Southern California. All Rights Reserved.
+# Permission to use, copy, modify, and distribute this software and its documentation for educational, research and non-profit purposes, without fee, and without a written agreement is hereby granted, provided that the above copyright notice and subject to the full license file found in the root of this software deliverable. Permission to make commercial use of this software may be obtained by contacting:  USC Stevens Center for Innovation University of Southern California 1150 S. Olive Street, Suite 2300, Los Angeles, CA 90115, USA Email: accounting@stevens.usc.edu
+#
+# The full terms of this copyright and license should always be found in the root directory of this software deliverable as "license.txt" and if these terms are not found with this software, please contact the USC Stevens Center for the full license.
+#
+from transcribe_aws.polling import PollScheduler
+
+from tests.test_transcribe.helpers import FakeClock
+
+
+def _poll(clock: FakeClock, scheduler: PollScheduler, changed: bool = False) -> float:
+    interval = scheduler.next_interval()
+    clock.sleep(interval)
+    scheduler.on_poll(changed=changed)
+    return interval
+
+
+def test_it_backs_off_while_nothing_changes_and_resets_on_change():
+    clock = FakeClock()
+    scheduler = PollScheduler(1, 10, backoff=2, clock=clock)
+    assert [_poll(clock, scheduler) for _ in range(5)] == [1, 2, 4, 8, 10]
+    _poll(clock, scheduler, changed=True)
+    assert scheduler.next_interval() == 1
+
+
+def test_it_polls_at_the_expected_completion_of_a_job():
+    clock = FakeClock()
+    scheduler = PollScheduler(1, 60, backoff=2, clock=clock)
+    for _ in range(5):
+        _poll(clock, scheduler)
+    assert scheduler.next_interval() == 32
+    scheduler.on_job_started("j1", expected_secs=5)
+    scheduler.on_job_started("j2", expected_secs=20)
+    assert _poll(clock, scheduler) == 5
+    # expected completion for j1 has been served, so next up is j2
+    assert _poll(clock, scheduler) == 15
+    assert scheduler.next_interval() == 60
+
+
+def test_it_ignores_expected_completion_of_resolved_jobs():
+    clock = FakeClock()
+    scheduler = PollScheduler(2, 30, clock=clock)
+    scheduler.on_job_started("j1", expected_secs=10)
+    scheduler.on_job_started("j2", expected_secs=20)
+    assert scheduler.next_interval() == 2
+    clock.sleep(9.5)
+    # never polls sooner than min_interval
+    assert scheduler.next_interval() == 2
+    scheduler.on_job_resolved("j1")
+    _poll(clock, scheduler, changed=True)
+    assert scheduler.next_interval() == 2
+    scheduler.on_poll(changed=False)
+    scheduler.on_poll(changed=False)
+    assert scheduler.next_interval() == 8
+    clock.sleep(3)
+    assert scheduler.next_interval() == 5.5
@@ -0,0 +1,29 @@
+#
+# This software is Copyright ©️ 2020 The University of Southern California. All Rights Reserved.
+# Permission to use, copy, modify, and distribute this software and its documentation for educational, research and non-profit purposes, without fee, and without a written agreement is hereby granted, provided that the above copyright notice and subject to the full license file found in the root of this software deliverable. Permission to make commercial use of this software may be obtained by contacting:  USC Stevens Center for Innovation University of Southern California 1150 S. Olive Street, Suite 2300, Los Angeles, CA 90115, USA Email: accounting@stevens.usc.edu
+#
+# The full terms of this copyright and license should always be found in the root directory of this software deliverable as "license.txt" and if these terms are not found with this software, please contact the USC Stevens Center for the full license.
+#
+import wave
+
+from transcribe_aws.polling import estimate_audio_duration
+
+
+def test_it_reads_duration_from_a_wav_header(tmp_path):
+    wav_path = str(tmp_path / "a.wav")
+    with wave.open(wav_path, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(8000)
+        w.writeframes(b"\x00\x00" * 12000)
+    assert estimate_audio_duration(wav_path) == 1.5
+
+
+def test_it_estimates_duration_from_file_size_for_other_formats(tmp_path):
+    mp3_path = tmp_path / "a.mp3"
+    mp3_path.write_bytes(b"\x00" * 32000)
+    assert estimate_audio_duration(str(mp3_path)) == 2.0
+
+
+def test_it_returns_none_for_missing_files():
+    assert estimate_audio_duration("/no/such/file.wav") is None
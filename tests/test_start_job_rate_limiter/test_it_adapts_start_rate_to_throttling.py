@@ -0,0 +1,41 @@
+#
+# This software is Copyright ©️ 2020 The University of Southern California. All Rights Reserved.
+# Permission to use, copy, modify, and distribute this software and its documentation for educational, research and non-profit purposes, without fee, and without a written agreement is hereby granted, provided that the above copyright notice and subject to the full license file found in the root of this software deliverable. Permission to make commercial use of this software may be obtained by contacting:  USC Stevens Center for Innovation University of Southern California 1150 S. Olive Street, Suite 2300, Los Angeles, CA 90115, USA Email: accounting@stevens.usc.edu
+#
+# The full terms of this copyright and license should always be found in the root directory of this software deliverable as "license.txt" and if these terms are not found with this software, please contact the USC Stevens Center for the full license.
+#
+import pytest
+
+from transcribe_aws.rate_limit import StartJobRateLimiter
+
+from tests.test_transcribe.helpers import FakeClock
+
+
+def test_it_adapts_start_rate_to_throttling():
+    clock = FakeClock()
+    limiter = StartJobRateLimiter(max_rate=4, min_backoff=0.5, clock=clock)
+    # a full bucket allows a burst of max_rate starts...
+    for _ in range(4):
+        assert limiter.acquire()
+        limiter.on_started()
+    # ...then starts are paced at the current rate
+    assert limiter.delay() == pytest.approx(0.25)
+    clock.sleep(0.25)
+    assert limiter.acquire()
+    limiter.on_throttled()
+    assert limiter.stats().rate == 2
+    assert limiter.delay() == pytest.approx(0.5)
+    clock.sleep(0.5)
+    assert limiter.acquire()
+    limiter.on_throttled()
+    assert limiter.stats().rate == 1
+    # backoff doubles on consecutive throttles
+    assert limiter.delay() == pytest.approx(1.0)
+    clock.sleep(1.0)
+    assert limiter.acquire()
+    limiter.on_started()
+    stats = limiter.stats()
+    assert stats.rate == pytest.approx(1.2)
+    assert stats.throttles == 2
+    assert stats.retries == 2
+    assert stats.starts == 5
@@ -0,0 +1,54 @@
+#
+# This software is Copyright ©️ 2020 The University of Southern California. All Rights Reserved.
+# Permission to use, copy, modify, and distribute this software and its documentation for educational, research and non-profit purposes, without fee, and without a written agreement is hereby granted, provided that the above copyright notice and subject to the full license file found in the root of this software deliverable. Permission to make commercial use of this software may be obtained by contacting:  USC Stevens Center for Innovation University of Southern California 1150 S. Olive Street, Suite 2300, Los Angeles, CA 90115, USA Email: accounting@stevens.usc.edu
+#
+# The full terms of this copyright and license should always be found in the root directory of this software deliverable as "license.txt" and if these terms are not found with this software, please contact the USC Stevens Center for the full license.
+#
+from transcribe_aws.rate_limit import StartJobRateLimiter
+
+from tests.test_transcribe.helpers import FakeClock
+
+
+def _start(limiter: StartJobRateLimiter, n: int) -> None:
+    for _ in range(n):
+        assert limiter.acquire()
+        limiter.on_started()
+
+
+def test_it_learns_max_in_flight_from_limit_exceeded():
+    clock = FakeClock()
+    limiter = StartJobRateLimiter(max_rate=100, min_backoff=1.0, clock=clock)
+    _start(limiter, 3)
+    assert limiter.acquire()
+    limiter.on_throttled(limit_exceeded=True)
+    stats = limiter.stats()
+    assert stats.max_in_flight == 3
+    assert stats.throttles == 1
+    # no start until the backoff has elapsed...
+    assert limiter.delay() == 1.0
+    assert not limiter.acquire()
+    clock.sleep(1.0)
+    # ...then a single probe past the learned limit
+    assert limiter.acquire()
+    assert limiter.delay() > 0
+    limiter.on_started()
+    stats = limiter.stats()
+    assert stats.max_in_flight == 4
+    assert stats.in_flight == 4
+    assert stats.retries == 1
+    # once jobs resolve, starts resume without waiting on a backoff
+    assert limiter.delay() > 0
+    limiter.on_resolved(2)
+    assert limiter.delay() == 0
+    _start(limiter, 2)
+    assert limiter.delay() > 0
+
+
+def test_it_never_exceeds_a_configured_ceiling_of_jobs_in_flight():
+    limiter = StartJobRateLimiter(max_rate=100, max_in_flight=2, clock=FakeClock())
+    _start(limiter, 2)
+    assert limiter.delay() == float("inf")
+    assert not limiter.acquire()
+    limiter.on_resolved(1)
+    _start(limiter, 1)
+    assert limiter.stats().in_flight == 2
@@ -0,0 +1,89 @@
+#
+# This software is Copyright ©️ 2020 The University of Southern California. All Rights Reserved.
+# Permission to use, copy, modify, and distribute this software and its documentation for educational, research and non-profit purposes, without fee, and without a written agreement is hereby granted, provided that the above copyright notice and subject to the full license file found in the root of this software deliverable. Permission to make commercial use of this software may be obtained by contacting:  USC Stevens Center for Innovation University of Southern California 1150 S. Olive Street, Suite 2300, Los Angeles, CA 90115, USA Email: accounting@stevens.usc.edu
+#
+# The full terms of this copyright and license should always be found in the root directory of this software deliverable as "license.txt" and if these terms are not found with this software, please contact the USC Stevens Center for the full license.
+#
+from unittest.mock import Mock
+
+from transcribe_aws.status_sweep import StatusSweeper
+
+from tests.test_transcribe.helpers import FakeClock
+
+
+def _summary(jid: str, status: str = "COMPLETED"):
+    return {"TranscriptionJobName": jid, "TranscriptionJobStatus": status}
+
+
+def test_it_shares_one_sweep_between_batches_polling_in_the_same_interval():
+    clock = FakeClock()
+    list_jobs = Mock(
+        return_value={
+            "TranscriptionJobSummaries": [
+                _summary("b2-u1"),
+                _summary("other-job"),
+                _summary("b1-u1", "IN_PROGRESS"),
+            ]
+        }
+    )
+    get_batch_status = Mock()
+    sweeper = StatusSweeper(list_jobs, get_batch_status, min_interval=5, clock=clock)
+    # b2 has registered (with an earlier poll) by the time b1 sweeps
+    sweeper.get_status("b2", ["b2-u1"])
+    clock.sleep(5)
+    assert sweeper.get_status("b1", ["b1-u1"]) == [_summary("b1-u1", "IN_PROGRESS")]
+    clock.sleep(1)
+    assert sweeper.get_status("b2", ["b2-u1"]) == [_summary("b2-u1")]
+    assert list_jobs.call_count == 2
+    list_jobs.assert_called_with(MaxResults=100)
+    get_batch_status.assert_not_called()
+    # once the interval has passed, the next poll sweeps again
+    clock.sleep(5)
+    sweeper.get_status("b2", ["b2-u1"])
+    assert list_jobs.call_count == 3
+
+
+def test_it_lists_batches_the_sweep_missed_individually_in_turn():
+    clock = FakeClock()
+    list_jobs = Mock(
+        return_value={
+            "TranscriptionJobSummaries": [_summary("other-job")],
+            "NextToken": "more",
+        }
+    )
+    get_batch_status = Mock(
+        side_effect=lambda bid, jids: [_summary(jid) for jid in jids]
+    )
+    sweeper = StatusSweeper(
+        list_jobs,
+        get_batch_status,
+        min_interval=5,
+        max_pages=2,
+        max_batch_calls=1,
+        clock=clock,
+    )
+    sweeper.get_status("b1", ["b1-u1"])
+    clock.sleep(5)
+    sweeper.get_status("b2", ["b2-u1"])
+    clock.sleep(5)
+    sweeper.get_status("b1", ["b1-u1"])
+    assert list_jobs.call_count == 6
+    list_jobs.assert_called_with(MaxResults=100, NextToken="more")
+    # each sweep lists only one batch individually, taking turns
+    assert [c.args for c in get_batch_status.call_args_list] == [
+        ("b1", ["b1-u1"]),
+        ("b2", ["b2-u1"]),
+        ("b1", ["b1-u1"]),
+    ]
+    assert sweeper.stats().batch_calls == 3
+
+
+def test_it_stops_sweeping_for_a_batch_once_unregistered():
+    clock = FakeClock()
+    list_jobs = Mock(return_value={"TranscriptionJobSummaries": [_summary("b1-u1")]})
+    sweeper = StatusSweeper(list_jobs, Mock(), min_interval=5, clock=clock)
+    sweeper.get_status("b1", ["b1-u1"])
+    sweeper.unregister("b1")
+    clock.sleep(5)
+    assert sweeper.get_status("b2", []) == []
+    assert list_jobs.call_count == 1
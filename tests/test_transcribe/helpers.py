@@ -5,7 +5,9 @@
 # The full terms of this copyright and license should always be found in the root directory of this software deliverable as "license.txt" and if these terms are not found with this software, please contact the USC Stevens Center for the full license.
 #
 from dataclasses import dataclass, field
+import json
 import requests_mock
+import threading
 from typing import Any, Callable, Dict, List, Optional, Tuple
 from unittest.mock import call, patch, Mock
 
@@ -24,6 +26,81 @@ def raise_limit_exceeded():
     raise FakeLimitExceededException()
 
 
+class FakeClock:
+    """
+    A clock for the service's limiters that only advances
+    when the (mocked) time.sleep is called
+    """
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, secs: float) -> None:
+        self.now += secs
+
+
+class FakeSqsQueue:
+    """
+    An in-memory stand-in for an sqs client with a single queue
+    receiving Transcribe Job State Change events
+    """
+
+    def __init__(self, visibility_timeout: float = 0.1):
+        self.visibility_timeout = visibility_timeout
+        self.messages: List[Dict[str, str]] = []
+        self.deleted: List[str] = []
+        self._cond = threading.Condition()
+        self._next_id = 0
+
+    def send_job_event(self, job_name: str, status: str) -> None:
+        self.send_message(
+            json.dumps(
+                {
+                    "source": "aws.transcribe",
+                    "detail-type": "Transcribe Job State Change",
+                    "detail": {
+                        "TranscriptionJobName": job_name,
+                        "TranscriptionJobStatus": status,
+                    },
+                }
+            )
+        )
+
+    def send_message(self, body: str) -> None:
+        with self._cond:
+            self._next_id += 1
+            self.messages.append({"ReceiptHandle": f"r{self._next_id}", "Body": body})
+            self._cond.notify_all()
+
+    def receive_message(
+        self, QueueUrl="", MaxNumberOfMessages=1, WaitTimeSeconds=0, **kwargs
+    ):
+        with self._cond:
+            self._cond.wait_for(lambda: self.messages, timeout=WaitTimeSeconds)
+            received = self.messages[:MaxNumberOfMessages]
+            del self.messages[:MaxNumberOfMessages]
+        # received messages become visible again unless deleted
+        for m in received:
+            t = threading.Timer(self.visibility_timeout, self._redeliver, [m])
+            t.daemon = True
+            t.start()
+        return {"Messages": received}
+
+    def delete_message_batch(self, QueueUrl="", Entries=[]):
+        with self._cond:
+            self.deleted.extend(e["ReceiptHandle"] for e in Entries)
+        return {"Successful": [{"Id": e["Id"]} for e in Entries]}
+
+    def _redeliver(self, message: Dict[str, str]) -> None:
+        with self._cond:
+            if message["ReceiptHandle"] not in self.deleted:
+                self.messages.append(message)
+                self._cond.notify_all()
+
+
 @dataclass
 class AwsTranscribeStartJobCall:
     expected_args: Dict[str, Any]
@@ -71,14 +148,17 @@ class TranscribeTestFixture:
         default_factory=lambda: TranscribeBatchResult()
     )
     expected_sleep_calls: List[float] = field(default_factory=lambda: [])
+    service_config: Dict[str, Any] = field(default_factory=lambda: {})
 
 
 TEST_TRANSCRIBE_SOURCE_BUCKET = "test_transcribe_source_bucket"
 TEST_AWS_REGION = "fake_aws_region"
 
 
-def create_service(mock_boto3_client) -> Tuple[AWSTranscriptionService, Any, Any]:
-    mock_s3_client = Bunch(upload_file=Mock())
+def create_service(
+    mock_boto3_client, config: Dict[str, Any] = {}
+) -> Tuple[AWSTranscriptionService, Any, Any]:
+    mock_s3_client = Bunch(head_object=Mock(), upload_file=Mock())
     mock_transcribe_client = Bunch(
         get_transcription_job=Mock(),
         list_transcription_jobs=Mock(),
@@ -102,6 +182,7 @@ def create_service(mock_boto3_client) -> Tuple[AWSTranscriptionService, Any, Any
             "AWS_SECRET_ACCESS_KEY": "fake_aws_secret_access_key",
             "AWS_ACCESS_KEY_ID": "fake_aws_access_key_id",
             "TRANSCRIBE_AWS_S3_BUCKET_SOURCE": TEST_TRANSCRIBE_SOURCE_BUCKET,
+            **config,
         }
     )
     return (service, mock_s3_client, mock_transcribe_client)
@@ -112,8 +193,11 @@ def run_transcribe_test(mock_boto3_client: Mock, fixture: TranscribeTestFixture)
         "transcribe_aws.next_batch_id"
     ) as mock_next_batch_id:
         transcribe_service, mock_s3_client, mock_transcribe_client = create_service(
-            mock_boto3_client
+            mock_boto3_client, fixture.service_config
         )
+        clock = FakeClock()
+        mock_sleep.side_effect = clock.sleep
+        transcribe_service.clock = clock
         mock_next_batch_id.return_value = fixture.mock_next_batch_id
         batch_id_effective = fixture.batch_id or fixture.mock_next_batch_id
         spy_on_update = Mock()
@@ -144,6 +228,7 @@ def run_transcribe_test(mock_boto3_client: Mock, fixture: TranscribeTestFixture)
                     TEST_TRANSCRIBE_SOURCE_BUCKET,
                     input_s3_path,
                     ExtraArgs={"ACL": "public-read"},
+                    Config=transcribe_service.s3_transfer_config,
                 )
             )
             if not fixture.override_expected_start_job_calls:
@@ -0,0 +1,105 @@
+#
+# This software is Copyright ©️ 2020 The University of Southern California. All Rights Reserved.
+# Permission to use, copy, modify, and distribute this software and its documentation for educational, research and non-profit purposes, without fee, and without a written agreement is hereby granted, provided that the above copyright notice and subject to the full license file found in the root of this software deliverable. Permission to make commercial use of this software may be obtained by contacting:  USC Stevens Center for Innovation University of Southern California 1150 S. Olive Street, Suite 2300, Los Angeles, CA 90115, USA Email: accounting@stevens.usc.edu
+#
+# The full terms of this copyright and license should always be found in the root directory of this software deliverable as "license.txt" and if these terms are not found with this software, please contact the USC Stevens Center for the full license.
+#
+from typing import Dict, List
+from unittest.mock import patch
+
+from transcribe import TranscribeJobRequest, TranscribeJobStatus
+
+from .helpers import create_service
+
+
+@patch("boto3.client")
+def test_it_admits_jobs_as_others_resolve_when_windowed(mock_boto3_client):
+    service, mock_s3_client, mock_transcribe_client = create_service(
+        mock_boto3_client, {"BATCH_WINDOW": 2}
+    )
+    started: List[str] = []
+    max_unresolved = 0
+    aws_status: Dict[str, str] = {}
+
+    def _start_transcription_job(TranscriptionJobName="", **kwargs):
+        nonlocal max_unresolved
+        started.append(TranscriptionJobName)
+        aws_status[TranscriptionJobName] = "IN_PROGRESS"
+        max_unresolved = max(
+            max_unresolved, list(aws_status.values()).count("IN_PROGRESS")
+        )
+
+    def _list_transcription_jobs(**kwargs):
+        # each poll, the oldest job in progress fails
+        in_progress = [j for j, s in aws_status.items() if s == "IN_PROGRESS"]
+        if in_progress:
+            aws_status[in_progress[0]] = "FAILED"
+        return {
+            "TranscriptionJobSummaries": [
+                {"TranscriptionJobName": j, "TranscriptionJobStatus": s}
+                for j, s in aws_status.items()
+            ]
+        }
+
+    mock_transcribe_client.start_transcription_job.side_effect = (
+        _start_transcription_job
+    )
+    mock_transcribe_client.list_transcription_jobs.side_effect = (
+        _list_transcription_jobs
+    )
+    requests_taken = 0
+
+    def _requests():
+        nonlocal requests_taken
+        for i in range(5):
+            requests_taken += 1
+            yield TranscribeJobRequest(jobId=f"u{i}", sourceFile=f"/audio/u{i}.wav")
+
+    max_jobs_held = 0
+
+    def _on_update(update):
+        nonlocal max_jobs_held
+        max_jobs_held = max(max_jobs_held, len(update.result.transcribeJobsById))
+
+    yielded = []
+    with patch("time.sleep"):
+        for job in service.transcribe_iter(
+            _requests(), batch_id="b1", on_update=_on_update
+        ):
+            yielded.append((job.jobId, job.status, requests_taken))
+    # requests are pulled only as the window frees up
+    assert yielded == [
+        ("u0", TranscribeJobStatus.FAILED, 2),
+        ("u1", TranscribeJobStatus.FAILED, 3),
+        ("u2", TranscribeJobStatus.FAILED, 4),
+        ("u3", TranscribeJobStatus.FAILED, 5),
+        ("u4", TranscribeJobStatus.FAILED, 5),
+    ]
+    assert started == [f"b1-u{i}" for i in range(5)]
+    assert max_unresolved == 2
+    # jobs already yielded are dropped from the working result
+    assert max_jobs_held == 2
+    assert mock_s3_client.upload_file.call_count == 5
+
+
+@patch("boto3.client")
+def test_it_returns_all_jobs_from_transcribe_when_windowed(mock_boto3_client):
+    service, _, mock_transcribe_client = create_service(
+        mock_boto3_client, {"BATCH_WINDOW": 2}
+    )
+    mock_transcribe_client.list_transcription_jobs.side_effect = lambda **kwargs: {
+        "TranscriptionJobSummaries": [
+            {"TranscriptionJobName": f"b1-u{i}", "TranscriptionJobStatus": "FAILED"}
+            for i in range(5)
+        ]
+    }
+    with patch("time.sleep"):
+        result = service.transcribe(
+            (
+                TranscribeJobRequest(jobId=f"u{i}", sourceFile=f"/audio/u{i}.wav")
+                for i in range(5)
+            ),
+            batch_id="b1",
+        )
+    assert sorted(result.transcribeJobsById.keys()) == [f"b1-u{i}" for i in range(5)]
+    assert not result.has_any_unresolved()
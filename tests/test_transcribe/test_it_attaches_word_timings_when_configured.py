@@ -0,0 +1,62 @@
+#
+# This software is Copyright ©️ 2020 The University of Southern California. All Rights Reserved.
+# Permission to use, copy, modify, and distribute this software and its documentation for educational, research and non-profit purposes, without fee, and without a written agreement is hereby granted, provided that the above copyright notice and subject to the full license file found in the root of this software deliverable. Permission to make commercial use of this software may be obtained by contacting:  USC Stevens Center for Innovation University of Southern California 1150 S. Olive Street, Suite 2300, Los Angeles, CA 90115, USA Email: accounting@stevens.usc.edu
+#
+# The full terms of this copyright and license should always be found in the root directory of this software deliverable as "license.txt" and if these terms are not found with this software, please contact the USC Stevens Center for the full license.
+#
+from unittest.mock import patch
+
+import requests_mock
+
+from transcribe import TranscribeJobRequest, TranscribeJobStatus
+
+from transcribe_aws.cache import SqliteTranscriptCache
+from transcribe_aws.word_timings import WordTimings
+
+from .helpers import create_service
+
+ITEMS = [
+    {
+        "start_time": "0.5",
+        "end_time": "0.9",
+        "alternatives": [{"confidence": "0.9", "content": "hello"}],
+        "type": "pronunciation",
+    }
+]
+
+
+@patch("boto3.client")
+def test_it_attaches_word_timings_when_configured(mock_boto3_client, tmp_path):
+    cache = SqliteTranscriptCache(str(tmp_path / "cache.db"))
+    service, mock_s3_client, mock_transcribe_client = create_service(
+        mock_boto3_client, {"WORD_TIMINGS": True, "TRANSCRIPT_CACHE": cache}
+    )
+    (tmp_path / "u1.wav").write_bytes(b"audio")
+    mock_transcribe_client.list_transcription_jobs.return_value = {
+        "TranscriptionJobSummaries": [
+            {"TranscriptionJobName": "b1-u1", "TranscriptionJobStatus": "COMPLETED"}
+        ]
+    }
+    mock_transcribe_client.get_transcription_job.return_value = {
+        "TranscriptionJob": {"Transcript": {"TranscriptFileUri": "http://fake/b1-u1"}}
+    }
+    requests = [TranscribeJobRequest(jobId="u1", sourceFile=str(tmp_path / "u1.wav"))]
+    with patch("time.sleep"), requests_mock.Mocker() as mock_requests:
+        mock_requests.get(
+            "http://fake/b1-u1",
+            json={
+                "results": {"transcripts": [{"transcript": "hello"}], "items": ITEMS}
+            },
+        )
+        result = service.transcribe(requests, batch_id="b1")
+    # the second time, the transcript and timings both come from the cache
+    result_cached = service.transcribe(requests, batch_id="b2")
+    assert mock_transcribe_client.start_transcription_job.call_count == 1
+    for r in [result, result_cached]:
+        job = r.first()
+        assert job is not None and job.status == TranscribeJobStatus.SUCCEEDED
+        assert job.transcript == "hello"
+        timings = WordTimings.from_job(job)
+        assert timings is not None
+        assert [(s, e, w) for s, e, _, w in timings.words()] == [(0.5, 0.9, "hello")]
+    cache.close()
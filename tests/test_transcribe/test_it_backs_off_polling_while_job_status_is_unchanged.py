@@ -0,0 +1,89 @@
+#
+# This software is Copyright ©️ 2020 The University of Southern California. All Rights Reserved.
+# Permission to use, copy, modify, and distribute this software and its documentation for educational, research and non-profit purposes, without fee, and without a written agreement is hereby granted, provided that the above copyright notice and subject to the full license file found in the root of this software deliverable. Permission to make commercial use of this software may be obtained by contacting:  USC Stevens Center for Innovation University of Southern California 1150 S. Olive Street, Suite 2300, Los Angeles, CA 90115, USA Email: accounting@stevens.usc.edu
+#
+# The full terms of this copyright and license should always be found in the root directory of this software deliverable as "license.txt" and if these terms are not found with this software, please contact the USC Stevens Center for the full license.
+#
+import pytest
+from unittest.mock import patch
+
+from transcribe import (
+    TranscribeBatchResult,
+    TranscribeJob,
+    TranscribeJobRequest,
+    TranscribeJobStatus,
+)
+
+from .helpers import (
+    run_transcribe_test,
+    AwsTranscribeGetJobCall,
+    AwsTranscribeListJobsCall,
+    TranscribeTestFixture,
+)
+
+
+def _list_jobs_call(status: str) -> AwsTranscribeListJobsCall:
+    return AwsTranscribeListJobsCall(
+        result={
+            "TranscriptionJobSummaries": [
+                {"TranscriptionJobName": "b1-m1-u1", "TranscriptionJobStatus": status}
+            ]
+        }
+    )
+
+
+@patch("boto3.client")
+@pytest.mark.parametrize(
+    "fixture",
+    [
+        (
+            TranscribeTestFixture(
+                service_config={"POLL_INTERVAL_MIN": 1, "POLL_INTERVAL_MAX": 4},
+                requests=[
+                    TranscribeJobRequest(jobId="m1-u1", sourceFile="/audio/m1/u1.wav")
+                ],
+                list_jobs_calls=[
+                    _list_jobs_call("QUEUED"),
+                    _list_jobs_call("QUEUED"),
+                    _list_jobs_call("QUEUED"),
+                    _list_jobs_call("IN_PROGRESS"),
+                    _list_jobs_call("IN_PROGRESS"),
+                    _list_jobs_call("COMPLETED"),
+                ],
+                get_job_calls=[
+                    AwsTranscribeGetJobCall(
+                        name="b1-m1-u1",
+                        result={
+                            "TranscriptionJob": {
+                                "TranscriptionJobStatus": "COMPLETED",
+                                "Transcript": {
+                                    "TranscriptFileUri": "http://fake/b1-m1-u1"
+                                },
+                            }
+                        },
+                        transcribe_url_response={
+                            "results": {"transcripts": [{"transcript": "hello"}]}
+                        },
+                    )
+                ],
+                expected_sleep_calls=[1, 2, 4, 4, 1, 2],
+                expected_result=TranscribeBatchResult(
+                    transcribeJobsById={
+                        "b1-m1-u1": TranscribeJob(
+                            batchId="b1",
+                            jobId="m1-u1",
+                            sourceFile="/audio/m1/u1.wav",
+                            mediaFormat="wav",
+                            status=TranscribeJobStatus.SUCCEEDED,
+                            transcript="hello",
+                        )
+                    }
+                ),
+            )
+        )
+    ],
+)
+def test_it_backs_off_polling_while_job_status_is_unchanged(
+    mock_boto3_client, fixture: TranscribeTestFixture
+):
+    run_transcribe_test(mock_boto3_client, fixture)
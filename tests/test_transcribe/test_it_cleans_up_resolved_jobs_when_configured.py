@@ -0,0 +1,57 @@
+#
+# This software is Copyright ©️ 2020 The University of Southern California. All Rights Reserved.
+# Permission to use, copy, modify, and distribute this software and its documentation for educational, research and non-profit purposes, without fee, and without a written agreement is hereby granted, provided that the above copyright notice and subject to the full license file found in the root of this software deliverable. Permission to make commercial use of this software may be obtained by contacting:  USC Stevens Center for Innovation University of Southern California 1150 S. Olive Street, Suite 2300, Los Angeles, CA 90115, USA Email: accounting@stevens.usc.edu
+#
+# The full terms of this copyright and license should always be found in the root directory of this software deliverable as "license.txt" and if these terms are not found with this software, please contact the USC Stevens Center for the full license.
+#
+from unittest.mock import Mock, patch
+
+import requests_mock
+
+from transcribe import TranscribeJobRequest, TranscribeJobStatus
+
+from .helpers import create_service
+
+
+@patch("boto3.client")
+def test_it_cleans_up_resolved_jobs_when_configured(mock_boto3_client):
+    service, mock_s3_client, mock_transcribe_client = create_service(
+        mock_boto3_client, {"CLEANUP": True, "CLEANUP_LINGER_SECS": 60}
+    )
+    mock_s3_client.delete_objects = Mock(return_value={})
+    mock_transcribe_client.delete_transcription_job = Mock()
+    mock_transcribe_client.list_transcription_jobs.return_value = {
+        "TranscriptionJobSummaries": [
+            {"TranscriptionJobName": "b1-u1", "TranscriptionJobStatus": "COMPLETED"},
+            {"TranscriptionJobName": "b1-u2", "TranscriptionJobStatus": "FAILED"},
+        ]
+    }
+    mock_transcribe_client.get_transcription_job.return_value = {
+        "TranscriptionJob": {"Transcript": {"TranscriptFileUri": "http://fake/b1-u1"}}
+    }
+    with patch("time.sleep"), requests_mock.Mocker() as mock_requests:
+        mock_requests.get(
+            "http://fake/b1-u1",
+            json={"results": {"transcripts": [{"transcript": "t1"}]}},
+        )
+        result = service.transcribe(
+            [
+                TranscribeJobRequest(jobId="u1", sourceFile="u1.wav"),
+                TranscribeJobRequest(jobId="u2", sourceFile="u2.wav"),
+            ],
+            batch_id="b1",
+        )
+    assert {j.jobId: j.status for j in result.jobs()} == {
+        "u1": TranscribeJobStatus.SUCCEEDED,
+        "u2": TranscribeJobStatus.FAILED,
+    }
+    assert service.flush_cleanup(timeout=10)
+    # the staged files are deleted together, and each of the jobs
+    assert [
+        sorted(o["Key"] for o in c.kwargs["Delete"]["Objects"])
+        for c in mock_s3_client.delete_objects.call_args_list
+    ] == [sorted(c.args[2] for c in mock_s3_client.upload_file.call_args_list)]
+    assert sorted(
+        c.kwargs["TranscriptionJobName"]
+        for c in mock_transcribe_client.delete_transcription_job.call_args_list
+    ) == ["b1-u1", "b1-u2"]
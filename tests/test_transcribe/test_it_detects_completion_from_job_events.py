@@ -0,0 +1,53 @@
+#
+# This software is Copyright ©️ 2020 The University of Southern California. All Rights Reserved.
+# Permission to use, copy, modify, and distribute this software and its documentation for educational, research and non-profit purposes, without fee, and without a written agreement is hereby granted, provided that the above copyright notice and subject to the full license file found in the root of this software deliverable. Permission to make commercial use of this software may be obtained by contacting:  USC Stevens Center for Innovation University of Southern California 1150 S. Olive Street, Suite 2300, Los Angeles, CA 90115, USA Email: accounting@stevens.usc.edu
+#
+# The full terms of this copyright and license should always be found in the root directory of this software deliverable as "license.txt" and if these terms are not found with this software, please contact the USC Stevens Center for the full license.
+#
+from unittest.mock import patch
+
+import requests_mock
+
+from transcribe import TranscribeJobRequest, TranscribeJobStatus
+
+from transcribe_aws.job_events import SqsJobEventSource
+
+from .helpers import create_service, FakeSqsQueue
+
+
+@patch("boto3.client")
+def test_it_detects_completion_from_job_events(mock_boto3_client):
+    service, _, mock_transcribe_client = create_service(mock_boto3_client)
+    queue = FakeSqsQueue()
+    service.job_event_source = SqsJobEventSource(
+        queue, "https://fake-queue", wait_secs=1
+    )
+    service.completion_queue_fallback_poll_interval = 60
+    mock_transcribe_client.start_transcription_job.side_effect = (
+        lambda TranscriptionJobName="", **kwargs: queue.send_job_event(
+            TranscriptionJobName,
+            "FAILED" if TranscriptionJobName == "b1-u2" else "COMPLETED",
+        )
+    )
+    mock_transcribe_client.get_transcription_job.return_value = {
+        "TranscriptionJob": {"Transcript": {"TranscriptFileUri": "http://fake/b1-u1"}}
+    }
+    with requests_mock.Mocker() as mock_requests:
+        mock_requests.get(
+            "http://fake/b1-u1",
+            json={"results": {"transcripts": [{"transcript": "a transcript"}]}},
+        )
+        result = service.transcribe(
+            [
+                TranscribeJobRequest(jobId=jid, sourceFile=f"/audio/{jid}.wav")
+                for jid in ["u1", "u2"]
+            ],
+            batch_id="b1",
+        )
+    service.job_event_source.close()
+    assert {j.jobId: (j.status, j.transcript) for j in result.jobs()} == {
+        "u1": (TranscribeJobStatus.SUCCEEDED, "a transcript"),
+        "u2": (TranscribeJobStatus.FAILED, ""),
+    }
+    # completions came from events, well before the fallback poll
+    mock_transcribe_client.list_transcription_jobs.assert_not_called()
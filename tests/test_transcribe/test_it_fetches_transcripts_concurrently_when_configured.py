@@ -0,0 +1,71 @@
+#
+# This software is Copyright ©️ 2020 The University of Southern California. All Rights Reserved.
+# Permission to use, copy, modify, and distribute this software and its documentation for educational, research and non-profit purposes, without fee, and without a written agreement is hereby granted, provided that the above copyright notice and subject to the full license file found in the root of this software deliverable. Permission to make commercial use of this software may be obtained by contacting:  USC Stevens Center for Innovation University of Southern California 1150 S. Olive Street, Suite 2300, Los Angeles, CA 90115, USA Email: accounting@stevens.usc.edu
+#
+# The full terms of this copyright and license should always be found in the root directory of this software deliverable as "license.txt" and if these terms are not found with this software, please contact the USC Stevens Center for the full license.
+#
+import threading
+from unittest.mock import patch, Mock
+
+import requests_mock
+
+from transcribe import TranscribeJobRequest, TranscribeJobStatus
+
+from .helpers import create_service
+
+
+@patch("boto3.client")
+def test_it_fetches_transcripts_concurrently_when_configured(mock_boto3_client):
+    service, _, mock_transcribe_client = create_service(
+        mock_boto3_client, {"TRANSCRIPT_FETCH_CONCURRENCY": 3}
+    )
+    mock_transcribe_client.list_transcription_jobs.return_value = {
+        "TranscriptionJobSummaries": [
+            {"TranscriptionJobName": f"b1-u{i}", "TranscriptionJobStatus": "COMPLETED"}
+            for i in range(3)
+        ]
+    }
+    # every fetch waits for the other two to be in flight,
+    # so this can only pass if transcripts are fetched concurrently
+    all_fetches_in_flight = threading.Barrier(3, timeout=5)
+
+    def _get_transcription_job(TranscriptionJobName=""):
+        all_fetches_in_flight.wait()
+        return {
+            "TranscriptionJob": {
+                "Transcript": {
+                    "TranscriptFileUri": f"http://fake/{TranscriptionJobName}"
+                }
+            }
+        }
+
+    mock_transcribe_client.get_transcription_job.side_effect = _get_transcription_job
+    spy_on_update = Mock()
+    with patch("time.sleep"), requests_mock.Mocker() as mock_requests:
+        for i in range(3):
+            mock_requests.get(
+                f"http://fake/b1-u{i}",
+                json={"results": {"transcripts": [{"transcript": f"t{i}"}]}},
+            )
+        result = service.transcribe(
+            [
+                TranscribeJobRequest(jobId=f"u{i}", sourceFile=f"/audio/u{i}.wav")
+                for i in range(3)
+            ],
+            batch_id="b1",
+            on_update=spy_on_update,
+        )
+    assert {j.jobId: j.transcript for j in result.jobs()} == {
+        "u0": "t0",
+        "u1": "t1",
+        "u2": "t2",
+    }
+    assert all(j.status == TranscribeJobStatus.SUCCEEDED for j in result.jobs())
+    # each job is reported in its own update as its transcript arrives
+    ids_succeeded = [
+        u.idsUpdated
+        for (u,), _ in spy_on_update.call_args_list
+        if u.result.transcribeJobsById[u.idsUpdated[0]].status
+        == TranscribeJobStatus.SUCCEEDED
+    ]
+    assert sorted(ids_succeeded) == [["b1-u0"], ["b1-u1"], ["b1-u2"]]
@@ -0,0 +1,87 @@
+#
+# This software is Copyright ©️ 2020 The University of Southern California. All Rights Reserved.
+# Permission to use, copy, modify, and distribute this software and its documentation for educational, research and non-profit purposes, without fee, and without a written agreement is hereby granted, provided that the above copyright notice and subject to the full license file found in the root of this software deliverable. Permission to make commercial use of this software may be obtained by contacting:  USC Stevens Center for Innovation University of Southern California 1150 S. Olive Street, Suite 2300, Los Angeles, CA 90115, USA Email: accounting@stevens.usc.edu
+#
+# The full terms of this copyright and license should always be found in the root directory of this software deliverable as "license.txt" and if these terms are not found with this software, please contact the USC Stevens Center for the full license.
+#
+from unittest.mock import patch
+
+import requests_mock
+
+from transcribe import TranscribeJobRequest, TranscribeJobStatus
+
+from .helpers import create_service, FakeClock
+
+
+@patch("boto3.client")
+def test_it_lists_only_jobs_in_flight_once_most_are_resolved(mock_boto3_client):
+    service, _, mock_transcribe_client = create_service(
+        mock_boto3_client, {"START_JOB_MAX_RATE": 1000}
+    )
+    clock = FakeClock()
+    service.clock = clock
+    job_ids = [f"b1-u{i}" for i in range(150)]
+    aws_status = {jid: "QUEUED" for jid in job_ids}
+    polls = []
+
+    def _list_transcription_jobs(
+        JobNameContains="", MaxResults=0, Status="", NextToken=""
+    ):
+        assert MaxResults == 100
+        if not NextToken and Status in ("", "QUEUED"):
+            # first request of a poll: jobs complete as the batch goes on
+            polls.append(Status)
+            completed = {1: 140, 2: 145, 3: 150}[len(polls)]
+            for jid in job_ids[:completed]:
+                aws_status[jid] = "COMPLETED"
+            for jid in job_ids[completed:]:
+                aws_status[jid] = "IN_PROGRESS"
+        matching = [jid for jid in job_ids if not Status or aws_status[jid] == Status]
+        start = int(NextToken or 0)
+        return {
+            "TranscriptionJobSummaries": [
+                {"TranscriptionJobName": jid, "TranscriptionJobStatus": aws_status[jid]}
+                for jid in matching[start : start + MaxResults]
+            ],
+            "NextToken": (
+                str(start + MaxResults) if start + MaxResults < len(matching) else ""
+            ),
+        }
+
+    mock_transcribe_client.list_transcription_jobs.side_effect = (
+        _list_transcription_jobs
+    )
+    mock_transcribe_client.get_transcription_job.side_effect = (
+        lambda TranscriptionJobName="": {
+            "TranscriptionJob": {
+                "TranscriptionJobName": TranscriptionJobName,
+                "TranscriptionJobStatus": aws_status[TranscriptionJobName],
+                "Transcript": {
+                    "TranscriptFileUri": f"http://fake/{TranscriptionJobName}"
+                },
+            }
+        }
+    )
+    with patch("time.sleep") as mock_sleep, requests_mock.Mocker() as mock_requests:
+        mock_sleep.side_effect = clock.sleep
+        mock_requests.get(
+            requests_mock.ANY,
+            json={"results": {"transcripts": [{"transcript": "a transcript"}]}},
+        )
+        result = service.transcribe(
+            [
+                TranscribeJobRequest(jobId=f"u{i}", sourceFile=f"/audio/u{i}.wav")
+                for i in range(150)
+            ],
+            batch_id="b1",
+        )
+    assert all(j.status == TranscribeJobStatus.SUCCEEDED for j in result.jobs())
+    # the first poll lists all jobs; once most are resolved,
+    # only queued and in-progress jobs are listed
+    assert polls == ["", "QUEUED", "QUEUED"]
+    assert [
+        c.kwargs.get("Status")
+        for c in mock_transcribe_client.list_transcription_jobs.call_args_list
+    ] == [None, None, "QUEUED", "IN_PROGRESS", "QUEUED", "IN_PROGRESS"]
+    # jobs found resolved by get_transcription_job aren't fetched again
+    assert mock_transcribe_client.get_transcription_job.call_count == 150
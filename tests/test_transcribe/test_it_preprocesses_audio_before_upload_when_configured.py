@@ -0,0 +1,163 @@
+#
+# This software is Copyright ©️ 2020 The University of Southern California. All Rights Reserved.
+# Permission to use, copy, modify, and distribute this software and its documentation for educational, research and non-profit purposes, without fee, and without a written agreement is hereby granted, provided that the above copyright notice and subject to the full license file found in the root of this software deliverable. Permission to make commercial use of this software may be obtained by contacting:  USC Stevens Center for Innovation University of Southern California 1150 S. Olive Street, Suite 2300, Los Angeles, CA 90115, USA Email: accounting@stevens.usc.edu
+#
+# The full terms of this copyright and license should always be found in the root directory of this software deliverable as "license.txt" and if these terms are not found with this software, please contact the USC Stevens Center for the full license.
+#
+import json
+import os
+import stat
+import sys
+from unittest.mock import patch
+
+import requests_mock
+
+from transcribe import TranscribeJobRequest, TranscribeJobStatus
+
+from .helpers import create_service
+
+FAKE_FFMPEG = """#!{python}
+import json, shutil, sys
+with open({args_log!r}, "a") as f:
+    f.write(json.dumps(sys.argv[1:]) + "\\n")
+shutil.copyfile(sys.argv[sys.argv.index("-i") + 1], sys.argv[-1])
+"""
+
+
+def _fake_ffmpeg(tmp_path) -> str:
+    path = tmp_path / "ffmpeg"
+    path.write_text(
+        FAKE_FFMPEG.format(
+            python=sys.executable, args_log=str(tmp_path / "ffmpeg_args.jsonl")
+        )
+    )
+    path.chmod(path.stat().st_mode | stat.S_IEXEC)
+    return str(path)
+
+
+@patch("boto3.client")
+def test_it_preprocesses_audio_before_upload_when_configured(
+    mock_boto3_client, tmp_path
+):
+    source_file = tmp_path / "u1.wav"
+    source_file.write_bytes(b"RIFF fake audio")
+    service, mock_s3_client, mock_transcribe_client = create_service(
+        mock_boto3_client,
+        {"PREPROCESS_AUDIO": True, "FFMPEG_PATH": _fake_ffmpeg(tmp_path)},
+    )
+    uploaded = []
+    mock_s3_client.upload_file.side_effect = lambda f, *args, **kwargs: uploaded.append(
+        (f, os.path.exists(f))
+    )
+    mock_transcribe_client.list_transcription_jobs.return_value = {
+        "TranscriptionJobSummaries": [
+            {"TranscriptionJobName": "b1-u1", "TranscriptionJobStatus": "COMPLETED"}
+        ]
+    }
+    mock_transcribe_client.get_transcription_job.return_value = {
+        "TranscriptionJob": {"Transcript": {"TranscriptFileUri": "http://fake/b1-u1"}}
+    }
+    with patch("time.sleep"), requests_mock.Mocker() as mock_requests:
+        mock_requests.get(
+            "http://fake/b1-u1",
+            json={"results": {"transcripts": [{"transcript": "t1"}]}},
+        )
+        result = service.transcribe(
+            [TranscribeJobRequest(jobId="u1", sourceFile=str(source_file))],
+            batch_id="b1",
+        )
+    job = result.first()
+    assert job is not None
+    assert job.status == TranscribeJobStatus.SUCCEEDED
+    assert job.mediaFormat == "flac"
+    # the converted file was uploaded (as flac) in place of the source, then removed
+    [(uploaded_file, existed)] = uploaded
+    assert existed and uploaded_file.endswith(".flac")
+    assert not os.path.exists(uploaded_file)
+    assert mock_s3_client.upload_file.call_args.args[2].endswith(".flac")
+    assert (
+        mock_transcribe_client.start_transcription_job.call_args.kwargs["MediaFormat"]
+        == "flac"
+    )
+    [ffmpeg_args] = [
+        json.loads(line)
+        for line in (tmp_path / "ffmpeg_args.jsonl").read_text().splitlines()
+    ]
+    assert ffmpeg_args[ffmpeg_args.index("-ac") + 1] == "1"
+    assert ffmpeg_args[ffmpeg_args.index("-ar") + 1] == "16000"
+
+
+@patch("boto3.client")
+def test_it_uploads_the_source_as_is_when_preprocessing_fails(
+    mock_boto3_client, tmp_path
+):
+    source_file = tmp_path / "u1.wav"
+    source_file.write_bytes(b"RIFF fake audio")
+    service, mock_s3_client, mock_transcribe_client = create_service(
+        mock_boto3_client,
+        {"PREPROCESS_AUDIO": True, "FFMPEG_PATH": str(tmp_path / "no-ffmpeg")},
+    )
+    mock_transcribe_client.list_transcription_jobs.return_value = {
+        "TranscriptionJobSummaries": [
+            {"TranscriptionJobName": "b1-u1", "TranscriptionJobStatus": "FAILED"}
+        ]
+    }
+    with patch("time.sleep"):
+        result = service.transcribe(
+            [TranscribeJobRequest(jobId="u1", sourceFile=str(source_file))],
+            batch_id="b1",
+        )
+    job = result.first()
+    assert job is not None and job.mediaFormat == "wav"
+    assert mock_s3_client.upload_file.call_args.args[0] == str(source_file)
+    assert (
+        mock_transcribe_client.start_transcription_job.call_args.kwargs["MediaFormat"]
+        == "wav"
+    )
+
+
+@patch("boto3.client")
+def test_it_converts_only_a_few_files_ahead_of_the_uploads(mock_boto3_client, tmp_path):
+    jids = [f"u{i}" for i in range(10)]
+    for jid in jids:
+        (tmp_path / f"{jid}.wav").write_bytes(b"RIFF fake audio")
+    service, mock_s3_client, mock_transcribe_client = create_service(
+        mock_boto3_client,
+        {
+            "PREPROCESS_AUDIO": True,
+            "PREPROCESS_CONCURRENCY": 1,
+            "UPLOAD_CONCURRENCY": 1,
+            "FFMPEG_PATH": _fake_ffmpeg(tmp_path),
+        },
+    )
+    preprocessor = service.audio_preprocessor
+    assert preprocessor is not None
+    submit = preprocessor.submit
+    count_submitted = []
+    preprocessor.submit = lambda f: count_submitted.append(f) or submit(f)
+    # converted files submitted but not yet uploaded, at each upload
+    counts_ahead = []
+    mock_s3_client.upload_file.side_effect = (
+        lambda *args, **kwargs: counts_ahead.append(
+            len(count_submitted) - len(counts_ahead)
+        )
+    )
+    mock_transcribe_client.list_transcription_jobs.return_value = {
+        "TranscriptionJobSummaries": [
+            {"TranscriptionJobName": f"b1-{jid}", "TranscriptionJobStatus": "FAILED"}
+            for jid in jids
+        ]
+    }
+    with patch("time.sleep"):
+        service.transcribe(
+            [
+                TranscribeJobRequest(jobId=jid, sourceFile=str(tmp_path / f"{jid}.wav"))
+                for jid in jids
+            ],
+            batch_id="b1",
+        )
+    assert len(count_submitted) == len(jids)
+    assert len(counts_ahead) == len(jids)
+    # the uploads pending (UPLOAD_CONCURRENCY * 2), one more job taken to upload next
+    # and the conversions ahead of it (PREPROCESS_CONCURRENCY)
+    assert max(counts_ahead) <= 4
@@ -0,0 +1,79 @@
+#
+# This software is Copyright ©️ 2020 The University of Southern California. All Rights Reserved.
+# Permission to use, copy, modify, and distribute this software and its documentation for educational, research and non-profit purposes, without fee, and without a written agreement is hereby granted, provided that the above copyright notice and subject to the full license file found in the root of this software deliverable. Permission to make commercial use of this software may be obtained by contacting:  USC Stevens Center for Innovation University of Southern California 1150 S. Olive Street, Suite 2300, Los Angeles, CA 90115, USA Email: accounting@stevens.usc.edu
+#
+# The full terms of this copyright and license should always be found in the root directory of this software deliverable as "license.txt" and if these terms are not found with this software, please contact the USC Stevens Center for the full license.
+#
+import io
+import json
+import pytest
+from unittest.mock import Mock, patch
+
+from botocore.exceptions import ClientError
+import requests_mock
+
+from transcribe import TranscribeJobRequest, TranscribeJobStatus
+
+from .helpers import create_service
+
+
+@patch("boto3.client")
+# without s3:ListBucket, s3 reports a missing object as AccessDenied
+@pytest.mark.parametrize("missing_code", ["NoSuchKey", "AccessDenied"])
+def test_it_reads_transcripts_from_the_output_bucket(mock_boto3_client, missing_code):
+    service, mock_s3_client, mock_transcribe_client = create_service(
+        mock_boto3_client,
+        {"OUTPUT_BUCKET": "outputs", "OUTPUT_ROOT_PATH": "transcripts"},
+    )
+
+    def get_object(Bucket, Key):
+        assert Bucket == "outputs"
+        if Key == "transcripts/b1-u1.json":
+            return {
+                "Body": io.BytesIO(
+                    json.dumps(
+                        {"results": {"transcripts": [{"transcript": "t1"}]}}
+                    ).encode()
+                )
+            }
+        # e.g. a job started before OUTPUT_BUCKET was configured
+        raise ClientError({"Error": {"Code": missing_code}}, "GetObject")
+
+    mock_s3_client.get_object = Mock(side_effect=get_object)
+    mock_transcribe_client.list_transcription_jobs.return_value = {
+        "TranscriptionJobSummaries": [
+            {"TranscriptionJobName": f"b1-{jid}", "TranscriptionJobStatus": "COMPLETED"}
+            for jid in ["u1", "u2"]
+        ]
+    }
+    mock_transcribe_client.get_transcription_job.return_value = {
+        "TranscriptionJob": {"Transcript": {"TranscriptFileUri": "http://fake/b1-u2"}}
+    }
+    with patch("time.sleep"), requests_mock.Mocker() as mock_requests:
+        mock_requests.get(
+            "http://fake/b1-u2",
+            json={"results": {"transcripts": [{"transcript": "t2"}]}},
+        )
+        result = service.transcribe(
+            [
+                TranscribeJobRequest(jobId="u1", sourceFile="u1.wav"),
+                TranscribeJobRequest(jobId="u2", sourceFile="u2.wav"),
+            ],
+            batch_id="b1",
+        )
+    assert {j.jobId: (j.status, j.transcript) for j in result.jobs()} == {
+        "u1": (TranscribeJobStatus.SUCCEEDED, "t1"),
+        "u2": (TranscribeJobStatus.SUCCEEDED, "t2"),
+    }
+    assert [
+        (c.kwargs["OutputBucketName"], c.kwargs["OutputKey"])
+        for c in mock_transcribe_client.start_transcription_job.call_args_list
+    ] == [
+        ("outputs", "transcripts/b1-u1.json"),
+        ("outputs", "transcripts/b1-u2.json"),
+    ]
+    # only the job whose output wasn't in the bucket needed get_transcription_job
+    assert [
+        c.kwargs["TranscriptionJobName"]
+        for c in mock_transcribe_client.get_transcription_job.call_args_list
+    ] == ["b1-u2"]
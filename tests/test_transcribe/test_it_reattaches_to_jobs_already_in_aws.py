@@ -0,0 +1,117 @@
+#
+# This software is Copyright ©️ 2020 The University of Southern California. All Rights Reserved.
+# Permission to use, copy, modify, and distribute this software and its documentation for educational, research and non-profit purposes, without fee, and without a written agreement is hereby granted, provided that the above copyright notice and subject to the full license file found in the root of this software deliverable. Permission to make commercial use of this software may be obtained by contacting:  USC Stevens Center for Innovation University of Southern California 1150 S. Olive Street, Suite 2300, Los Angeles, CA 90115, USA Email: accounting@stevens.usc.edu
+#
+# The full terms of this copyright and license should always be found in the root directory of this software deliverable as "license.txt" and if these terms are not found with this software, please contact the USC Stevens Center for the full license.
+#
+from unittest.mock import patch
+
+import requests_mock
+
+from transcribe import TranscribeJobRequest, TranscribeJobStatus
+
+from .helpers import create_service
+
+
+def _summaries(statuses):
+    return {
+        "TranscriptionJobSummaries": [
+            {"TranscriptionJobName": n, "TranscriptionJobStatus": s}
+            for n, s in statuses.items()
+        ]
+    }
+
+
+@patch("boto3.client")
+def test_it_reattaches_to_jobs_already_in_aws(mock_boto3_client):
+    service, mock_s3_client, mock_transcribe_client = create_service(mock_boto3_client)
+    mock_transcribe_client.list_transcription_jobs.side_effect = [
+        _summaries({"b1-u1": "COMPLETED", "b1-u2": "IN_PROGRESS"}),
+        _summaries({"b1-u1": "COMPLETED", "b1-u2": "FAILED", "b1-u3": "COMPLETED"}),
+    ]
+    mock_transcribe_client.get_transcription_job.side_effect = (
+        lambda TranscriptionJobName: {
+            "TranscriptionJob": {
+                "Transcript": {
+                    "TranscriptFileUri": f"http://fake/{TranscriptionJobName}"
+                }
+            }
+        }
+    )
+    with patch("time.sleep"), requests_mock.Mocker() as mock_requests:
+        for jid in ["u1", "u3"]:
+            mock_requests.get(
+                f"http://fake/b1-{jid}",
+                json={"results": {"transcripts": [{"transcript": f"t{jid[1]}"}]}},
+            )
+        result = service.reattach(
+            "b1",
+            [
+                TranscribeJobRequest(jobId=f"u{i}", sourceFile=f"u{i}.wav")
+                for i in range(1, 4)
+            ],
+        )
+    assert {j.jobId: (j.status, j.transcript) for j in result.jobs()} == {
+        "u1": (TranscribeJobStatus.SUCCEEDED, "t1"),
+        "u2": (TranscribeJobStatus.FAILED, ""),
+        "u3": (TranscribeJobStatus.SUCCEEDED, "t3"),
+    }
+    # only the job missing from aws was uploaded and started
+    assert [c.args[0] for c in mock_s3_client.upload_file.call_args_list] == ["u3.wav"]
+    assert [
+        c.kwargs["TranscriptionJobName"]
+        for c in mock_transcribe_client.start_transcription_job.call_args_list
+    ] == ["b1-u3"]
+
+
+@patch("boto3.client")
+def test_it_yields_jobs_reattached_already_resolved(mock_boto3_client):
+    service, mock_s3_client, mock_transcribe_client = create_service(mock_boto3_client)
+    mock_transcribe_client.list_transcription_jobs.return_value = _summaries(
+        {"b1-u1": "COMPLETED", "b1-u2": "FAILED"}
+    )
+    mock_transcribe_client.get_transcription_job.return_value = {
+        "TranscriptionJob": {"Transcript": {"TranscriptFileUri": "http://fake/b1-u1"}}
+    }
+    with patch("time.sleep"), requests_mock.Mocker() as mock_requests:
+        mock_requests.get(
+            "http://fake/b1-u1",
+            json={"results": {"transcripts": [{"transcript": "t1"}]}},
+        )
+        jobs = list(
+            service.transcribe_iter(
+                [
+                    TranscribeJobRequest(jobId=f"u{i}", sourceFile=f"u{i}.wav")
+                    for i in range(1, 3)
+                ],
+                batch_id="b1",
+                reattach=True,
+            )
+        )
+    assert sorted((j.jobId, j.status, j.transcript) for j in jobs) == [
+        ("u1", TranscribeJobStatus.SUCCEEDED, "t1"),
+        ("u2", TranscribeJobStatus.FAILED, ""),
+    ]
+    mock_s3_client.upload_file.assert_not_called()
+
+
+@patch("boto3.client")
+def test_it_lists_the_jobs_of_a_windowed_batch_once_to_reattach(mock_boto3_client):
+    service, mock_s3_client, mock_transcribe_client = create_service(
+        mock_boto3_client, {"BATCH_WINDOW": 2}
+    )
+    jids = [f"u{i}" for i in range(1, 7)]
+    mock_transcribe_client.list_transcription_jobs.return_value = _summaries(
+        {f"b1-{jid}": "FAILED" for jid in jids}
+    )
+    with patch("time.sleep"):
+        result = service.reattach(
+            "b1",
+            [TranscribeJobRequest(jobId=jid, sourceFile=f"{jid}.wav") for jid in jids],
+        )
+    assert {j.jobId: j.status for j in result.jobs()} == {
+        jid: TranscribeJobStatus.FAILED for jid in jids
+    }
+    # every window's jobs were found in the one listing of the batch
+    assert mock_transcribe_client.list_transcription_jobs.call_count == 1
+    mock_s3_client.upload_file.assert_not_called()
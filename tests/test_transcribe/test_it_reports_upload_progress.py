@@ -0,0 +1,57 @@
+#
+# This software is Copyright ©️ 2020 The University of Southern California. All Rights Reserved.
+# Permission to use, copy, modify, and distribute this software and its documentation for educational, research and non-profit purposes, without fee, and without a written agreement is hereby granted, provided that the above copyright notice and subject to the full license file found in the root of this software deliverable. Permission to make commercial use of this software may be obtained by contacting:  USC Stevens Center for Innovation University of Southern California 1150 S. Olive Street, Suite 2300, Los Angeles, CA 90115, USA Email: accounting@stevens.usc.edu
+#
+# The full terms of this copyright and license should always be found in the root directory of this software deliverable as "license.txt" and if these terms are not found with this software, please contact the USC Stevens Center for the full license.
+#
+from unittest.mock import call, patch, Mock
+
+import requests_mock
+
+from transcribe import TranscribeJobRequest
+from transcribe_aws import UploadProgress
+
+from .helpers import create_service
+
+
+@patch("boto3.client")
+def test_it_reports_upload_progress(mock_boto3_client, tmp_path):
+    service, mock_s3_client, mock_transcribe_client = create_service(
+        mock_boto3_client,
+        {
+            "S3_MULTIPART_THRESHOLD": 1024,
+            "S3_MULTIPART_CHUNKSIZE": 512,
+            "S3_MAX_CONCURRENCY": 4,
+        },
+    )
+    source_file = tmp_path / "u1.wav"
+    source_file.write_bytes(b"\x00" * 1000)
+
+    def _upload_file(*args, Callback=None, **kwargs):
+        Callback(400)
+        Callback(600)
+
+    mock_s3_client.upload_file.side_effect = _upload_file
+    mock_transcribe_client.list_transcription_jobs.return_value = {
+        "TranscriptionJobSummaries": [
+            {"TranscriptionJobName": "b1-u1", "TranscriptionJobStatus": "FAILED"}
+        ]
+    }
+    spy_on_upload_progress = Mock()
+    with patch("time.sleep"), requests_mock.Mocker():
+        service.transcribe(
+            [TranscribeJobRequest(jobId="u1", sourceFile=str(source_file))],
+            batch_id="b1",
+            on_upload_progress=spy_on_upload_progress,
+        )
+    spy_on_upload_progress.assert_has_calls(
+        [
+            call(UploadProgress(jobId="b1-u1", bytesUploaded=400, bytesTotal=1000)),
+            call(UploadProgress(jobId="b1-u1", bytesUploaded=1000, bytesTotal=1000)),
+        ]
+    )
+    transfer_config = mock_s3_client.upload_file.call_args.kwargs["Config"]
+    assert transfer_config.multipart_threshold == 1024
+    assert transfer_config.multipart_chunksize == 512
+    assert transfer_config.max_concurrency == 4
+    assert transfer_config.use_threads is True
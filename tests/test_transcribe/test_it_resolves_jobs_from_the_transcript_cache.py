@@ -0,0 +1,67 @@
+#
+# This software is Copyright ©️ 2020 The University of Southern California. All Rights Reserved.
+# Permission to use, copy, modify, and distribute this software and its documentation for educational, research and non-profit purposes, without fee, and without a written agreement is hereby granted, provided that the above copyright notice and subject to the full license file found in the root of this software deliverable. Permission to make commercial use of this software may be obtained by contacting:  USC Stevens Center for Innovation University of Southern California 1150 S. Olive Street, Suite 2300, Los Angeles, CA 90115, USA Email: accounting@stevens.usc.edu
+#
+# The full terms of this copyright and license should always be found in the root directory of this software deliverable as "license.txt" and if these terms are not found with this software, please contact the USC Stevens Center for the full license.
+#
+import hashlib
+from unittest.mock import patch
+
+import requests_mock
+
+from transcribe import TranscribeJobRequest, TranscribeJobStatus
+
+from transcribe_aws.cache import SqliteTranscriptCache, transcript_cache_key
+
+from .helpers import create_service
+
+
+@patch("boto3.client")
+def test_it_resolves_jobs_from_the_transcript_cache(mock_boto3_client, tmp_path):
+    cache = SqliteTranscriptCache(str(tmp_path / "cache.db"))
+    service, mock_s3_client, mock_transcribe_client = create_service(
+        mock_boto3_client, {"TRANSCRIPT_CACHE": cache}
+    )
+    contents = {"u1": b"audio transcribed before", "u2": b"new audio"}
+    keys = {}
+    for jid, content in contents.items():
+        (tmp_path / f"{jid}.wav").write_bytes(content)
+        keys[jid] = transcript_cache_key(
+            hashlib.sha256(content).hexdigest(), "en-US", "wav"
+        )
+    cache.set(keys["u1"], "cached transcript")
+    mock_transcribe_client.list_transcription_jobs.return_value = {
+        "TranscriptionJobSummaries": [
+            {"TranscriptionJobName": "b1-u2", "TranscriptionJobStatus": "COMPLETED"}
+        ]
+    }
+    mock_transcribe_client.get_transcription_job.return_value = {
+        "TranscriptionJob": {"Transcript": {"TranscriptFileUri": "http://fake/b1-u2"}}
+    }
+    with patch("time.sleep"), requests_mock.Mocker() as mock_requests:
+        mock_requests.get(
+            "http://fake/b1-u2",
+            json={"results": {"transcripts": [{"transcript": "new transcript"}]}},
+        )
+        result = service.transcribe(
+            [
+                TranscribeJobRequest(jobId=jid, sourceFile=str(tmp_path / f"{jid}.wav"))
+                for jid in contents
+            ],
+            batch_id="b1",
+        )
+    assert {j.jobId: (j.status, j.transcript) for j in result.jobs()} == {
+        "u1": (TranscribeJobStatus.SUCCEEDED, "cached transcript"),
+        "u2": (TranscribeJobStatus.SUCCEEDED, "new transcript"),
+    }
+    # only the job not in the cache was uploaded and started...
+    assert [c.args[0] for c in mock_s3_client.upload_file.call_args_list] == [
+        str(tmp_path / "u2.wav")
+    ]
+    assert [
+        c.kwargs["TranscriptionJobName"]
+        for c in mock_transcribe_client.start_transcription_job.call_args_list
+    ] == ["b1-u2"]
+    # ...and its transcript is now cached
+    assert cache.get(keys["u2"]) == "new transcript"
+    cache.close()
@@ -0,0 +1,113 @@
+#
+# This software is Copyright ©️ 2020 The University of Southern California. All Rights Reserved.
+# Permission to use, copy, modify, and distribute this software and its documentation for educational, research and non-profit purposes, without fee, and without a written agreement is hereby granted, provided that the above copyright notice and subject to the full license file found in the root of this software deliverable. Permission to make commercial use of this software may be obtained by contacting:  USC Stevens Center for Innovation University of Southern California 1150 S. Olive Street, Suite 2300, Los Angeles, CA 90115, USA Email: accounting@stevens.usc.edu
+#
+# The full terms of this copyright and license should always be found in the root directory of this software deliverable as "license.txt" and if these terms are not found with this software, please contact the USC Stevens Center for the full license.
+#
+import json
+from unittest.mock import patch
+
+import requests_mock
+
+from transcribe import TranscribeJobRequest, TranscribeJobStatus
+
+from transcribe_aws.journal import read_journal
+
+from .helpers import create_service
+
+
+def _summaries(*names):
+    return {
+        "TranscriptionJobSummaries": [
+            {"TranscriptionJobName": n, "TranscriptionJobStatus": "COMPLETED"}
+            for n in names
+        ]
+    }
+
+
+@patch("boto3.client")
+def test_it_resumes_an_interrupted_batch_from_its_journal(mock_boto3_client, tmp_path):
+    service, mock_s3_client, mock_transcribe_client = create_service(
+        mock_boto3_client, {"JOURNAL_DIR": str(tmp_path / "journal")}
+    )
+    (tmp_path / "journal").mkdir()
+    # u1 was transcribed, u2 started and u3 uploaded before the interruption,
+    # and u4 never got as far as its upload
+    with open(tmp_path / "journal" / "b1.jsonl", "w") as f:
+        for entry in [
+            {"id": "b1-u1", "status": "UPLOADED", "s3Path": "b1/u1.wav"},
+            {"id": "b1-u2", "status": "UPLOADED", "s3Path": "b1/u2.wav"},
+            {"id": "b1-u3", "status": "UPLOADED", "s3Path": "b1/u3.wav"},
+            {"id": "b1-u1", "status": "QUEUED", "s3Path": "b1/u1.wav"},
+            {"id": "b1-u2", "status": "QUEUED", "s3Path": "b1/u2.wav"},
+            {"id": "b1-u1", "status": "SUCCEEDED", "transcript": "t1"},
+        ]:
+            f.write(json.dumps(entry) + "\n")
+        f.write('{"id": "b1-u3", "sta')
+    mock_transcribe_client.list_transcription_jobs.side_effect = [
+        _summaries("b1-u2"),
+        _summaries("b1-u2", "b1-u3", "b1-u4"),
+    ]
+    mock_transcribe_client.get_transcription_job.side_effect = (
+        lambda TranscriptionJobName: {
+            "TranscriptionJob": {
+                "Transcript": {
+                    "TranscriptFileUri": f"http://fake/{TranscriptionJobName}"
+                }
+            }
+        }
+    )
+    with patch("time.sleep"), requests_mock.Mocker() as mock_requests:
+        for jid in ["u2", "u3", "u4"]:
+            mock_requests.get(
+                f"http://fake/b1-{jid}",
+                json={"results": {"transcripts": [{"transcript": f"t{jid[1]}"}]}},
+            )
+        result = service.transcribe(
+            [
+                TranscribeJobRequest(jobId=f"u{i}", sourceFile=f"u{i}.wav")
+                for i in range(1, 5)
+            ],
+            batch_id="b1",
+            resume=True,
+        )
+    assert {j.jobId: (j.status, j.transcript) for j in result.jobs()} == {
+        f"u{i}": (TranscribeJobStatus.SUCCEEDED, f"t{i}") for i in range(1, 5)
+    }
+    assert [c.args[0] for c in mock_s3_client.upload_file.call_args_list] == ["u4.wav"]
+    assert [
+        c.kwargs["TranscriptionJobName"]
+        for c in mock_transcribe_client.start_transcription_job.call_args_list
+    ] == ["b1-u3", "b1-u4"]
+    assert {
+        jid: (e["status"], e.get("transcript"))
+        for jid, e in read_journal(str(tmp_path / "journal" / "b1.jsonl")).items()
+    } == {f"b1-u{i}": ("SUCCEEDED", f"t{i}") for i in range(1, 5)}
+
+
+@patch("boto3.client")
+def test_it_yields_jobs_resumed_already_resolved(mock_boto3_client, tmp_path):
+    service, mock_s3_client, mock_transcribe_client = create_service(
+        mock_boto3_client, {"JOURNAL_DIR": str(tmp_path / "journal")}
+    )
+    (tmp_path / "journal").mkdir()
+    with open(tmp_path / "journal" / "b2.jsonl", "w") as f:
+        for i in range(1, 4):
+            entry = {"id": f"b2-u{i}", "status": "SUCCEEDED", "transcript": f"t{i}"}
+            f.write(json.dumps(entry) + "\n")
+    with patch("time.sleep"):
+        jobs = list(
+            service.transcribe_iter(
+                [
+                    TranscribeJobRequest(jobId=f"u{i}", sourceFile=f"u{i}.wav")
+                    for i in range(1, 4)
+                ],
+                batch_id="b2",
+                resume=True,
+            )
+        )
+    assert sorted((j.jobId, j.status, j.transcript) for j in jobs) == [
+        (f"u{i}", TranscribeJobStatus.SUCCEEDED, f"t{i}") for i in range(1, 4)
+    ]
+    mock_s3_client.upload_file.assert_not_called()
+    mock_transcribe_client.list_transcription_jobs.assert_not_called()
@@ -0,0 +1,73 @@
+#
+# This software is Copyright ©️ 2020 The University of Southern California. All Rights Reserved.
+# Permission to use, copy, modify, and distribute this software and its documentation for educational, research and non-profit purposes, without fee, and without a written agreement is hereby granted, provided that the above copyright notice and subject to the full license file found in the root of this software deliverable. Permission to make commercial use of this software may be obtained by contacting:  USC Stevens Center for Innovation University of Southern California 1150 S. Olive Street, Suite 2300, Los Angeles, CA 90115, USA Email: accounting@stevens.usc.edu
+#
+# The full terms of this copyright and license should always be found in the root directory of this software deliverable as "license.txt" and if these terms are not found with this software, please contact the USC Stevens Center for the full license.
+#
+import hashlib
+import pytest
+from unittest.mock import call, patch
+
+from botocore.exceptions import ClientError
+import requests_mock
+
+from transcribe import TranscribeJobRequest
+
+from .helpers import create_service, TEST_AWS_REGION, TEST_TRANSCRIBE_SOURCE_BUCKET
+
+
+@patch("boto3.client")
+# without s3:ListBucket, s3 reports a missing object as 403 rather than 404
+@pytest.mark.parametrize("missing_code", ["404", "403"])
+def test_it_skips_uploads_of_content_already_in_s3(
+    mock_boto3_client, missing_code, tmp_path
+):
+    service, mock_s3_client, mock_transcribe_client = create_service(
+        mock_boto3_client, {"S3_CONTENT_ADDRESSED": True}
+    )
+    contents = {"u1": b"audio already uploaded", "u2": b"new audio"}
+    digests = {}
+    for jid, content in contents.items():
+        (tmp_path / f"{jid}.wav").write_bytes(content)
+        digests[jid] = hashlib.sha256(content).hexdigest()
+
+    def _head_object(Bucket="", Key=""):
+        if Key == f"{digests['u1']}.wav":
+            return {"ContentLength": len(contents["u1"])}
+        raise ClientError({"Error": {"Code": missing_code}}, "HeadObject")
+
+    mock_s3_client.head_object.side_effect = _head_object
+    mock_transcribe_client.list_transcription_jobs.return_value = {
+        "TranscriptionJobSummaries": [
+            {"TranscriptionJobName": f"b1-{jid}", "TranscriptionJobStatus": "FAILED"}
+            for jid in contents
+        ]
+    }
+    with patch("time.sleep"), requests_mock.Mocker():
+        service.transcribe(
+            [
+                TranscribeJobRequest(jobId=jid, sourceFile=str(tmp_path / f"{jid}.wav"))
+                for jid in contents
+            ],
+            batch_id="b1",
+        )
+    mock_s3_client.upload_file.assert_called_once_with(
+        str(tmp_path / "u2.wav"),
+        TEST_TRANSCRIBE_SOURCE_BUCKET,
+        f"{digests['u2']}.wav",
+        ExtraArgs={"ACL": "public-read"},
+        Config=service.s3_transfer_config,
+    )
+    mock_transcribe_client.start_transcription_job.assert_has_calls(
+        [
+            call(
+                TranscriptionJobName=f"b1-{jid}",
+                LanguageCode="en-US",
+                Media={
+                    "MediaFileUri": f"https://s3.{TEST_AWS_REGION}.amazonaws.com/{TEST_TRANSCRIBE_SOURCE_BUCKET}/{digests[jid]}.wav"
+                },
+                MediaFormat="wav",
+            )
+            for jid in contents
+        ]
+    )
@@ -0,0 +1,54 @@
+#
+# This software is Copyright ©️ 2020 The University of Southern California. All Rights Reserved.
+# Permission to use, copy, modify, and distribute this software and its documentation for educational, research and non-profit purposes, without fee, and without a written agreement is hereby granted, provided that the above copyright notice and subject to the full license file found in the root of this software deliverable. Permission to make commercial use of this software may be obtained by contacting:  USC Stevens Center for Innovation University of Southern California 1150 S. Olive Street, Suite 2300, Los Angeles, CA 90115, USA Email: accounting@stevens.usc.edu
+#
+# The full terms of this copyright and license should always be found in the root directory of this software deliverable as "license.txt" and if these terms are not found with this software, please contact the USC Stevens Center for the full license.
+#
+import threading
+from unittest.mock import patch
+
+import requests_mock
+
+from transcribe import TranscribeJobRequest, TranscribeJobStatus
+
+from .helpers import create_service
+
+
+@patch("boto3.client")
+def test_it_starts_jobs_while_later_uploads_are_in_flight(mock_boto3_client):
+    service, mock_s3_client, mock_transcribe_client = create_service(mock_boto3_client)
+    u1_started = threading.Event()
+
+    def _upload_file(source_file, *args, **kwargs):
+        if source_file == "/audio/u2.wav":
+            # the upload of u2 can only finish once u1's job has been started
+            assert u1_started.wait(timeout=5)
+
+    def _start_transcription_job(TranscriptionJobName="", **kwargs):
+        if TranscriptionJobName == "b1-u1":
+            u1_started.set()
+
+    mock_s3_client.upload_file.side_effect = _upload_file
+    mock_transcribe_client.start_transcription_job.side_effect = (
+        _start_transcription_job
+    )
+    mock_transcribe_client.list_transcription_jobs.return_value = {
+        "TranscriptionJobSummaries": [
+            {"TranscriptionJobName": f"b1-u{i}", "TranscriptionJobStatus": "FAILED"}
+            for i in [1, 2]
+        ]
+    }
+    with patch("time.sleep"), requests_mock.Mocker():
+        result = service.transcribe(
+            [
+                TranscribeJobRequest(jobId=f"u{i}", sourceFile=f"/audio/u{i}.wav")
+                for i in [1, 2]
+            ],
+            batch_id="b1",
+        )
+    assert [
+        c.kwargs["TranscriptionJobName"]
+        for c in mock_transcribe_client.start_transcription_job.call_args_list
+    ] == ["b1-u1", "b1-u2"]
+    assert mock_s3_client.upload_file.call_count == 2
+    assert all(j.status == TranscribeJobStatus.FAILED for j in result.jobs())
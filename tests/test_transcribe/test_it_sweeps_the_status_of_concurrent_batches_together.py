@@ -0,0 +1,64 @@
+#
+# This software is Copyright ©️ 2020 The University of Southern California. All Rights Reserved.
+# Permission to use, copy, modify, and distribute this software and its documentation for educational, research and non-profit purposes, without fee, and without a written agreement is hereby granted, provided that the above copyright notice and subject to the full license file found in the root of this software deliverable. Permission to make commercial use of this software may be obtained by contacting:  USC Stevens Center for Innovation University of Southern California 1150 S. Olive Street, Suite 2300, Los Angeles, CA 90115, USA Email: accounting@stevens.usc.edu
+#
+# The full terms of this copyright and license should always be found in the root directory of this software deliverable as "license.txt" and if these terms are not found with this software, please contact the USC Stevens Center for the full license.
+#
+import asyncio
+from unittest.mock import call, patch
+
+import requests_mock
+
+from transcribe import TranscribeJobRequest, TranscribeJobStatus
+
+from .helpers import create_service
+
+
+@patch("boto3.client")
+def test_it_sweeps_the_status_of_concurrent_batches_together(mock_boto3_client):
+    batch_ids = [f"b{i}" for i in range(5)]
+    service, _, mock_transcribe_client = create_service(
+        mock_boto3_client,
+        {"STATUS_SWEEP": True, "POLL_INTERVAL": 0.2, "ASYNC_MAX_WORKERS": 1},
+    )
+    mock_transcribe_client.list_transcription_jobs.return_value = {
+        "TranscriptionJobSummaries": [
+            {"TranscriptionJobName": f"{b}-u1", "TranscriptionJobStatus": "COMPLETED"}
+            for b in batch_ids
+        ]
+    }
+    mock_transcribe_client.get_transcription_job.side_effect = (
+        lambda TranscriptionJobName="": {
+            "TranscriptionJob": {
+                "Transcript": {
+                    "TranscriptFileUri": f"http://fake/{TranscriptionJobName}"
+                }
+            }
+        }
+    )
+
+    async def _transcribe_all():
+        return await asyncio.gather(
+            *[
+                service.transcribe_async(
+                    [TranscribeJobRequest(jobId="u1", sourceFile="/audio/u1.wav")],
+                    batch_id=b,
+                )
+                for b in batch_ids
+            ]
+        )
+
+    with requests_mock.Mocker() as mock_requests:
+        mock_requests.get(
+            requests_mock.ANY,
+            json={"results": {"transcripts": [{"transcript": "a transcript"}]}},
+        )
+        results = asyncio.run(_transcribe_all())
+    assert all(
+        j.status == TranscribeJobStatus.SUCCEEDED for r in results for j in r.jobs()
+    )
+    # one sweep found the jobs of all batches
+    mock_transcribe_client.list_transcription_jobs.assert_has_calls(
+        [call(MaxResults=100)]
+    )
+    assert mock_transcribe_client.list_transcription_jobs.call_count == 1
@@ -0,0 +1,83 @@
+#
+# This software is Copyright ©️ 2020 The University of Southern California. All Rights Reserved.
+# Permission to use, copy, modify, and distribute this software and its documentation for educational, research and non-profit purposes, without fee, and without a written agreement is hereby granted, provided that the above copyright notice and subject to the full license file found in the root of this software deliverable. Permission to make commercial use of this software may be obtained by contacting:  USC Stevens Center for Innovation University of Southern California 1150 S. Olive Street, Suite 2300, Los Angeles, CA 90115, USA Email: accounting@stevens.usc.edu
+#
+# The full terms of this copyright and license should always be found in the root directory of this software deliverable as "license.txt" and if these terms are not found with this software, please contact the USC Stevens Center for the full license.
+#
+import asyncio
+from unittest.mock import patch
+
+import requests_mock
+
+from transcribe import TranscribeJobRequest, TranscribeJobStatus, TranscribeJobsUpdate
+
+from .helpers import create_service
+
+
+@patch("boto3.client")
+def test_it_transcribes_concurrent_batches_async(mock_boto3_client):
+    batch_ids = [f"b{i}" for i in range(10)]
+    service, mock_s3_client, mock_transcribe_client = create_service(
+        mock_boto3_client, {"ASYNC_MAX_WORKERS": 2, "POLL_INTERVAL": 0.01}
+    )
+
+    def _list_transcription_jobs(JobNameContains="", **kwargs):
+        return {
+            "TranscriptionJobSummaries": [
+                {
+                    "TranscriptionJobName": f"{JobNameContains}-u1",
+                    "TranscriptionJobStatus": "COMPLETED",
+                }
+            ]
+        }
+
+    mock_transcribe_client.list_transcription_jobs.side_effect = (
+        _list_transcription_jobs
+    )
+    mock_transcribe_client.get_transcription_job.side_effect = (
+        lambda TranscriptionJobName="": {
+            "TranscriptionJob": {
+                "Transcript": {
+                    "TranscriptFileUri": f"http://fake/{TranscriptionJobName}"
+                }
+            }
+        }
+    )
+    statuses_by_batch = {b: [] for b in batch_ids}
+
+    async def _on_update(update: TranscribeJobsUpdate):
+        await asyncio.sleep(0)
+        job = next(iter(update.result.jobs()))
+        statuses_by_batch[job.batchId].append(job.status)
+
+    async def _transcribe_all():
+        return await asyncio.gather(
+            *[
+                service.transcribe_async(
+                    [TranscribeJobRequest(jobId="u1", sourceFile="/audio/u1.wav")],
+                    batch_id=b,
+                    on_update=_on_update,
+                )
+                for b in batch_ids
+            ]
+        )
+
+    with requests_mock.Mocker() as mock_requests:
+        for b in batch_ids:
+            mock_requests.get(
+                f"http://fake/{b}-u1",
+                json={"results": {"transcripts": [{"transcript": f"{b} transcript"}]}},
+            )
+        results = asyncio.run(_transcribe_all())
+    assert [(j.batchId, j.status, j.transcript) for r in results for j in r.jobs()] == [
+        (b, TranscribeJobStatus.SUCCEEDED, f"{b} transcript") for b in batch_ids
+    ]
+    assert statuses_by_batch == {
+        b: [
+            TranscribeJobStatus.UPLOADED,
+            TranscribeJobStatus.QUEUED,
+            TranscribeJobStatus.SUCCEEDED,
+        ]
+        for b in batch_ids
+    }
+    assert mock_s3_client.upload_file.call_count == len(batch_ids)
@@ -0,0 +1,51 @@
+#
+# This software is Copyright ©️ 2020 The University of Southern California. All Rights Reserved.
+# Permission to use, copy, modify, and distribute this software and its documentation for educational, research and non-profit purposes, without fee, and without a written agreement is hereby granted, provided that the above copyright notice and subject to the full license file found in the root of this software deliverable. Permission to make commercial use of this software may be obtained by contacting:  USC Stevens Center for Innovation University of Southern California 1150 S. Olive Street, Suite 2300, Los Angeles, CA 90115, USA Email: accounting@stevens.usc.edu
+#
+# The full terms of this copyright and license should always be found in the root directory of this software deliverable as "license.txt" and if these terms are not found with this software, please contact the USC Stevens Center for the full license.
+#
+import pytest
+from unittest.mock import patch
+
+from transcribe import TranscribeJobRequest, TranscribeJobStatus
+
+from .helpers import create_service
+
+
+@patch("boto3.client")
+@pytest.mark.parametrize("config", [{}, {"BATCH_WINDOW": 2}])
+def test_it_transcribes_requests_with_the_same_job_id_once(mock_boto3_client, config):
+    service, mock_s3_client, mock_transcribe_client = create_service(
+        mock_boto3_client, config
+    )
+    # a limited number of listings, so a batch that never completes fails here
+    mock_transcribe_client.list_transcription_jobs.side_effect = [
+        {
+            "TranscriptionJobSummaries": [
+                {"TranscriptionJobName": "b1-a", "TranscriptionJobStatus": "FAILED"},
+                {"TranscriptionJobName": "b1-b", "TranscriptionJobStatus": "FAILED"},
+            ]
+        }
+    ] * 5
+    with patch("time.sleep"):
+        result = service.transcribe(
+            [
+                TranscribeJobRequest(jobId="a", sourceFile="a1.wav"),
+                TranscribeJobRequest(jobId="b", sourceFile="b.wav"),
+                TranscribeJobRequest(jobId="a", sourceFile="a2.wav"),
+            ],
+            batch_id="b1",
+        )
+    assert {j.jobId: j.status for j in result.jobs()} == {
+        "a": TranscribeJobStatus.FAILED,
+        "b": TranscribeJobStatus.FAILED,
+    }
+    # the first of the requests with the same job id wins, windowed or not
+    assert sorted(c.args[0] for c in mock_s3_client.upload_file.call_args_list) == [
+        "a1.wav",
+        "b.wav",
+    ]
+    assert sorted(
+        c.kwargs["TranscriptionJobName"]
+        for c in mock_transcribe_client.start_transcription_job.call_args_list
+    ) == ["b1-a", "b1-b"]
@@ -0,0 +1,67 @@
+#
+# This software is Copyright ©️ 2020 The University of Southern California. All Rights Reserved.
+# Permission to use, copy, modify, and distribute this software and its documentation for educational, research and non-profit purposes, without fee, and without a written agreement is hereby granted, provided that the above copyright notice and subject to the full license file found in the root of this software deliverable. Permission to make commercial use of this software may be obtained by contacting:  USC Stevens Center for Innovation University of Southern California 1150 S. Olive Street, Suite 2300, Los Angeles, CA 90115, USA Email: accounting@stevens.usc.edu
+#
+# The full terms of this copyright and license should always be found in the root directory of this software deliverable as "license.txt" and if these terms are not found with this software, please contact the USC Stevens Center for the full license.
+#
+import threading
+from unittest.mock import call, patch, Mock
+
+import requests_mock
+
+from transcribe import TranscribeJobRequest, TranscribeJobStatus
+
+from .helpers import create_service, TEST_TRANSCRIBE_SOURCE_BUCKET
+
+
+@patch("boto3.client")
+def test_it_uploads_concurrently_when_upload_concurrency_configured(
+    mock_boto3_client,
+):
+    service, mock_s3_client, mock_transcribe_client = create_service(
+        mock_boto3_client, {"UPLOAD_CONCURRENCY": 3}
+    )
+    # every upload waits for the other two to be in flight,
+    # so this can only pass if uploads run concurrently
+    all_uploads_in_flight = threading.Barrier(3, timeout=5)
+    mock_s3_client.upload_file.side_effect = lambda *args, **kwargs: (
+        all_uploads_in_flight.wait()
+    )
+    mock_transcribe_client.list_transcription_jobs.return_value = {
+        "TranscriptionJobSummaries": [
+            {"TranscriptionJobName": f"b1-u{i}", "TranscriptionJobStatus": "FAILED"}
+            for i in range(3)
+        ]
+    }
+    spy_on_update = Mock()
+    with patch("time.sleep"), requests_mock.Mocker():
+        result = service.transcribe(
+            [
+                TranscribeJobRequest(jobId=f"u{i}", sourceFile=f"/audio/u{i}.wav")
+                for i in range(3)
+            ],
+            batch_id="b1",
+            on_update=spy_on_update,
+        )
+    mock_s3_client.upload_file.assert_has_calls(
+        [
+            call(
+                f"/audio/u{i}.wav",
+                TEST_TRANSCRIBE_SOURCE_BUCKET,
+                f"b1-u{i}.wav",
+                ExtraArgs={"ACL": "public-read"},
+                Config=service.s3_transfer_config,
+            )
+            for i in range(3)
+        ],
+        any_order=True,
+    )
+    assert mock_transcribe_client.start_transcription_job.call_count == 3
+    assert all(j.status == TranscribeJobStatus.FAILED for j in result.jobs())
+    ids_uploaded = [
+        u.idsUpdated[0]
+        for (u,), _ in spy_on_update.call_args_list
+        if u.result.transcribeJobsById[u.idsUpdated[0]].status
+        == TranscribeJobStatus.UPLOADED
+    ]
+    assert sorted(ids_uploaded) == ["b1-u0", "b1-u1", "b1-u2"]
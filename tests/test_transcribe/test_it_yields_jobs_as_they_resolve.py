@@ -0,0 +1,90 @@
+#
+# This software is Copyright ©️ 2020 The University of Southern California. All Rights Reserved.
+# Permission to use, copy, modify, and distribute this software and its documentation for educational, research and non-profit purposes, without fee, and without a written agreement is hereby granted, provided that the above copyright notice and subject to the full license file found in the root of this software deliverable. Permission to make commercial use of this software may be obtained by contacting:  USC Stevens Center for Innovation University of Southern California 1150 S. Olive Street, Suite 2300, Los Angeles, CA 90115, USA Email: accounting@stevens.usc.edu
+#
+# The full terms of this copyright and license should always be found in the root directory of this software deliverable as "license.txt" and if these terms are not found with this software, please contact the USC Stevens Center for the full license.
+#
+from unittest.mock import patch
+
+import requests_mock
+
+from transcribe import TranscribeJobRequest, TranscribeJobStatus
+
+from .helpers import create_service
+
+
+def _list_response(statuses):
+    return {
+        "TranscriptionJobSummaries": [
+            {"TranscriptionJobName": jid, "TranscriptionJobStatus": s}
+            for jid, s in statuses.items()
+        ]
+    }
+
+
+@patch("boto3.client")
+def test_it_yields_jobs_as_they_resolve(mock_boto3_client):
+    service, _, mock_transcribe_client = create_service(mock_boto3_client)
+    mock_transcribe_client.list_transcription_jobs.side_effect = [
+        _list_response({"b1-u1": "IN_PROGRESS", "b1-u2": "FAILED", "b1-u3": "QUEUED"}),
+        _list_response({"b1-u1": "IN_PROGRESS", "b1-u3": "COMPLETED"}),
+        _list_response({"b1-u1": "COMPLETED"}),
+    ]
+    mock_transcribe_client.get_transcription_job.side_effect = (
+        lambda TranscriptionJobName="": {
+            "TranscriptionJob": {
+                "Transcript": {
+                    "TranscriptFileUri": f"http://fake/{TranscriptionJobName}"
+                }
+            }
+        }
+    )
+    yielded = []
+    with patch("time.sleep"), requests_mock.Mocker() as mock_requests:
+        for jid in ["u1", "u3"]:
+            mock_requests.get(
+                f"http://fake/b1-{jid}",
+                json={"results": {"transcripts": [{"transcript": f"{jid} text"}]}},
+            )
+        for job in service.transcribe_iter(
+            # requests may come from a generator
+            (
+                TranscribeJobRequest(jobId=jid, sourceFile=f"/audio/{jid}.wav")
+                for jid in ["u1", "u2", "u3"]
+            ),
+            batch_id="b1",
+        ):
+            yielded.append(
+                (
+                    job.jobId,
+                    job.status,
+                    job.transcript,
+                    mock_transcribe_client.list_transcription_jobs.call_count,
+                )
+            )
+    # each job is yielded right after the poll that found it resolved
+    assert yielded == [
+        ("u2", TranscribeJobStatus.FAILED, "", 1),
+        ("u3", TranscribeJobStatus.SUCCEEDED, "u3 text", 2),
+        ("u1", TranscribeJobStatus.SUCCEEDED, "u1 text", 3),
+    ]
+
+
+@patch("boto3.client")
+def test_it_abandons_unresolved_jobs_when_closed_early(mock_boto3_client):
+    service, _, mock_transcribe_client = create_service(mock_boto3_client)
+    mock_transcribe_client.list_transcription_jobs.return_value = _list_response(
+        {"b1-u1": "FAILED", "b1-u2": "IN_PROGRESS"}
+    )
+    with patch("time.sleep"):
+        jobs = service.transcribe_iter(
+            [
+                TranscribeJobRequest(jobId=jid, sourceFile=f"/audio/{jid}.wav")
+                for jid in ["u1", "u2"]
+            ],
+            batch_id="b1",
+        )
+        assert next(jobs).jobId == "u1"
+        assert service.start_job_limiter.stats().in_flight == 1
+        jobs.close()
+    assert service.start_job_limiter.stats().in_flight == 0
@@ -0,0 +1,45 @@
+#
+# This software is Copyright ©️ 2020 The University of Southern California. All Rights Reserved.
+# Permission to use, copy, modify, and distribute this software and its documentation for educational, research and non-profit purposes, without fee, and without a written agreement is hereby granted, provided that the above copyright notice and subject to the full license file found in the root of this software deliverable. Permission to make commercial use of this software may be obtained by contacting:  USC Stevens Center for Innovation University of Southern California 1150 S. Olive Street, Suite 2300, Los Angeles, CA 90115, USA Email: accounting@stevens.usc.edu
+#
+# The full terms of this copyright and license should always be found in the root directory of this software deliverable as "license.txt" and if these terms are not found with this software, please contact the USC Stevens Center for the full license.
+#
+from transcribe_aws.cache import SqliteTranscriptCache
+
+from tests.test_transcribe.helpers import FakeClock
+
+
+def test_it_evicts_the_least_recently_used_transcripts(tmp_path):
+    clock = FakeClock()
+    cache = SqliteTranscriptCache(str(tmp_path / "c.db"), max_entries=2, clock=clock)
+    cache.set("k1", "t1")
+    clock.sleep(1)
+    cache.set("k2", "t2")
+    clock.sleep(1)
+    assert cache.get("k1") == "t1"
+    clock.sleep(1)
+    cache.set("k3", "t3")
+    assert cache.get("k2") is None
+    assert cache.get("k1") == "t1"
+    assert cache.get("k3") == "t3"
+    cache.close()
+
+
+def test_it_expires_transcripts_older_than_ttl(tmp_path):
+    clock = FakeClock()
+    cache = SqliteTranscriptCache(str(tmp_path / "c.db"), ttl=10, clock=clock)
+    cache.set("k1", "t1")
+    clock.sleep(5)
+    assert cache.get("k1") == "t1"
+    clock.sleep(6)
+    assert cache.get("k1") is None
+    cache.close()
+
+
+def test_it_keeps_transcripts_across_instances(tmp_path):
+    cache = SqliteTranscriptCache(str(tmp_path / "c.db"))
+    cache.set("k1", "t1")
+    cache.close()
+    cache = SqliteTranscriptCache(str(tmp_path / "c.db"))
+    assert cache.get("k1") == "t1"
+    cache.close()
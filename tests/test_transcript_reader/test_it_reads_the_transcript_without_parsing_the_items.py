@@ -0,0 +1,66 @@
+#
+# This software is Copyright ©️ 2020 The University of Southern California. All Rights Reserved.
+# Permission to use, copy, modify, and distribute this software and its documentation for educational, research and non-profit purposes, without fee, and without a written agreement is hereby granted, provided that the above copyright notice and subject to the full license file found in the root of this software deliverable. Permission to make commercial use of this software may be obtained by contacting:  USC Stevens Center for Innovation University of Southern California 1150 S. Olive Street, Suite 2300, Los Angeles, CA 90115, USA Email: accounting@stevens.usc.edu
+#
+# The full terms of this copyright and license should always be found in the root directory of this software deliverable as "license.txt" and if these terms are not found with this software, please contact the USC Stevens Center for the full license.
+#
+import json
+
+import pytest
+
+from transcribe_aws.transcript_reader import read_transcript, TranscriptParseError
+
+
+def _output(transcript, n_items=10000, **extra):
+    return json.dumps(
+        {
+            "jobName": "b1-u1",
+            **extra,
+            "results": {
+                "transcripts": [{"transcript": transcript}],
+                "items": [
+                    {
+                        "start_time": f"{i}.0",
+                        "end_time": f"{i}.5",
+                        "alternatives": [{"confidence": "1.0", "content": "word"}],
+                        "type": "pronunciation",
+                    }
+                    for i in range(n_items)
+                ],
+            },
+            "status": "COMPLETED",
+        }
+    ).encode("utf-8")
+
+
+def _chunks(doc, size, read):
+    for i in range(0, len(doc), size):
+        read.append(size)
+        yield doc[i : i + size]
+
+
+def test_it_stops_reading_once_the_transcript_is_complete():
+    doc = _output("hello world")
+    read = []
+    assert read_transcript(_chunks(doc, 1024, read)) == "hello world"
+    assert sum(read) < len(doc) / 100
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 64])
+def test_it_reads_transcripts_split_across_chunks(chunk_size):
+    doc = _output('café "transcripts": über 你好', n_items=2)
+    assert (
+        read_transcript(_chunks(doc, chunk_size, [])) == 'café "transcripts": über 你好'
+    )
+
+
+def test_it_skips_lookalike_keys_in_earlier_strings():
+    doc = _output("the transcript", n_items=2, note='a \\"transcripts\\": [1]')
+    assert read_transcript(_chunks(doc, 16, [])) == "the transcript"
+
+
+def test_it_raises_for_a_document_without_a_transcript():
+    with pytest.raises(TranscriptParseError):
+        read_transcript([b'{"results": {"items": []}}'])
+    with pytest.raises(TranscriptParseError):
+        read_transcript([b"not json"])
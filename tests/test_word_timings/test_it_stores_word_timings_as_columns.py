@@ -0,0 +1,67 @@
+#
+# This software is Copyright ©️ 2020 The University of Southern California. All Rights Reserved.
+# Permission to use, copy, modify, and distribute this software and its documentation for educational, research and non-profit purposes, without fee, and without a written agreement is hereby granted, provided that the above copyright notice and subject to the full license file found in the root of this software deliverable. Permission to make commercial use of this software may be obtained by contacting:  USC Stevens Center for Innovation University of Southern California 1150 S. Olive Street, Suite 2300, Los Angeles, CA 90115, USA Email: accounting@stevens.usc.edu
+#
+# The full terms of this copyright and license should always be found in the root directory of this software deliverable as "license.txt" and if these terms are not found with this software, please contact the USC Stevens Center for the full license.
+#
+from transcribe import TranscribeJob
+
+from transcribe_aws.word_timings import (
+    parse_word_timings,
+    WORD_TIMINGS_INFO_KEY,
+    WordTimings,
+)
+
+ITEMS = [
+    {
+        "start_time": "0.04",
+        "end_time": "0.3",
+        "alternatives": [{"confidence": "0.99", "content": "Hello"}],
+        "type": "pronunciation",
+    },
+    {
+        "alternatives": [{"confidence": "0.0", "content": ","}],
+        "type": "punctuation",
+    },
+    {
+        "start_time": "0.3",
+        "end_time": "0.75",
+        "alternatives": [{"confidence": "0.5", "content": "héllo"}],
+        "type": "pronunciation",
+    },
+    {
+        "start_time": "1.0",
+        "end_time": "1.2",
+        "alternatives": [{"confidence": "1.0", "content": "Hello"}],
+        "type": "pronunciation",
+    },
+]
+
+
+def test_it_parses_items_into_columns():
+    timings = parse_word_timings(ITEMS)
+    assert list(timings.starts) == [40, 300, 300, 1000]
+    assert list(timings.ends) == [300, 300, 750, 1200]
+    assert list(timings.token_ids) == [0, 1, 2, 0]
+    assert timings.tokens == ["Hello", ",", "héllo"]
+    assert [(s, e, w) for s, e, _, w in timings.words()] == [
+        (0.04, 0.3, "Hello"),
+        (0.3, 0.3, ","),
+        (0.3, 0.75, "héllo"),
+        (1.0, 1.2, "Hello"),
+    ]
+
+
+def test_it_round_trips_through_bytes_and_job_info():
+    timings = parse_word_timings(ITEMS)
+    assert WordTimings.from_bytes(timings.to_bytes()) == timings
+    job = TranscribeJob(
+        batchId="b1",
+        jobId="u1",
+        sourceFile="u1.wav",
+        mediaFormat="wav",
+        info={WORD_TIMINGS_INFO_KEY: timings.encode()},
+    )
+    assert WordTimings.from_job(job) == timings
+    assert WordTimings.from_job(TranscribeJob("b1", "u2", "u2.wav", "wav")) is None
+    assert WordTimings.from_bytes(WordTimings().to_bytes()) == WordTimings()
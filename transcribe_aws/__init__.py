@@ -4,22 +4,85 @@
 #
 # The full terms of this copyright and license should always be found in the root directory of this software deliverable as "license.txt" and if these terms are not found with this software, please contact the USC Stevens Center for the full license.
 #
+import asyncio
+from collections import deque
+from dataclasses import dataclass, field, replace
+from concurrent.futures import Future, FIRST_COMPLETED, ThreadPoolExecutor, wait
+import inspect
+import json
 import logging
 import requests
 import os
 import re
-from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Union
+import threading
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+)
 import time
 import uuid
 
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config as BotoConfig
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from botocore.exceptions import ClientError
 from boto3_type_annotations.s3 import Client as S3Client
 from boto3_type_annotations.transcribe import Client as TranscribeClient
 
+from .cache import (
+    DEFAULT_TRANSCRIPT_CACHE_MAX_ENTRIES,
+    SqliteTranscriptCache,
+    TranscriptCache,
+    transcript_cache_key,
+)
+from .cleanup import Cleaner, DEFAULT_CLEANUP_LINGER_SECS
+from .digest import file_sha256
+from .job_events import (
+    DEFAULT_COMPLETION_QUEUE_FALLBACK_POLL_INTERVAL,
+    DEFAULT_COMPLETION_QUEUE_WAIT_SECS,
+    JOB_EVENT_CHECK_INTERVAL,
+    SqsJobEventSource,
+)
+from .job_store import JobStore
+from .journal import BatchJournal, read_journal
+from .polling import estimate_audio_duration, estimate_job_secs, PollScheduler
+from .preprocess import (
+    AudioPreprocessor,
+    DEFAULT_PREPROCESS_FORMAT,
+    DEFAULT_PREPROCESS_SAMPLE_RATE,
+    PreprocessedAudio,
+)
+from .rate_limit import DEFAULT_START_JOB_MAX_RATE, StartJobRateLimiter
+from .status_sweep import (
+    DEFAULT_STATUS_SWEEP_MAX_BATCH_CALLS,
+    DEFAULT_STATUS_SWEEP_MAX_PAGES,
+    LIST_JOBS_MAX_RESULTS,
+    StatusSweeper,
+)
+from .transcript_reader import (
+    read_transcript,
+    read_transcript_and_items,
+    TRANSCRIPT_READ_CHUNK_SIZE,
+    TranscriptParseError,
+)
+from .word_timings import parse_word_timings, WORD_TIMINGS_INFO_KEY
+
 from transcribe import (
-    copy_shallow,
     requests_to_job_batch,
     register_transcription_service_factory,
     TranscribeBatchResult,
@@ -38,11 +101,103 @@ _TRANSCRIBE_JOB_STATUS_BY_AWS_STATUS: Dict[str, TranscribeJobStatus] = {
 }
 
 DEFAULT_POLL_INTERVAL: float = 5.0
+DEFAULT_POLL_BACKOFF: float = 2.0
+DEFAULT_UPLOAD_CONCURRENCY: int = 1
+DEFAULT_ASYNC_MAX_WORKERS: int = 8
+DEFAULT_BATCH_WINDOW: int = 0
+DEFAULT_TRANSCRIPT_FETCH_CONCURRENCY: int = 1
+DEFAULT_BOTO_MAX_POOL_CONNECTIONS: int = 10
+DEFAULT_BOTO_RETRY_MODE: str = "standard"
+DEFAULT_BOTO_MAX_ATTEMPTS: int = 3
+DEFAULT_BOTO_CONNECT_TIMEOUT: float = 60.0
+DEFAULT_BOTO_READ_TIMEOUT: float = 60.0
+DEFAULT_S3_MULTIPART_THRESHOLD: int = 8 * 1024 * 1024
+DEFAULT_S3_MULTIPART_CHUNKSIZE: int = 8 * 1024 * 1024
+DEFAULT_S3_MAX_CONCURRENCY: int = 10
+DEFAULT_HTTP_POOL_SIZE: int = 10
+DEFAULT_HTTP_CONNECT_TIMEOUT: float = 10.0
+DEFAULT_HTTP_READ_TIMEOUT: float = 60.0
+DEFAULT_HTTP_MAX_RETRIES: int = 3
+DEFAULT_HTTP_RETRY_BACKOFF: float = 0.5
 
 
 logger = logging.getLogger("transcribe_aws")
 
 
+@dataclass
+class UploadProgress:
+    """
+    Progress of the upload of one job's source file,
+    passed to the `on_upload_progress` callback of `transcribe`
+    """
+
+    jobId: str
+    bytesUploaded: int
+    bytesTotal: int
+
+
+@dataclass
+class _Batch:
+    """
+    State of a batch that is being transcribed,
+    used only by the thread running its transcribe call
+    """
+
+    batch_id: str
+    poll_scheduler: PollScheduler
+    # the batch's jobs, updated in place (see JobStore)
+    jobs: JobStore = field(default_factory=JobStore)
+    on_update: Optional[Callable[[TranscribeJobsUpdate], None]] = None
+    on_upload_progress: Optional[Callable[[UploadProgress], None]] = None
+    # ids of jobs whose upload has completed, in the order they should be started
+    ready_to_start: Deque[str] = field(default_factory=deque)
+    # s3 path of each uploaded job's source file
+    s3_paths: Dict[str, str] = field(default_factory=dict)
+    # transcript cache key of each job (when there is a transcript cache)
+    cache_keys: Dict[str, str] = field(default_factory=dict)
+    # max jobs admitted and unresolved at once (0 for no limit)
+    window: int = 0
+    # jobs not yet admitted (None once all are)
+    jobs_pending: Optional[Iterator[TranscribeJob]] = None
+    count_admitted: int = 0
+    count_resolved: int = 0
+    # ids of jobs admitted to a windowed batch, to admit duplicate requests once
+    # (the only state kept for every job of the batch)
+    ids_admitted: Set[str] = field(default_factory=set)
+    # ids of jobs resolved, in order, for transcribe_iter to consume
+    ids_resolved: Optional[Deque[str]] = None
+    # ids of jobs transcribe_iter has yielded, to drop from a windowed result
+    ids_yielded: List[str] = field(default_factory=list)
+    # journal of the batch's job transitions (when there is a JOURNAL_DIR)
+    journal: Optional[BatchJournal] = None
+    # whether some of the batch's jobs may already exist in aws
+    # (see transcribe's resume and reattach)
+    resumed: bool = False
+    # whether every admitted job is first looked for in aws (see reattach)
+    reattached: bool = False
+    # for a resumed batch, the journal entries of jobs not yet admitted
+    journaled: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    # for a reattached batch, the summaries of its jobs found in aws
+    # (listed once, on its first admission) not yet admitted
+    aws_jobs_found: Optional[Dict[str, Dict[str, Any]]] = None
+
+
+@dataclass
+class _StagedJob:
+    """
+    A job that has either been uploaded (to s3_path)
+    or found in the transcript cache (with cached_transcript)
+    """
+
+    job: TranscribeJob
+    s3_path: str = ""
+    cache_key: str = ""
+    cached_transcript: Optional[str] = None
+    cached_info: Dict[str, str] = field(default_factory=dict)
+    # media format of the uploaded file, if it was converted (see PREPROCESS_AUDIO)
+    media_format: str = ""
+
+
 def _require_env(n: Union[str, List[str]], v: str = "") -> str:
     if v:
         return v
@@ -58,8 +213,132 @@ def _prefix_require_env(n: str, v: str = "") -> str:
     return _require_env([f"TRANSCRIBE_{n}", n], v)
 
 
+def _config_value(config: Dict[str, Any], n: str, default: Any) -> Any:
+    return config.get(n, os.environ.get(f"TRANSCRIBE_AWS_{n}", default))
+
+
+def _config_bool(config: Dict[str, Any], n: str, default: bool) -> bool:
+    v = _config_value(config, n, default)
+    return v if isinstance(v, bool) else str(v).lower() in ["1", "true", "yes", "on"]
+
+
+def _is_throttling_error(ex: BaseException) -> bool:
+    return bool(
+        re.search("throttlingexception", str(ex), re.IGNORECASE)
+        or _is_limit_exceeded_error(ex)
+    )
+
+
+def _is_limit_exceeded_error(ex: BaseException) -> bool:
+    return bool(re.search("limitexceeded", str(ex), re.IGNORECASE))
+
+
+def _is_conflict_error(ex: BaseException) -> bool:
+    # i.e. a job with the requested name already exists
+    return bool(re.search("conflictexception", str(ex), re.IGNORECASE))
+
+
+def _config_is_set(config: Dict[str, Any], n: str) -> bool:
+    return n in config or f"TRANSCRIBE_AWS_{n}" in os.environ
+
+
+def _create_boto_config(
+    config: Dict[str, Any], min_pool_connections: int = 0
+) -> BotoConfig:
+    """
+    Builds the botocore Config for the service's clients from BOTO_* config/env vars.
+    Given a botocore Config in config as BOTO_CONFIG, only the BOTO_* vars
+    that are set override it; otherwise, unset vars take their defaults.
+    Either way, the connection pool is at least min_pool_connections.
+    """
+    base = config.get("BOTO_CONFIG")
+    if not isinstance(base, BotoConfig):
+        base = BotoConfig(
+            max_pool_connections=DEFAULT_BOTO_MAX_POOL_CONNECTIONS,
+            retries={
+                "mode": DEFAULT_BOTO_RETRY_MODE,
+                "max_attempts": DEFAULT_BOTO_MAX_ATTEMPTS,
+            },
+            connect_timeout=DEFAULT_BOTO_CONNECT_TIMEOUT,
+            read_timeout=DEFAULT_BOTO_READ_TIMEOUT,
+            tcp_keepalive=False,
+        )
+    overrides: Dict[str, Any] = {
+        "max_pool_connections": max(
+            int(
+                _config_value(
+                    config, "BOTO_MAX_POOL_CONNECTIONS", base.max_pool_connections
+                )
+            ),
+            min_pool_connections,
+        )
+    }
+    retries = dict(base.retries or {})
+    if _config_is_set(config, "BOTO_RETRY_MODE"):
+        retries["mode"] = _config_value(config, "BOTO_RETRY_MODE", "")
+    if _config_is_set(config, "BOTO_MAX_ATTEMPTS"):
+        retries["max_attempts"] = int(_config_value(config, "BOTO_MAX_ATTEMPTS", 0))
+    if retries != (base.retries or {}):
+        overrides["retries"] = retries
+    for n, option in [
+        ("BOTO_CONNECT_TIMEOUT", "connect_timeout"),
+        ("BOTO_READ_TIMEOUT", "read_timeout"),
+    ]:
+        if _config_is_set(config, n):
+            overrides[option] = float(_config_value(config, n, 0))
+    if _config_is_set(config, "BOTO_TCP_KEEPALIVE"):
+        overrides["tcp_keepalive"] = _config_bool(config, "BOTO_TCP_KEEPALIVE", False)
+    return base.merge(BotoConfig(**overrides))
+
+
+def _create_transcript_cache(config: Dict[str, Any]) -> Optional[TranscriptCache]:
+    """
+    Returns the TranscriptCache passed in config as TRANSCRIPT_CACHE or,
+    if TRANSCRIPT_CACHE_PATH is set, a SqliteTranscriptCache at that path
+    """
+    cache = config.get("TRANSCRIPT_CACHE")
+    if isinstance(cache, TranscriptCache):
+        return cache
+    path = _config_value(config, "TRANSCRIPT_CACHE_PATH", "")
+    if not path:
+        return None
+    return SqliteTranscriptCache(
+        os.path.expanduser(path),
+        max_entries=int(
+            _config_value(
+                config,
+                "TRANSCRIPT_CACHE_MAX_ENTRIES",
+                DEFAULT_TRANSCRIPT_CACHE_MAX_ENTRIES,
+            )
+        ),
+        ttl=float(_config_value(config, "TRANSCRIPT_CACHE_TTL", 0)),
+    )
+
+
+def _create_s3_transfer_config(config: Dict[str, Any]) -> TransferConfig:
+    return TransferConfig(
+        multipart_threshold=int(
+            _config_value(
+                config, "S3_MULTIPART_THRESHOLD", DEFAULT_S3_MULTIPART_THRESHOLD
+            )
+        ),
+        multipart_chunksize=int(
+            _config_value(
+                config, "S3_MULTIPART_CHUNKSIZE", DEFAULT_S3_MULTIPART_CHUNKSIZE
+            )
+        ),
+        max_concurrency=int(
+            _config_value(config, "S3_MAX_CONCURRENCY", DEFAULT_S3_MAX_CONCURRENCY)
+        ),
+        use_threads=_config_bool(config, "S3_USE_THREADS", True),
+    )
+
+
 def _create_s3_client(
-    aws_access_key_id: str = "", aws_secret_access_key: str = "", aws_region: str = ""
+    aws_access_key_id: str = "",
+    aws_secret_access_key: str = "",
+    aws_region: str = "",
+    config: Optional[BotoConfig] = None,
 ) -> S3Client:
     return boto3.client(
         "s3",
@@ -69,11 +348,15 @@ def _create_s3_client(
             "AWS_SECRET_ACCESS_KEY",
             aws_secret_access_key,
         ),
+        config=config,
     )
 
 
 def _create_transcribe_client(
-    aws_access_key_id: str = "", aws_secret_access_key: str = "", aws_region: str = ""
+    aws_access_key_id: str = "",
+    aws_secret_access_key: str = "",
+    aws_region: str = "",
+    config: Optional[BotoConfig] = None,
 ) -> TranscribeClient:
     return boto3.client(
         "transcribe",
@@ -82,24 +365,124 @@ def _create_transcribe_client(
         aws_secret_access_key=_prefix_require_env(
             "AWS_SECRET_ACCESS_KEY", aws_secret_access_key
         ),
+        config=config,
     )
 
 
+def _create_sqs_client(
+    aws_access_key_id: str = "",
+    aws_secret_access_key: str = "",
+    aws_region: str = "",
+    config: Optional[BotoConfig] = None,
+) -> Any:
+    return boto3.client(
+        "sqs",
+        region_name=_prefix_require_env("AWS_REGION", aws_region),
+        aws_access_key_id=_prefix_require_env("AWS_ACCESS_KEY_ID", aws_access_key_id),
+        aws_secret_access_key=_prefix_require_env(
+            "AWS_SECRET_ACCESS_KEY", aws_secret_access_key
+        ),
+        config=config,
+    )
+
+
+def _create_http_session(
+    pool_size: int = DEFAULT_HTTP_POOL_SIZE,
+    max_retries: int = DEFAULT_HTTP_MAX_RETRIES,
+    retry_backoff: float = DEFAULT_HTTP_RETRY_BACKOFF,
+) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=Retry(
+            total=max_retries,
+            backoff_factor=retry_backoff,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["GET"],
+        ),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _parse_transcript(
+    aws_job_name: str, source: str, chunks: Iterable[bytes], word_timings: bool
+) -> Tuple[str, Dict[str, str]]:
+    """
+    Returns the transcript text from the output document of a transcribe job
+    (see read_transcript) and the job info to go with it,
+    which has the job's encoded WordTimings if word_timings
+    """
+    try:
+        if not word_timings:
+            return read_transcript(chunks), {}
+        transcript, items = read_transcript_and_items(chunks)
+        return transcript, {WORD_TIMINGS_INFO_KEY: parse_word_timings(items).encode()}
+    except TranscriptParseError as ex:
+        raise Exception(
+            f"unable to parse transcript for job '{aws_job_name} and url {source}': {ex}"
+        )
+
+
 def _parse_aws_status(
     aws_status: str, default_status: TranscribeJobStatus = TranscribeJobStatus.NONE
 ) -> TranscribeJobStatus:
     return _TRANSCRIBE_JOB_STATUS_BY_AWS_STATUS.get(aws_status, default_status)
 
 
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def _run_bounded(
+    fn: Callable[[T], R],
+    items: Iterable[T],
+    concurrency: int,
+    thread_name_prefix: str,
+) -> Iterator[Tuple[T, "Future[R]"]]:
+    """
+    Runs fn for each item on a pool of `concurrency` threads,
+    yielding each (item, future) as soon as the future is done.
+
+    Only a small window of items is submitted to the pool at a time,
+    so memory stays bounded regardless of the number of items.
+    The caller consumes results on its own thread;
+    with a concurrency of 1, items are yielded in the order given.
+    """
+    max_pending = concurrency * 2
+    with ThreadPoolExecutor(
+        max_workers=concurrency, thread_name_prefix=thread_name_prefix
+    ) as executor:
+        pending: Dict[Future, Tuple[int, T]] = {}
+
+        def _completed() -> Iterator[Tuple[T, "Future[R]"]]:
+            done, _ = wait(pending.keys(), return_when=FIRST_COMPLETED)
+            for f in sorted(done, key=lambda x: pending[x][0]):
+                _, item = pending.pop(f)
+                yield (item, f)
+
+        for i, item in enumerate(items):
+            while len(pending) >= max_pending:
+                yield from _completed()
+            pending[executor.submit(fn, item)] = (i, item)
+        while pending:
+            yield from _completed()
+
+
 def next_batch_id() -> str:
     return str(uuid.uuid4())
 
 
 class AWSTranscriptionService(TranscriptionService):
     def _get_batch_status(
-        self, batch_id: str, job_ids_expected: List[str]
+        self, batch_id: str, job_ids_expected: List[str], list_all: bool = False
     ) -> List[Dict[str, Any]]:
         """
+        With list_all, lists all the batch's jobs
+        rather than stopping once the expected ones are found.
+
         NOTE: as of 20210719 there is some bug in aws transcribe
         where for some transcribe jobs, list_transcription_jobs will REPEATEDLY
         return a NextToken and then on each subsequent response return no jobs
@@ -120,7 +503,7 @@ class AWSTranscriptionService(TranscriptionService):
                     f"requesting batch status...list_transcription_jobs(JobNameContains={batch_id})"
                 )
             cur_result_page = self.transcribe_client.list_transcription_jobs(
-                JobNameContains=batch_id
+                JobNameContains=batch_id, MaxResults=LIST_JOBS_MAX_RESULTS
             )
             if logger.level == logging.DEBUG:
                 logger.debug(
@@ -141,7 +524,7 @@ class AWSTranscriptionService(TranscriptionService):
                     job_id = r.get("TranscriptionJobName", "")
                     if job_id in job_ids_pending:
                         job_ids_pending.remove(job_id)
-                if not job_ids_pending:
+                if not (job_ids_pending or list_all):
                     # mitigation 1 for weird NextToken behavior
                     # we have updates for all the job ids we care about,
                     # so just ignore next token even if it's there
@@ -154,7 +537,9 @@ class AWSTranscriptionService(TranscriptionService):
                 if not next_token:
                     break
                 cur_result_page = self.transcribe_client.list_transcription_jobs(
-                    JobNameContains=batch_id, NextToken=next_token
+                    JobNameContains=batch_id,
+                    MaxResults=LIST_JOBS_MAX_RESULTS,
+                    NextToken=next_token,
                 )
                 if logger.level == logging.DEBUG:
                     logger.debug(
@@ -162,17 +547,129 @@ class AWSTranscriptionService(TranscriptionService):
                     )
             return result
         except ClientError as ex:
-            if re.search("throttlingexception", str(ex), re.IGNORECASE) or re.search(
-                "limitexceeded", str(ex), re.IGNORECASE
-            ):
+            if _is_throttling_error(ex):
                 logger.warning(
                     f"[batch: {batch_id}] received a throttling exception, just return empty status for now and allow polling to continue"
                 )
                 return result
             raise ex
 
-    def _load_transcript(self, aws_job_name: str) -> str:
-        aws_job = self.transcribe_client.get_transcription_job(
+    def _should_filter_status(self, batch: _Batch, count_in_flight: int) -> bool:
+        """
+        Whether listing only the batch's queued and in-progress jobs
+        (see _get_batch_status_filtered) is likely cheaper than listing
+        all its jobs, i.e. the batch has started more than a page of jobs
+        and most of them are already resolved
+        """
+        count_started = count_in_flight + batch.jobs.count(
+            [TranscribeJobStatus.SUCCEEDED, TranscribeJobStatus.FAILED]
+        )
+        return (
+            count_started > LIST_JOBS_MAX_RESULTS
+            and count_started > 2 * count_in_flight
+        )
+
+    def _get_batch_status_filtered(
+        self, batch_id: str, job_ids_in_flight: List[str]
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+        """
+        Gets the status of a batch's jobs in flight by listing
+        only its QUEUED and IN_PROGRESS jobs, so the cost doesn't grow
+        with the number of jobs already resolved.
+        Any job in flight that's in neither listing
+        has (most likely) resolved, and is fetched individually;
+        those fetched jobs are returned too, to spare a second fetch
+        when loading transcripts.
+        """
+        summaries: List[Dict[str, Any]] = []
+        for aws_status in ("QUEUED", "IN_PROGRESS"):
+            summaries.extend(
+                self._list_jobs_with_status(batch_id, aws_status, job_ids_in_flight)
+            )
+        ids_unlisted = set(job_ids_in_flight) - {
+            s.get("TranscriptionJobName", "") for s in summaries
+        }
+        aws_jobs: Dict[str, Dict[str, Any]] = {}
+        for jid in sorted(ids_unlisted):
+            try:
+                aws_job = self.transcribe_client.get_transcription_job(
+                    TranscriptionJobName=jid
+                )
+            except ClientError as ex:
+                if _is_throttling_error(ex):
+                    logger.warning(
+                        f"[batch: {batch_id}] received a throttling exception, will get job {jid} on the next poll"
+                    )
+                    break
+                raise ex
+            aws_jobs[jid] = aws_job
+            summaries.append(aws_job.get("TranscriptionJob", {}))
+        return summaries, aws_jobs
+
+    def _list_jobs_with_status(
+        self, batch_id: str, aws_status: str, job_ids_in_flight: List[str]
+    ) -> List[Dict[str, Any]]:
+        result: List[Dict[str, Any]] = []
+        kwargs: Dict[str, Any] = {}
+        try:
+            while True:
+                page = self.transcribe_client.list_transcription_jobs(
+                    JobNameContains=batch_id,
+                    Status=aws_status,
+                    MaxResults=LIST_JOBS_MAX_RESULTS,
+                    **kwargs,
+                )
+                summaries = page.get("TranscriptionJobSummaries")
+                if not summaries:
+                    # see the NextToken mitigations in _get_batch_status
+                    break
+                result.extend(summaries)
+                if len(result) >= len(job_ids_in_flight):
+                    break
+                next_token = page.get("NextToken", "")
+                if not next_token:
+                    break
+                kwargs["NextToken"] = next_token
+        except ClientError as ex:
+            if not _is_throttling_error(ex):
+                raise ex
+            logger.warning(
+                f"[batch: {batch_id}] received a throttling exception, just return the {aws_status} jobs listed so far"
+            )
+        return result
+
+    def _load_transcript(
+        self, aws_job_name: str, aws_job: Optional[Dict[str, Any]] = None
+    ) -> Tuple[str, Dict[str, str]]:
+        """
+        Loads the transcript (and info, see _parse_transcript) of a completed job,
+        straight from s3 when jobs write their output to OUTPUT_BUCKET,
+        otherwise from the url given by get_transcription_job
+        """
+        if self.output_bucket:
+            key = self.get_transcript_s3_path(aws_job_name)
+            try:
+                body = self.s3_client.get_object(Bucket=self.output_bucket, Key=key)[
+                    "Body"
+                ]
+                try:
+                    return _parse_transcript(
+                        aws_job_name,
+                        f"s3://{self.output_bucket}/{key}",
+                        iter(lambda: body.read(TRANSCRIPT_READ_CHUNK_SIZE), b""),
+                        self.word_timings,
+                    )
+                finally:
+                    # stops the download if the transcript was read before its end
+                    body.close()
+            except ClientError as ex:
+                if not _is_missing_object_error(ex):
+                    raise ex
+                # e.g. a job started before OUTPUT_BUCKET was set
+                logger.info(
+                    f"no transcript for {aws_job_name} at s3://{self.output_bucket}/{key}, getting it from the job"
+                )
+        aws_job = aws_job or self.transcribe_client.get_transcription_job(
             TranscriptionJobName=aws_job_name
         )
         url = (
@@ -182,20 +679,41 @@ class AWSTranscriptionService(TranscriptionService):
         )
         if not url:
             raise Exception(f"unable to parse url for job '{aws_job_name}': {aws_job}")
-        transcript_res = requests.get(url)
-        transcript_res.raise_for_status()
-        transcript_json = transcript_res.json()
-        try:
-            return transcript_json["results"]["transcripts"][0]["transcript"]
-        except Exception:
-            raise Exception(
-                f"unable to parse transcript for job '{aws_job_name} and url {url}': {transcript_json}"
+        with self.http_session.get(
+            url,
+            timeout=(self.http_connect_timeout, self.http_read_timeout),
+            stream=True,
+        ) as transcript_res:
+            transcript_res.raise_for_status()
+            return _parse_transcript(
+                aws_job_name,
+                url,
+                transcript_res.iter_content(TRANSCRIPT_READ_CHUNK_SIZE),
+                self.word_timings,
             )
 
     def get_s3_path(self, source_file: str, id: str) -> str:
         file_name = f"{id.lower()}{os.path.splitext(source_file)[1]}"
         return f"{self.s3_root_path}/{file_name}" if self.s3_root_path else file_name
 
+    def get_transcript_s3_path(self, id: str) -> str:
+        """
+        The key in OUTPUT_BUCKET of the output of the transcribe job with this id
+        """
+        file_name = f"{id}.json"
+        return (
+            f"{self.output_root_path}/{file_name}"
+            if self.output_root_path
+            else file_name
+        )
+
+    def get_s3_content_path(self, source_file: str, digest: str = "") -> str:
+        """
+        Returns the content-addressed s3 path for a source file,
+        i.e. a path named for the digest of the file's content
+        """
+        return self.get_s3_path(source_file, digest or file_sha256(source_file))
+
     def init_service(self, config: Dict[str, Any] = {}, **kwargs):
         self.aws_region = config.get("AWS_REGION") or _prefix_require_env("AWS_REGION")
         self.s3_bucket_source = config.get(
@@ -211,98 +729,847 @@ class AWSTranscriptionService(TranscriptionService):
         aws_secret_access_key = config.get(
             "AWS_SECRET_ACCESS_KEY"
         ) or _prefix_require_env("AWS_SECRET_ACCESS_KEY")
+        self.clock: Callable[[], float] = time.monotonic
+        self.poll_interval = float(
+            _config_value(config, "POLL_INTERVAL", DEFAULT_POLL_INTERVAL)
+        )
+        self.poll_interval_min = float(
+            _config_value(config, "POLL_INTERVAL_MIN", self.poll_interval)
+        )
+        self.poll_interval_max = float(
+            _config_value(config, "POLL_INTERVAL_MAX", self.poll_interval)
+        )
+        self.poll_backoff = float(
+            _config_value(config, "POLL_BACKOFF", DEFAULT_POLL_BACKOFF)
+        )
+        self.transcript_fetch_concurrency = max(
+            1,
+            int(
+                _config_value(
+                    config,
+                    "TRANSCRIPT_FETCH_CONCURRENCY",
+                    DEFAULT_TRANSCRIPT_FETCH_CONCURRENCY,
+                )
+            ),
+        )
+        self.upload_concurrency = max(
+            1,
+            int(
+                _config_value(config, "UPLOAD_CONCURRENCY", DEFAULT_UPLOAD_CONCURRENCY)
+            ),
+        )
+        self.async_max_workers = max(
+            1,
+            int(_config_value(config, "ASYNC_MAX_WORKERS", DEFAULT_ASYNC_MAX_WORKERS)),
+        )
+        self._async_executor: Optional[ThreadPoolExecutor] = None
+        self._async_executor_lock = threading.Lock()
+        self.batch_window = max(
+            0, int(_config_value(config, "BATCH_WINDOW", DEFAULT_BATCH_WINDOW))
+        )
+        self.transcript_cache = _create_transcript_cache(config)
+        self.journal_dir = _config_value(config, "JOURNAL_DIR", "")
+        self.output_bucket = _config_value(config, "OUTPUT_BUCKET", "")
+        self.output_root_path = _config_value(config, "OUTPUT_ROOT_PATH", "")
+        self.word_timings = _config_bool(config, "WORD_TIMINGS", False)
+        self.audio_preprocessor: Optional[AudioPreprocessor] = (
+            AudioPreprocessor(
+                ffmpeg_path=_config_value(config, "FFMPEG_PATH", "ffmpeg"),
+                sample_rate=int(
+                    _config_value(
+                        config, "PREPROCESS_SAMPLE_RATE", DEFAULT_PREPROCESS_SAMPLE_RATE
+                    )
+                ),
+                media_format=_config_value(
+                    config, "PREPROCESS_FORMAT", DEFAULT_PREPROCESS_FORMAT
+                ),
+                max_workers=int(_config_value(config, "PREPROCESS_CONCURRENCY", 0)),
+            )
+            if _config_bool(config, "PREPROCESS_AUDIO", False)
+            else None
+        )
+        self.s3_content_addressed = _config_bool(config, "S3_CONTENT_ADDRESSED", False)
+        self.s3_transfer_config = _create_s3_transfer_config(config)
         self.s3_client = _create_s3_client(
             aws_region=self.aws_region,
             aws_access_key_id=aws_access_key_id,
             aws_secret_access_key=aws_secret_access_key,
+            config=_create_boto_config(
+                config,
+                self.upload_concurrency
+                * (
+                    self.s3_transfer_config.max_request_concurrency
+                    if self.s3_transfer_config.use_threads
+                    else 1
+                ),
+            ),
         )
         self.transcribe_client = _create_transcribe_client(
             aws_region=self.aws_region,
             aws_access_key_id=aws_access_key_id,
             aws_secret_access_key=aws_secret_access_key,
+            config=_create_boto_config(config, self.transcript_fetch_concurrency),
         )
-        self.poll_interval = float(
-            config.get(
-                "POLL_INTERVAL",
-                os.environ.get("TRANSCRIBE_AWS_POLL_INTERVAL", DEFAULT_POLL_INTERVAL),
+        self.http_connect_timeout = float(
+            _config_value(config, "HTTP_CONNECT_TIMEOUT", DEFAULT_HTTP_CONNECT_TIMEOUT)
+        )
+        self.http_read_timeout = float(
+            _config_value(config, "HTTP_READ_TIMEOUT", DEFAULT_HTTP_READ_TIMEOUT)
+        )
+        self.http_session = _create_http_session(
+            pool_size=max(
+                int(_config_value(config, "HTTP_POOL_SIZE", DEFAULT_HTTP_POOL_SIZE)),
+                self.transcript_fetch_concurrency,
+            ),
+            max_retries=int(
+                _config_value(config, "HTTP_MAX_RETRIES", DEFAULT_HTTP_MAX_RETRIES)
+            ),
+            retry_backoff=float(
+                _config_value(config, "HTTP_RETRY_BACKOFF", DEFAULT_HTTP_RETRY_BACKOFF)
+            ),
+        )
+        self.start_job_limiter = StartJobRateLimiter(
+            max_rate=float(
+                _config_value(config, "START_JOB_MAX_RATE", DEFAULT_START_JOB_MAX_RATE)
+            ),
+            max_in_flight=int(_config_value(config, "START_JOB_MAX_IN_FLIGHT", 0)),
+            clock=self._now,
+        )
+        completion_queue_url = _config_value(config, "COMPLETION_QUEUE_URL", "")
+        self.completion_queue_fallback_poll_interval = float(
+            _config_value(
+                config,
+                "COMPLETION_QUEUE_FALLBACK_POLL_INTERVAL",
+                DEFAULT_COMPLETION_QUEUE_FALLBACK_POLL_INTERVAL,
             )
         )
+        self.job_event_source: Optional[SqsJobEventSource] = (
+            SqsJobEventSource(
+                _create_sqs_client(
+                    aws_region=self.aws_region,
+                    aws_access_key_id=aws_access_key_id,
+                    aws_secret_access_key=aws_secret_access_key,
+                    config=_create_boto_config(config, 1),
+                ),
+                completion_queue_url,
+                wait_secs=int(
+                    _config_value(
+                        config,
+                        "COMPLETION_QUEUE_WAIT_SECS",
+                        DEFAULT_COMPLETION_QUEUE_WAIT_SECS,
+                    )
+                ),
+            )
+            if completion_queue_url
+            else None
+        )
+        self.status_sweeper: Optional[StatusSweeper] = (
+            StatusSweeper(
+                list_jobs=self.transcribe_client.list_transcription_jobs,
+                get_batch_status=self._get_batch_status,
+                min_interval=self.poll_interval_min,
+                max_pages=int(
+                    _config_value(
+                        config,
+                        "STATUS_SWEEP_MAX_PAGES",
+                        DEFAULT_STATUS_SWEEP_MAX_PAGES,
+                    )
+                ),
+                max_batch_calls=int(
+                    _config_value(
+                        config,
+                        "STATUS_SWEEP_MAX_BATCH_CALLS",
+                        DEFAULT_STATUS_SWEEP_MAX_BATCH_CALLS,
+                    )
+                ),
+                clock=self._now,
+            )
+            if _config_bool(config, "STATUS_SWEEP", False)
+            else None
+        )
+        self.cleaner: Optional[Cleaner] = (
+            Cleaner(
+                self.s3_client,
+                self.transcribe_client,
+                self.s3_bucket_source,
+                linger_secs=float(
+                    _config_value(
+                        config, "CLEANUP_LINGER_SECS", DEFAULT_CLEANUP_LINGER_SECS
+                    )
+                ),
+            )
+            if _config_bool(config, "CLEANUP", False)
+            else None
+        )
+
+    def _now(self) -> float:
+        return self.clock()
+
+    def flush_cleanup(self, timeout: Optional[float] = None) -> bool:
+        """
+        Waits up to timeout secs for the deletes queued by CLEANUP to be made,
+        returning whether they were (always true without CLEANUP)
+        """
+        return self.cleaner.flush(timeout=timeout) if self.cleaner else True
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Stops the service's background threads once its batches are done,
+        first waiting up to timeout secs for queued cleanup deletes (see CLEANUP)
+        """
+        if self.cleaner:
+            if not self.cleaner.flush(timeout=timeout):
+                logger.warning("closing with cleanup deletes still queued")
+            self.cleaner.close()
+        if self.job_event_source:
+            self.job_event_source.close()
+        if self.audio_preprocessor:
+            self.audio_preprocessor.close()
+        with self._async_executor_lock:
+            if self._async_executor is not None:
+                self._async_executor.shutdown(wait=False)
+                self._async_executor = None
 
     def transcribe(
         self,
         transcribe_requests: Iterable[TranscribeJobRequest],
         batch_id: str = "",
         on_update: Optional[Callable[[TranscribeJobsUpdate], None]] = None,
+        on_upload_progress: Optional[Callable[[UploadProgress], None]] = None,
+        resume: bool = False,
+        reattach: bool = False,
         **kwargs,
     ) -> TranscribeBatchResult:
-        batch_id = batch_id or next_batch_id()
-        logger.info(
-            f"transcribe[{batch_id}]: assigning batch id {batch_id} to all jobs"
+        """
+        Transcribes a batch of audio files, returning when all jobs are resolved.
+
+        If given, on_upload_progress receives the byte progress of each upload.
+        It is called from upload threads (possibly concurrently)
+        and so must be thread safe.
+
+        With resume, continues a batch (with the same batch_id and requests)
+        that was interrupted, from its journal (see JOURNAL_DIR):
+        jobs already resolved aren't transcribed again,
+        and jobs already uploaded or started in aws are picked up
+        where they left off rather than uploaded and started again.
+
+        With reattach, does the same without a journal (see reattach).
+        """
+        batch = self._begin_batch(
+            transcribe_requests,
+            batch_id,
+            on_update,
+            on_upload_progress,
+            resume,
+            reattach,
         )
-        result = TranscribeBatchResult(
-            transcribeJobsById={
-                j.get_fq_id(): j
-                for j in requests_to_job_batch(batch_id, transcribe_requests)
-            }
+        for _ in self._run_batch(batch):
+            pass
+        return batch.jobs.snapshot()
+
+    def reattach(
+        self,
+        batch_id: str,
+        transcribe_requests: Iterable[TranscribeJobRequest],
+        on_update: Optional[Callable[[TranscribeJobsUpdate], None]] = None,
+        on_upload_progress: Optional[Callable[[UploadProgress], None]] = None,
+        **kwargs,
+    ) -> TranscribeBatchResult:
+        """
+        Transcribes a batch that was interrupted (e.g. by a restart)
+        without needing a journal, since the aws job names of a batch's jobs
+        follow from its batch_id and the requests' job ids.
+
+        Jobs that already exist in aws are adopted in their current status
+        (with the transcripts of those already completed),
+        and only the rest are uploaded and started.
+        """
+        return self.transcribe(
+            transcribe_requests,
+            batch_id=batch_id,
+            on_update=on_update,
+            on_upload_progress=on_upload_progress,
+            reattach=True,
+            **kwargs,
         )
+
+    def transcribe_iter(
+        self,
+        transcribe_requests: Iterable[TranscribeJobRequest],
+        batch_id: str = "",
+        on_update: Optional[Callable[[TranscribeJobsUpdate], None]] = None,
+        on_upload_progress: Optional[Callable[[UploadProgress], None]] = None,
+        resume: bool = False,
+        reattach: bool = False,
+        **kwargs,
+    ) -> Iterator[TranscribeJob]:
+        """
+        Transcribes a batch of audio files like transcribe,
+        but yields each job as soon as it's resolved (SUCCEEDED or FAILED).
+
+        The batch only makes progress while the iterator is consumed.
+        Closing the iterator early abandons the batch's unresolved jobs.
+        """
+        batch = self._begin_batch(
+            transcribe_requests,
+            batch_id,
+            on_update,
+            on_upload_progress,
+            resume,
+            reattach,
+        )
+        batch.ids_resolved = deque()
+        for _ in self._run_batch(batch):
+            while batch.ids_resolved:
+                jid = batch.ids_resolved.popleft()
+                batch.ids_yielded.append(jid)
+                yield batch.jobs.get(jid).to_job()
+
+    def _run_batch(self, batch: _Batch) -> Iterator[None]:
+        """
+        Uploads, starts and polls the jobs of a batch until all are resolved,
+        yielding after each step
+        """
+        try:
+            yield from self._admit_jobs(batch)
+            secs_until_poll = batch.poll_scheduler.next_interval()
+            while self._has_unresolved(batch):
+                wait_secs = self._next_wait_secs(batch, secs_until_poll)
+                if wait_secs > 0 and self.job_event_source:
+                    secs_until_poll -= self._wait_for_job_events(batch, wait_secs)
+                elif wait_secs > 0:
+                    time.sleep(wait_secs)
+                    secs_until_poll -= wait_secs
+                self._start_ready_jobs(batch)
+                if secs_until_poll <= 0:
+                    self._update_status(batch)
+                    secs_until_poll = batch.poll_scheduler.next_interval()
+                yield
+                yield from self._admit_jobs(batch)
+        except BaseException:
+            self._on_abandoned(batch)
+            raise
+        finally:
+            self._end_batch(batch)
+
+    def _admit_jobs(self, batch: _Batch) -> Generator[None, None, None]:
+        """
+        Admits as many of the batch's pending jobs as its window allows
+        and uploads them (see _upload_all), yielding as each is staged
+        """
+        jobs = self._resume_jobs(batch, self._next_jobs_to_admit(batch))
+        if batch.ids_resolved:
+            # e.g. jobs resumed already resolved, for transcribe_iter to yield
+            yield
         start = time.time()
-        for i, job in enumerate(result.jobs()):
-            upload_start = time.time()
+        for staged in self._upload_all(jobs, batch):
+            self._on_staged(batch, staged)
+            yield
+        if jobs:
             logger.info(
-                f"transcribe[{batch_id}]: upload start for job {job.get_fq_id()}..."
+                f"transcribe[{batch.batch_id}]: uploads of {len(jobs)} jobs completed in {time.time() - start} secs"
+            )
+
+    def _next_jobs_to_admit(self, batch: _Batch) -> List[TranscribeJob]:
+        """
+        Takes the next jobs to admit from batch.jobs_pending, adding them
+        to batch.jobs if the batch is windowed (see BATCH_WINDOW).
+        For a windowed transcribe_iter, jobs already yielded are dropped
+        from batch.jobs first, so it never holds more than the window.
+        """
+        if batch.jobs_pending is None:
+            return []
+        if not batch.window:
+            jobs = list(batch.jobs_pending)
+            batch.jobs_pending = None
+            batch.count_admitted += len(jobs)
+            return jobs
+        if batch.ids_resolved is not None and batch.ids_yielded:
+            for jid in batch.ids_yielded:
+                batch.jobs.remove(jid)
+                batch.s3_paths.pop(jid, None)
+                batch.cache_keys.pop(jid, None)
+            batch.ids_yielded.clear()
+        count_free = batch.window - (batch.count_admitted - batch.count_resolved)
+        if count_free <= 0:
+            return []
+        jobs = []
+        for j in batch.jobs_pending:
+            jid = j.get_fq_id()
+            if jid in batch.ids_admitted:
+                # a request with the same job id as one admitted before
+                continue
+            batch.ids_admitted.add(jid)
+            jobs.append(j)
+            if len(jobs) == count_free:
+                break
+        else:
+            batch.jobs_pending = None
+        batch.count_admitted += len(jobs)
+        for j in jobs:
+            batch.jobs.add(j)
+        return jobs
+
+    def _resume_jobs(
+        self, batch: _Batch, jobs: List[TranscribeJob]
+    ) -> List[TranscribeJob]:
+        """
+        For a resumed or reattached batch, restores the admitted jobs
+        that are in its journal or already exist in aws,
+        returning the rest (which need uploading as usual).
+
+        Jobs journaled as resolved are resolved again as they were.
+        Others are looked for among the batch's jobs in aws
+        (for a reattached batch, listed only once, however many admissions):
+        a job found there is adopted and polled from its current status,
+        one that isn't is started again if its upload completed.
+        """
+        if not (batch.journaled or batch.reattached):
+            return jobs
+        entries = {
+            j.get_fq_id(): batch.journaled.pop(j.get_fq_id(), None) for j in jobs
+        }
+        ids_to_find = [
+            jid
+            for jid, e in entries.items()
+            if (e is None and batch.reattached)
+            or (
+                e is not None
+                and e["status"]
+                not in [
+                    TranscribeJobStatus.SUCCEEDED.name,
+                    TranscribeJobStatus.FAILED.name,
+                ]
             )
-            result = self._upload_one(job, i, result, on_update)
+        ]
+        aws_jobs = self._find_aws_jobs(batch, ids_to_find)
+        jobs_to_upload: List[TranscribeJob] = []
+        ids_restored: List[str] = []
+        aws_jobs_adopted: List[Dict[str, Any]] = []
+        for job in jobs:
+            jid = job.get_fq_id()
+            entry = entries[jid] or {}
+            if entry.get("s3Path"):
+                batch.s3_paths[jid] = entry["s3Path"]
+            if entry.get("mediaFormat"):
+                # e.g. the format it was converted to before upload
+                batch.jobs.set_media_format(jid, entry["mediaFormat"])
+            if entry.get("status") in [
+                TranscribeJobStatus.SUCCEEDED.name,
+                TranscribeJobStatus.FAILED.name,
+            ]:
+                batch.jobs.update(
+                    jid,
+                    TranscribeJobStatus[entry["status"]],
+                    entry.get("transcript", ""),
+                    entry.get("info"),
+                )
+                batch.count_resolved += 1
+                if batch.ids_resolved is not None:
+                    batch.ids_resolved.append(jid)
+                ids_restored.append(jid)
+            elif jid in aws_jobs:
+                self.start_job_limiter.on_adopted()
+                self._on_job_started(batch, jid)
+                ids_restored.append(jid)
+                aws_jobs_adopted.append(aws_jobs[jid])
+            elif jid in batch.s3_paths:
+                batch.jobs.update(jid, TranscribeJobStatus.UPLOADED)
+                batch.ready_to_start.append(jid)
+                ids_restored.append(jid)
+            else:
+                jobs_to_upload.append(job)
+        if ids_restored:
             logger.info(
-                f"transcribe[{batch_id}]: upload completed for job {job.get_fq_id()} in {time.time() - upload_start} secs"
+                f"transcribe[{batch.batch_id}]: resumed {len(ids_restored)} jobs ({len(aws_jobs_adopted)} found in aws)"
             )
-            result = self._try_ensure_all_jobs_started(result, batch_id, on_update)
-        logger.info(
-            f"transcribe[{batch_id}]: all uploads completed in {time.time() - start} secs"
-        )
-        while result.has_any_unresolved():
-            if self.poll_interval > 0:
-                time.sleep(self.poll_interval)
-            check_status_start = time.time()
-            logger.info(f"transcribe[{batch_id}]: checking status...")
-            result = self._try_ensure_all_jobs_started(result, batch_id, on_update)
-            result = self._update_status(result, batch_id, on_update=on_update)
+        self._send_on_update(batch, ids_restored)
+        if aws_jobs_adopted:
+            # applies any progress made while the batch was interrupted
+            self._apply_job_updates(batch, aws_jobs_adopted)
+        self._start_ready_jobs(batch)
+        return jobs_to_upload
+
+    def _find_aws_jobs(
+        self, batch: _Batch, ids_to_find: List[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the summaries of those of the given jobs that exist in aws.
+        A reattached batch lists all its jobs on its first admission,
+        so windowed admissions after that need no listing of their own
+        """
+        if not ids_to_find:
+            return {}
+        if not batch.reattached:
+            return {
+                ju.get("TranscriptionJobName", ""): ju
+                for ju in self._get_batch_status(batch.batch_id, ids_to_find)
+            }
+        if batch.aws_jobs_found is None:
+            batch.aws_jobs_found = {
+                ju.get("TranscriptionJobName", ""): ju
+                for ju in self._get_batch_status(
+                    batch.batch_id, ids_to_find, list_all=True
+                )
+            }
+        return {
+            jid: batch.aws_jobs_found.pop(jid)
+            for jid in ids_to_find
+            if jid in batch.aws_jobs_found
+        }
+
+    def _has_unresolved(self, batch: _Batch) -> bool:
+        return (
+            batch.jobs_pending is not None
+            or batch.count_admitted > batch.count_resolved
+        )
+
+    async def transcribe_async(
+        self,
+        transcribe_requests: Iterable[TranscribeJobRequest],
+        batch_id: str = "",
+        on_update: Optional[
+            Callable[[TranscribeJobsUpdate], Optional[Awaitable[None]]]
+        ] = None,
+        on_upload_progress: Optional[Callable[[UploadProgress], None]] = None,
+        resume: bool = False,
+        reattach: bool = False,
+        **kwargs,
+    ) -> TranscribeBatchResult:
+        """
+        Like transcribe, but for use from an asyncio event loop.
+
+        Waits between polls are asyncio sleeps, and the (blocking) calls
+        to S3 and Transcribe run on a thread pool shared by all batches
+        (see ASYNC_MAX_WORKERS), so no thread is held by a batch
+        while it waits. on_update may be a coroutine function;
+        either way it's called on the event loop.
+        """
+        loop = asyncio.get_running_loop()
+        executor = self._get_async_executor()
+        updates: Deque[TranscribeJobsUpdate] = deque()
+        batch = self._begin_batch(
+            transcribe_requests,
+            batch_id,
+            updates.append if on_update else None,
+            on_upload_progress,
+            resume,
+            reattach,
+        )
+
+        async def _run(fn: Callable[..., R], *args: Any) -> R:
+            r = await loop.run_in_executor(executor, fn, *args)
+            while updates:
+                try:
+                    handled = on_update(updates.popleft()) if on_update else None
+                    if inspect.isawaitable(handled):
+                        await handled
+                except Exception as ex:
+                    logger.exception(f"update handler raise exception: {ex}")
+            return r
+
+        try:
+            await self._admit_jobs_async(batch, executor, _run)
+            secs_until_poll = batch.poll_scheduler.next_interval()
+            while self._has_unresolved(batch):
+                wait_secs = self._next_wait_secs(batch, secs_until_poll)
+                if wait_secs > 0 and self.job_event_source:
+                    secs_until_poll -= await self._wait_for_job_events_async(
+                        batch, wait_secs, _run
+                    )
+                elif wait_secs > 0:
+                    await asyncio.sleep(wait_secs)
+                    secs_until_poll -= wait_secs
+                if batch.ready_to_start:
+                    await _run(self._start_ready_jobs, batch)
+                if secs_until_poll <= 0:
+                    await _run(self._update_status, batch)
+                    secs_until_poll = batch.poll_scheduler.next_interval()
+                await self._admit_jobs_async(batch, executor, _run)
+        except BaseException:
+            self._on_abandoned(batch)
+            raise
+        finally:
+            self._end_batch(batch)
+        return batch.jobs.snapshot()
+
+    async def _admit_jobs_async(
+        self,
+        batch: _Batch,
+        executor: ThreadPoolExecutor,
+        run: Callable[..., Awaitable[Any]],
+    ) -> None:
+        """
+        Like _admit_jobs, but stages the jobs on the async executor
+        """
+        loop = asyncio.get_running_loop()
+        jobs = self._next_jobs_to_admit(batch)
+        if batch.journaled or batch.reattached:
+            jobs = await run(self._resume_jobs, batch, jobs)
+        start = time.time()
+        pending: Dict["asyncio.Future[_StagedJob]", int] = {}
+        jobs_preprocessing = self._preprocess_ahead(jobs)
+        try:
+            for i, job, preprocessing in jobs_preprocessing:
+                pending[
+                    loop.run_in_executor(
+                        executor,
+                        self._stage_one,
+                        job,
+                        i,
+                        len(jobs),
+                        batch.on_upload_progress,
+                        preprocessing,
+                    )
+                ] = i
+                while pending and (
+                    len(pending) >= self.upload_concurrency or i == len(jobs) - 1
+                ):
+                    done, _ = await asyncio.wait(
+                        pending.keys(), return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for f in sorted(done, key=lambda x: pending[x]):
+                        del pending[f]
+                        await run(self._on_staged, batch, f.result())
+        finally:
+            jobs_preprocessing.close()
+            for f in pending:
+                f.cancel()
+        if jobs:
             logger.info(
-                f"transcribe[{batch_id}]: checking status completed in {time.time() - check_status_start} secs"
+                f"transcribe[{batch.batch_id}]: uploads of {len(jobs)} jobs completed in {time.time() - start} secs"
             )
-        return result
 
-    def _send_on_update(
+    def _get_async_executor(self) -> ThreadPoolExecutor:
+        """
+        Returns the thread pool that runs blocking calls for transcribe_async,
+        creating it on first use
+        """
+        with self._async_executor_lock:
+            if self._async_executor is None:
+                self._async_executor = ThreadPoolExecutor(
+                    max_workers=self.async_max_workers,
+                    thread_name_prefix="transcribe-async",
+                )
+            return self._async_executor
+
+    def _begin_batch(
         self,
-        result: TranscribeBatchResult,
-        ids_updated: List[str],
+        transcribe_requests: Iterable[TranscribeJobRequest],
+        batch_id: str,
         on_update: Optional[Callable[[TranscribeJobsUpdate], None]],
-    ):
+        on_upload_progress: Optional[Callable[[UploadProgress], None]],
+        resume: bool = False,
+        reattach: bool = False,
+    ) -> _Batch:
+        if resume and not (batch_id and self.journal_dir):
+            raise ValueError(
+                "resume requires the batch_id of the batch to resume and a JOURNAL_DIR"
+            )
+        if reattach and not batch_id:
+            raise ValueError("reattach requires the batch_id of the batch to reattach")
+        batch_id = batch_id or next_batch_id()
+        logger.info(
+            f"transcribe[{batch_id}]: assigning batch id {batch_id} to all jobs"
+        )
+        journaled: Dict[str, Dict[str, Any]] = {}
+        journal: Optional[BatchJournal] = None
+        if self.journal_dir:
+            journal_path = os.path.join(self.journal_dir, f"{batch_id}.jsonl")
+            if resume:
+                journaled = read_journal(journal_path)
+                logger.info(
+                    f"transcribe[{batch_id}]: resuming {len(journaled)} jobs from journal {journal_path}"
+                )
+            journal = BatchJournal(journal_path, append=resume or reattach)
+        jobs = JobStore()
+        if self.batch_window:
+            # jobs are created as they're admitted (see _next_jobs_to_admit)
+            jobs_pending: Iterator[TranscribeJob] = (
+                r.to_job(batch_id) for r in transcribe_requests
+            )
+        else:
+            # requests with the same job id are one job (the first request wins,
+            # as when admitted through a window)
+            jobs_by_id: Dict[str, TranscribeJob] = {}
+            for j in requests_to_job_batch(batch_id, transcribe_requests):
+                jobs_by_id.setdefault(j.get_fq_id(), j)
+            for j in jobs_by_id.values():
+                jobs.add(j)
+            jobs_pending = iter(list(jobs_by_id.values()))
+        return _Batch(
+            batch_id=batch_id,
+            poll_scheduler=(
+                # with job events, listing jobs is just a fallback
+                PollScheduler(
+                    self.completion_queue_fallback_poll_interval,
+                    self.completion_queue_fallback_poll_interval,
+                    clock=self._now,
+                )
+                if self.job_event_source
+                else PollScheduler(
+                    self.poll_interval_min,
+                    self.poll_interval_max,
+                    backoff=self.poll_backoff,
+                    clock=self._now,
+                )
+            ),
+            jobs=jobs,
+            on_update=on_update,
+            on_upload_progress=on_upload_progress,
+            window=self.batch_window,
+            jobs_pending=jobs_pending,
+            journal=journal,
+            resumed=resume or reattach,
+            reattached=reattach,
+            journaled=journaled,
+        )
+
+    def _on_staged(self, batch: _Batch, staged: _StagedJob) -> None:
+        """
+        Records a job that has been uploaded (or found in the transcript cache)
+        and starts any jobs that are ready
+        """
+        jid = staged.job.get_fq_id()
+        if staged.cache_key:
+            batch.cache_keys[jid] = staged.cache_key
+        if staged.cached_transcript is not None:
+            batch.jobs.update(
+                jid,
+                TranscribeJobStatus.SUCCEEDED,
+                staged.cached_transcript,
+                staged.cached_info,
+            )
+            batch.count_resolved += 1
+            if batch.ids_resolved is not None:
+                batch.ids_resolved.append(jid)
+            self._journal(batch, jid)
+            self._send_on_update(batch, [jid])
+            return
+        batch.s3_paths[jid] = staged.s3_path
+        if staged.media_format:
+            batch.jobs.set_media_format(jid, staged.media_format)
+        batch.jobs.update(jid, TranscribeJobStatus.UPLOADED)
+        self._journal(batch, jid)
+        self._send_on_update(batch, [jid])
+        batch.ready_to_start.append(jid)
+        self._start_ready_jobs(batch)
+
+    def _next_wait_secs(self, batch: _Batch, secs_until_poll: float) -> float:
+        # jobs waiting to start may be retried before the next poll
+        return (
+            min(secs_until_poll, self.start_job_limiter.delay())
+            if batch.ready_to_start
+            else secs_until_poll
+        )
+
+    def _wait_for_job_events(self, batch: _Batch, wait_secs: float) -> float:
+        """
+        Waits up to wait_secs for state-change events for the batch's jobs
+        and applies any that arrive, returning the secs waited
+        """
+        assert self.job_event_source is not None
+        started_at = self._now()
+        job_events = self.job_event_source.wait(self._ids_in_flight(batch), wait_secs)
+        if not job_events:
+            return wait_secs
+        self._apply_job_updates(batch, job_events)
+        return min(wait_secs, self._now() - started_at)
+
+    async def _wait_for_job_events_async(
+        self,
+        batch: _Batch,
+        wait_secs: float,
+        run: Callable[..., Awaitable[None]],
+    ) -> float:
+        """
+        Like _wait_for_job_events, but checks for events received
+        between short asyncio sleeps, so no thread is held while waiting
+        """
+        assert self.job_event_source is not None
+        waited_secs = 0.0
+        while waited_secs < wait_secs:
+            step_secs = min(wait_secs - waited_secs, JOB_EVENT_CHECK_INTERVAL)
+            await asyncio.sleep(step_secs)
+            waited_secs += step_secs
+            job_events = self.job_event_source.take(self._ids_in_flight(batch))
+            if job_events:
+                await run(self._apply_job_updates, batch, job_events)
+                return waited_secs
+        return waited_secs
+
+    def _end_batch(self, batch: _Batch) -> None:
+        if self.status_sweeper:
+            self.status_sweeper.unregister(batch.batch_id)
+        if self.job_event_source:
+            self.job_event_source.remove_jobs(self._ids_in_flight(batch))
+        if batch.journal:
+            batch.journal.close()
+
+    def _on_abandoned(self, batch: _Batch) -> None:
+        # jobs abandoned by this batch no longer count against its limiter
+        self.start_job_limiter.on_resolved(
+            batch.jobs.count(
+                [TranscribeJobStatus.QUEUED, TranscribeJobStatus.IN_PROGRESS]
+            )
+        )
+
+    def _send_on_update(self, batch: _Batch, ids_updated: List[str]) -> None:
+        """
+        Sends on_update a snapshot of the batch's jobs.
+        Snapshots are only taken here, so batches with no on_update
+        never copy their jobs.
+        """
+        on_update = batch.on_update
         if on_update and len(ids_updated) > 0:
-            assert on_update is not None
             try:
                 on_update(
-                    TranscribeJobsUpdate(result=result, idsUpdated=sorted(ids_updated))
+                    TranscribeJobsUpdate(
+                        result=batch.jobs.snapshot(), idsUpdated=sorted(ids_updated)
+                    )
                 )
             except Exception as ex:
                 logger.exception(f"update handler raise exception: {ex}")
-        return result
 
-    def _try_ensure_all_jobs_started(
-        self,
-        result: TranscribeBatchResult,
-        batch_id: str,
-        on_update: Optional[Callable[[TranscribeJobsUpdate], None]],
-    ):
-        if not any(j.status == TranscribeJobStatus.UPLOADED for j in result.jobs()):
-            return result
-        result = copy_shallow(result)
-        job_ids_started = []
-        try:
-            for job in result.jobs():
-                if job.status != TranscribeJobStatus.UPLOADED:
-                    continue
-                jid = job.get_fq_id()
-                item_s3_path = self.get_s3_path(job.sourceFile, jid)
+    def _start_ready_jobs(self, batch: _Batch) -> None:
+        """
+        Starts transcribe jobs for the uploaded jobs in batch.ready_to_start.
+
+        Only the queue is visited (never the whole batch),
+        so the cost of a call is proportional to the jobs started.
+        While uploads run on the upload pool,
+        these start calls overlap with the uploads still in flight.
+        Starts are paced by the service's start_job_limiter;
+        a job that fails to start stays at the front of the queue
+        and is retried once the limiter allows.
+        """
+        ready_to_start = batch.ready_to_start
+        if not ready_to_start:
+            return
+        job_ids_started: List[str] = []
+        while ready_to_start:
+            jid = ready_to_start[0]
+            job = batch.jobs.get(jid)
+            if job.status != TranscribeJobStatus.UPLOADED:
+                ready_to_start.popleft()
+                continue
+            if not self.start_job_limiter.acquire():
+                break
+            item_s3_path = batch.s3_paths.get(jid) or self.get_s3_path(
+                job.sourceFile, jid
+            )
+            if self.job_event_source:
+                # registered first, so an event that arrives early isn't skipped
+                self.job_event_source.add_jobs([jid])
+            output_kwargs = (
+                {
+                    "OutputBucketName": self.output_bucket,
+                    "OutputKey": self.get_transcript_s3_path(jid),
+                }
+                if self.output_bucket
+                else {}
+            )
+            try:
                 self.transcribe_client.start_transcription_job(
                     TranscriptionJobName=jid,
                     LanguageCode=job.languageCode,
@@ -310,36 +1577,139 @@ class AWSTranscriptionService(TranscriptionService):
                         "MediaFileUri": f"https://s3.{self.aws_region}.amazonaws.com/{self.s3_bucket_source}/{item_s3_path}"
                     },
                     MediaFormat=job.mediaFormat,
+                    **output_kwargs,
                 )
-                result.update_job(jid, status=TranscribeJobStatus.QUEUED)
-                job_ids_started.append(jid)
-        except BaseException as ex:
-            if re.search("throttlingexception", str(ex), re.IGNORECASE) or re.search(
-                "limitexceeded", str(ex), re.IGNORECASE
-            ):
-                logger.warning(
-                    f"[batch: {batch_id}] received a limit-exceeded response from aws. Will try again to start this job shortly"
-                )
-            else:
-                logger.exception(f"[batch: {batch_id}] exception on start jobs: {ex}")
-        if job_ids_started:
-            self._send_on_update(result, job_ids_started, on_update)
-        return result
+            except BaseException as ex:
+                if batch.resumed and _is_conflict_error(ex):
+                    # started before the batch was interrupted
+                    logger.info(
+                        f"[batch: {batch.batch_id}] job {jid} already exists in aws, resuming it"
+                    )
+                    self.start_job_limiter.on_adopted()
+                    self._on_job_started(batch, jid)
+                    job_ids_started.append(jid)
+                    continue
+                if self.job_event_source:
+                    self.job_event_source.remove_jobs([jid])
+                if _is_throttling_error(ex):
+                    self.start_job_limiter.on_throttled(
+                        limit_exceeded=_is_limit_exceeded_error(ex)
+                    )
+                    logger.warning(
+                        f"[batch: {batch.batch_id}] received a limit-exceeded response from aws. Will try again to start this job shortly ({self.start_job_limiter.stats()})"
+                    )
+                else:
+                    self.start_job_limiter.on_failed()
+                    logger.exception(
+                        f"[batch: {batch.batch_id}] exception on start jobs: {ex}"
+                    )
+                break
+            self.start_job_limiter.on_started()
+            self._on_job_started(batch, jid)
+            job_ids_started.append(jid)
+        self._send_on_update(batch, job_ids_started)
 
-    def _update_status(
-        self,
-        result: TranscribeBatchResult,
-        batch_id: str,
-        on_update: Optional[Callable[[TranscribeJobsUpdate], None]] = None,
-    ) -> TranscribeBatchResult:
-        job_updates = self._get_batch_status(
-            batch_id, [j.get_fq_id() for j in result.jobs()]
+    def _on_job_started(self, batch: _Batch, jid: str) -> None:
+        """
+        Records that a job has been started in aws (and so must be polled)
+        """
+        if batch.ready_to_start and batch.ready_to_start[0] == jid:
+            batch.ready_to_start.popleft()
+        if self.job_event_source:
+            self.job_event_source.add_jobs([jid])
+        else:
+            batch.poll_scheduler.on_job_started(
+                jid,
+                estimate_job_secs(
+                    estimate_audio_duration(batch.jobs.get(jid).sourceFile)
+                ),
+            )
+        if self.status_sweeper:
+            self.status_sweeper.add_jobs(batch.batch_id, [jid])
+        batch.jobs.update(jid, TranscribeJobStatus.QUEUED)
+        self._journal(batch, jid)
+
+    def _journal(self, batch: _Batch, jid: str) -> None:
+        """
+        Records a job's current status in the batch's journal, if it has one
+        """
+        if not batch.journal:
+            return
+        job = batch.jobs.get(jid)
+        try:
+            batch.journal.record(
+                jid,
+                job.status,
+                s3_path=batch.s3_paths.get(jid, ""),
+                transcript=job.transcript,
+                info=job.info,
+                media_format=job.mediaFormat,
+            )
+        except Exception as ex:
+            logger.exception(f"failed to journal {jid}: {ex}")
+
+    def _update_status(self, batch: _Batch) -> None:
+        """
+        Polls the status of the batch's jobs and applies the changes
+        (see _apply_job_updates)
+        """
+        batch_id = batch.batch_id
+        check_status_start = time.time()
+        logger.info(f"transcribe[{batch_id}]: checking status...")
+        # only jobs still in flight can change
+        ids_in_flight = self._ids_in_flight(batch)
+        aws_jobs: Dict[str, Dict[str, Any]] = {}
+        if not ids_in_flight:
+            job_updates: List[Dict[str, Any]] = []
+        elif self.status_sweeper:
+            job_updates = self.status_sweeper.get_status(batch_id, ids_in_flight)
+        elif self._should_filter_status(batch, len(ids_in_flight)):
+            job_updates, aws_jobs = self._get_batch_status_filtered(
+                batch_id, ids_in_flight
+            )
+        else:
+            job_updates = self._get_batch_status(batch_id, ids_in_flight)
+        self._apply_job_updates(batch, job_updates, aws_jobs)
+        summary = batch.jobs.summary()
+        logger.info(
+            f"[batch: {batch_id}] transcribe [{summary.get_count_completed()}/{summary.get_count_total()}] completed. Statuses [SUCCEEDED: {summary.get_count(TranscribeJobStatus.SUCCEEDED)}, FAILED: {summary.get_count(TranscribeJobStatus.FAILED)}, QUEUED: {summary.get_count(TranscribeJobStatus.QUEUED)}, IN_PROGRESS: {summary.get_count(TranscribeJobStatus.IN_PROGRESS)}]."
         )
+        logger.info(
+            f"transcribe[{batch_id}]: checking status completed in {time.time() - check_status_start} secs"
+        )
+
+    def _ids_in_flight(self, batch: _Batch) -> List[str]:
+        return batch.jobs.ids(
+            [TranscribeJobStatus.QUEUED, TranscribeJobStatus.IN_PROGRESS]
+        )
+
+    def _apply_job_updates(
+        self,
+        batch: _Batch,
+        job_updates: List[Dict[str, Any]],
+        aws_jobs: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> None:
+        """
+        Applies job summaries (from list_transcription_jobs or job events)
+        to the batch's jobs and reports the changes.
+
+        With the default TRANSCRIPT_FETCH_CONCURRENCY of 1,
+        transcripts of completed jobs are loaded inline
+        and all changes are reported in a single update.
+        Otherwise, status changes are reported first, then transcripts are
+        loaded on a pool of TRANSCRIPT_FETCH_CONCURRENCY threads and each
+        job is reported SUCCEEDED as soon as its transcript arrives.
+        """
+        batch_id = batch.batch_id
+        aws_jobs = aws_jobs or {}
         ids_updated: List[str] = []
-        result = copy_shallow(result)
+        ids_to_fetch: Dict[str, None] = {}
         for ju in job_updates:
             try:
                 jid = ju.get("TranscriptionJobName", "")
+                if jid not in batch.jobs:
+                    # e.g. a job transcribe_iter has yielded and dropped
+                    continue
                 jstatus = _parse_aws_status(
                     ju.get("TranscriptionJobStatus", ""),
                     default_status=TranscribeJobStatus.NONE,
@@ -348,49 +1718,326 @@ class AWSTranscriptionService(TranscriptionService):
                     raise ValueError(
                         f"[batch: {batch_id}] job status has unknown value of {ju.get('TranscriptionJobStatus')}"
                     )
-                if result.job_completed(jid, jstatus):
+                if batch.jobs.get(jid).is_resolved():
+                    continue
+                if (
+                    jstatus == TranscribeJobStatus.SUCCEEDED
+                    and self.transcript_fetch_concurrency > 1
+                ):
+                    ids_to_fetch[jid] = None
                     continue
-                transcript = (
-                    self._load_transcript(jid)
+                transcript, info = (
+                    self._load_transcript(jid, aws_jobs.get(jid))
                     if jstatus == TranscribeJobStatus.SUCCEEDED
-                    else ""
+                    else ("", {})
                 )
-                if result.update_job(jid, status=jstatus, transcript=transcript):
+                if self._update_job_status(batch, jid, jstatus, transcript, info):
                     ids_updated.append(jid)
             except Exception as ex:
                 logger.exception(
                     f"[batch: {batch_id}] failed to handle update for {ju}: {ex}"
                 )
-        summary = result.summary()
-        logger.info(
-            f"[batch: {batch_id}] transcribe [{summary.get_count_completed()}/{summary.get_count_total()}] completed. Statuses [SUCCEEDED: {summary.get_count(TranscribeJobStatus.SUCCEEDED)}, FAILED: {summary.get_count(TranscribeJobStatus.FAILED)}, QUEUED: {summary.get_count(TranscribeJobStatus.QUEUED)}, IN_PROGRESS: {summary.get_count(TranscribeJobStatus.IN_PROGRESS)}]."
+        self._send_on_update(batch, ids_updated)
+        changed = bool(ids_updated)
+        for jid, f in _run_bounded(
+            lambda x: self._load_transcript(x, aws_jobs.get(x)),
+            ids_to_fetch.keys(),
+            self.transcript_fetch_concurrency,
+            f"transcribe-fetch-{batch_id}",
+        ):
+            try:
+                transcript, info = f.result()
+            except Exception as ex:
+                logger.exception(
+                    f"[batch: {batch_id}] failed to load transcript for {jid}: {ex}"
+                )
+                continue
+            if self._update_job_status(
+                batch, jid, TranscribeJobStatus.SUCCEEDED, transcript, info
+            ):
+                changed = True
+                self._send_on_update(batch, [jid])
+        batch.poll_scheduler.on_poll(changed=changed)
+
+    def _update_job_status(
+        self,
+        batch: _Batch,
+        jid: str,
+        jstatus: TranscribeJobStatus,
+        transcript: str,
+        info: Optional[Dict[str, str]] = None,
+    ) -> bool:
+        if not batch.jobs.update(jid, jstatus, transcript, info):
+            return False
+        self._journal(batch, jid)
+        if jstatus == TranscribeJobStatus.SUCCEEDED and jid in batch.cache_keys:
+            assert self.transcript_cache is not None
+            try:
+                self.transcript_cache.set(
+                    batch.cache_keys[jid],
+                    (
+                        json.dumps({"transcript": transcript, "info": info or {}})
+                        if self.word_timings
+                        else transcript
+                    ),
+                )
+            except Exception as ex:
+                logger.exception(f"failed to cache transcript for {jid}: {ex}")
+        if jstatus in [TranscribeJobStatus.SUCCEEDED, TranscribeJobStatus.FAILED]:
+            self.start_job_limiter.on_resolved()
+            batch.poll_scheduler.on_job_resolved(jid)
+            batch.count_resolved += 1
+            if batch.ids_resolved is not None:
+                batch.ids_resolved.append(jid)
+            if self.job_event_source:
+                self.job_event_source.remove_jobs([jid])
+            if self.cleaner:
+                self._clean_up(batch, jid)
+        return True
+
+    def _clean_up(self, batch: _Batch, jid: str) -> None:
+        """
+        Queues the deletes of a resolved job's transcribe job
+        and staged source file (see Cleaner).
+        Content-addressed source files may be shared with other jobs,
+        so they're kept.
+        """
+        assert self.cleaner is not None
+        s3_keys = (
+            []
+            if self.s3_content_addressed
+            else [
+                batch.s3_paths.get(jid)
+                or self.get_s3_path(batch.jobs.get(jid).sourceFile, jid)
+            ]
+        )
+        self.cleaner.delete_later(s3_keys=s3_keys, job_names=[jid])
+
+    def _upload_all(
+        self, jobs: List[TranscribeJob], batch: _Batch
+    ) -> Iterator[_StagedJob]:
+        """
+        Stages jobs (see _stage_one) on a pool of UPLOAD_CONCURRENCY threads,
+        yielding each as soon as it's done.
+        """
+        for _, f in _run_bounded(
+            lambda x: self._stage_one(
+                x[1], x[0], len(jobs), batch.on_upload_progress, x[2]
+            ),
+            self._preprocess_ahead(jobs),
+            self.upload_concurrency,
+            f"transcribe-upload-{batch.batch_id}",
+        ):
+            yield f.result()
+
+    def _preprocess_ahead(
+        self, jobs: List[TranscribeJob]
+    ) -> Generator[
+        Tuple[int, TranscribeJob, Optional["Future[PreprocessedAudio]"]], None, None
+    ]:
+        """
+        Yields each (index, job, conversion of its source file) to stage
+        (see PREPROCESS_AUDIO), converting the next PREPROCESS_CONCURRENCY
+        jobs' files ahead of the one yielded.
+
+        Since staging takes jobs only as uploads free up, the converted files
+        waiting on local disk stay bounded (to about UPLOAD_CONCURRENCY * 2
+        + PREPROCESS_CONCURRENCY) however many jobs are admitted.
+        """
+        preprocessor = self.audio_preprocessor
+        if not preprocessor:
+            for i, job in enumerate(jobs):
+                yield i, job, None
+            return
+        ahead: Deque["Future[PreprocessedAudio]"] = deque()
+        try:
+            for i, job in enumerate(jobs):
+                # this job's conversion and the next PREPROCESS_CONCURRENCY
+                count_ahead = min(preprocessor.max_workers + 1, len(jobs) - i)
+                while len(ahead) < count_ahead:
+                    ahead.append(preprocessor.submit(jobs[i + len(ahead)].sourceFile))
+                yield i, job, ahead.popleft()
+        finally:
+            # e.g. staging stopped early: drop conversions nothing will upload
+            for f in ahead:
+                preprocessor.cancel(f)
+
+    def _stage_one(
+        self,
+        job: TranscribeJob,
+        job_index: int,
+        job_count: int,
+        on_upload_progress: Optional[Callable[[UploadProgress], None]] = None,
+        preprocessing: Optional["Future[PreprocessedAudio]"] = None,
+    ) -> _StagedJob:
+        """
+        Looks up a job's transcript in the transcript cache (if any)
+        and, if not found, uploads its source file
+        (or the converted file from preprocessing, if given)
+        """
+        digest = ""
+        if self.s3_content_addressed or self.transcript_cache:
+            try:
+                digest = file_sha256(job.sourceFile)
+            except OSError:
+                # the upload will fail with a better error
+                logger.exception(f"failed to read source file {job.sourceFile}")
+        cache_key = (
+            # with word timings, the cached value also has the job's info
+            transcript_cache_key(digest, job.languageCode, job.mediaFormat)
+            + (":words" if self.word_timings else "")
+            if self.transcript_cache and digest
+            else ""
+        )
+        if cache_key:
+            assert self.transcript_cache is not None
+            cached_info: Dict[str, str] = {}
+            try:
+                cached_transcript = self.transcript_cache.get(cache_key)
+                if cached_transcript is not None and self.word_timings:
+                    cached = json.loads(cached_transcript)
+                    cached_transcript, cached_info = (
+                        cached["transcript"],
+                        cached["info"],
+                    )
+            except Exception as ex:
+                logger.exception(f"failed to read transcript cache: {ex}")
+                cached_transcript = None
+            if cached_transcript is not None:
+                logger.info(
+                    f"transcribe [{job_index + 1}/{job_count}] found cached transcript for job {job.get_fq_id()}"
+                )
+                if preprocessing and self.audio_preprocessor:
+                    self.audio_preprocessor.cancel(preprocessing)
+                return _StagedJob(
+                    job=job,
+                    cache_key=cache_key,
+                    cached_transcript=cached_transcript,
+                    cached_info=cached_info,
+                )
+        upload_job = job
+        audio: Optional[PreprocessedAudio] = None
+        if preprocessing:
+            try:
+                audio = preprocessing.result()
+                upload_job = replace(
+                    job, sourceFile=audio.path, mediaFormat=audio.media_format
+                )
+            except Exception as ex:
+                logger.warning(f"uploading {job.sourceFile} as is: {ex}")
+        try:
+            s3_path = self._upload_one(
+                upload_job, job_index, job_count, on_upload_progress, digest
+            )
+        finally:
+            if audio and self.audio_preprocessor:
+                self.audio_preprocessor.discard(audio)
+        return _StagedJob(
+            job=job,
+            cache_key=cache_key,
+            s3_path=s3_path,
+            media_format=upload_job.mediaFormat if audio else "",
         )
-        self._send_on_update(result, ids_updated, on_update)
-        return result
 
     def _upload_one(
         self,
         job: TranscribeJob,
         job_index: int,
-        result: TranscribeBatchResult,
-        on_update: Optional[Callable[[TranscribeJobsUpdate], None]],
-    ) -> TranscribeBatchResult:
+        job_count: int,
+        on_upload_progress: Optional[Callable[[UploadProgress], None]] = None,
+        digest: str = "",
+    ) -> str:
+        """
+        Uploads a job's source file and returns the s3 path.
+
+        With S3_CONTENT_ADDRESSED, the path is derived from the file's digest
+        and the upload is skipped if a matching object is already in the bucket.
+        """
+        upload_start = time.time()
         jid = job.get_fq_id()
-        result = copy_shallow(result)
-        item_s3_path = self.get_s3_path(job.sourceFile, jid)
+        if self.s3_content_addressed:
+            item_s3_path = self.get_s3_content_path(job.sourceFile, digest)
+            if self._s3_object_exists(item_s3_path, os.path.getsize(job.sourceFile)):
+                logger.info(
+                    f"transcribe [{job_index + 1}/{job_count}] skipping upload for job {jid}, source already in s3 bucket {self.s3_bucket_source} at path {item_s3_path}"
+                )
+                return item_s3_path
+        else:
+            item_s3_path = self.get_s3_path(job.sourceFile, jid)
         logger.info(
-            f"transcribe [{job_index + 1}/{len(result.transcribeJobsById)}] uploading audio to s3 bucket {self.s3_bucket_source} and path {item_s3_path}"
+            f"transcribe [{job_index + 1}/{job_count}] uploading audio to s3 bucket {self.s3_bucket_source} and path {item_s3_path}"
         )
+        upload_kwargs: Dict[str, Any] = {}
+        if on_upload_progress:
+            upload_kwargs["Callback"] = _upload_progress_callback(
+                jid, job.sourceFile, on_upload_progress
+            )
         self.s3_client.upload_file(
             job.sourceFile,
             self.s3_bucket_source,
             item_s3_path,
             ExtraArgs={"ACL": "public-read"},
+            Config=self.s3_transfer_config,
+            **upload_kwargs,
         )
-        result = copy_shallow(result)
-        result.update_job(jid, status=TranscribeJobStatus.UPLOADED)
-        self._send_on_update(result, [jid], on_update)
-        return result
+        logger.info(
+            f"transcribe[{job.batchId}]: upload completed for job {jid} in {time.time() - upload_start} secs"
+        )
+        return item_s3_path
+
+    def _s3_object_exists(self, s3_path: str, content_length: int) -> bool:
+        try:
+            head = self.s3_client.head_object(Bucket=self.s3_bucket_source, Key=s3_path)
+        except ClientError as ex:
+            if _is_missing_object_error(ex):
+                return False
+            raise ex
+        return head.get("ContentLength") == content_length
+
+
+def _is_missing_object_error(ex: ClientError) -> bool:
+    """
+    Whether an s3 error means the object requested doesn't exist.
+    Without s3:ListBucket on the bucket, s3 reports a missing object
+    as 403 (rather than 404), so that counts as missing too
+    """
+    return ex.response.get("Error", {}).get("Code") in [
+        "403",
+        "404",
+        "AccessDenied",
+        "NoSuchKey",
+        "NotFound",
+    ]
+
+
+def _upload_progress_callback(
+    jid: str, source_file: str, on_upload_progress: Callable[[UploadProgress], None]
+) -> Callable[[int], None]:
+    """
+    Adapts the incremental byte counts that boto3 reports
+    (from multiple threads for multipart uploads)
+    to cumulative UploadProgress for a job
+    """
+    try:
+        bytes_total = os.path.getsize(source_file)
+    except OSError:
+        bytes_total = 0
+    bytes_uploaded = 0
+    lock = threading.Lock()
+
+    def _callback(bytes_amount: int) -> None:
+        nonlocal bytes_uploaded
+        with lock:
+            bytes_uploaded += bytes_amount
+            progress = UploadProgress(
+                jobId=jid, bytesUploaded=bytes_uploaded, bytesTotal=bytes_total
+            )
+        try:
+            on_upload_progress(progress)
+        except Exception as ex:
+            logger.exception(f"upload progress handler raise exception: {ex}")
+
+    return _callback
 
 
 register_transcription_service_factory("transcribe_aws", AWSTranscriptionService)
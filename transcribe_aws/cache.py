@@ -0,0 +1,116 @@
+#
+# This software is Copyright ©️ 2020 The University of Southern California. All Rights Reserved.
+# Permission to use, copy, modify, and distribute this software and its documentation for educational, research and non-profit purposes, without fee, and without a written agreement is hereby granted, provided that the above copyright notice and subject to the full license file found in the root of this software deliverable. Permission to make commercial use of this software may be obtained by contacting:  USC Stevens Center for Innovation University of Southern California 1150 S. Olive Street, Suite 2300, Los Angeles, CA 90115, USA Email: accounting@stevens.usc.edu
+#
+# The full terms of this copyright and license should always be found in the root directory of this software deliverable as "license.txt" and if these terms are not found with this software, please contact the USC Stevens Center for the full license.
+#
+from abc import ABC, abstractmethod
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Optional
+
+DEFAULT_TRANSCRIPT_CACHE_MAX_ENTRIES: int = 10000
+
+
+def transcript_cache_key(digest: str, language_code: str, media_format: str) -> str:
+    """
+    Returns the cache key for a transcript of audio with the given content digest
+    """
+    return f"{digest}:{language_code}:{media_format}"
+
+
+class TranscriptCache(ABC):
+    """
+    A cache of transcripts by transcript_cache_key.
+    Implementations must be safe to use from multiple threads.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def set(self, key: str, transcript: str) -> None:
+        raise NotImplementedError()
+
+
+class SqliteTranscriptCache(TranscriptCache):
+    """
+    A TranscriptCache stored in a local sqlite database.
+
+    Entries expire ttl seconds after they were written (never, if ttl is 0),
+    and once there are more than max_entries,
+    the least recently used entries are evicted.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = DEFAULT_TRANSCRIPT_CACHE_MAX_ENTRIES,
+        ttl: float = 0,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS transcripts ("
+                "key TEXT PRIMARY KEY, transcript TEXT NOT NULL,"
+                " created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS transcripts_accessed_at"
+                " ON transcripts (accessed_at)"
+            )
+        self._count = self._db.execute("SELECT COUNT(*) FROM transcripts").fetchone()[0]
+
+    def get(self, key: str) -> Optional[str]:
+        now = self.clock()
+        with self._lock, self._db:
+            row = self._db.execute(
+                "SELECT transcript, created_at FROM transcripts WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            transcript, created_at = row
+            if self.ttl and created_at <= now - self.ttl:
+                self._db.execute("DELETE FROM transcripts WHERE key = ?", (key,))
+                self._count -= 1
+                return None
+            self._db.execute(
+                "UPDATE transcripts SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            return transcript
+
+    def set(self, key: str, transcript: str) -> None:
+        now = self.clock()
+        with self._lock, self._db:
+            exists = self._db.execute(
+                "SELECT 1 FROM transcripts WHERE key = ?", (key,)
+            ).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO transcripts"
+                " (key, transcript, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, transcript, now, now),
+            )
+            if not exists:
+                self._count += 1
+            if self.max_entries and self._count > self.max_entries:
+                self._db.execute(
+                    "DELETE FROM transcripts WHERE key IN (SELECT key FROM transcripts"
+                    " ORDER BY accessed_at ASC LIMIT ?)",
+                    (self._count - self.max_entries,),
+                )
+                self._count = self.max_entries
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,160 @@
+#
+# This software is Copyright ©️ 2020 The University of Southern California. All Rights Reserved.
+# Permission to use, copy, modify, and distribute this software and its documentation for educational, research and non-profit purposes, without fee, and without a written agreement is hereby granted, provided that the above copyright notice and subject to the full license file found in the root of this software deliverable. Permission to make commercial use of this software may be obtained by contacting:  USC Stevens Center for Innovation University of Southern California 1150 S. Olive Street, Suite 2300, Los Angeles, CA 90115, USA Email: accounting@stevens.usc.edu
+#
+# The full terms of this copyright and license should always be found in the root directory of this software deliverable as "license.txt" and if these terms are not found with this software, please contact the USC Stevens Center for the full license.
+#
+import atexit
+from collections import deque
+import logging
+import threading
+from typing import Any, Deque, Iterable, List, Optional
+
+# max keys per call to s3 delete_objects
+S3_DELETE_OBJECTS_MAX_KEYS: int = 1000
+# how long the cleaner waits for more deletes to accumulate before a call
+DEFAULT_CLEANUP_LINGER_SECS: float = 1.0
+# how long, at most, deletes still queued when the process exits are waited for
+CLEANUP_EXIT_TIMEOUT_SECS: float = 30.0
+
+logger = logging.getLogger(__name__)
+
+
+class Cleaner:
+    """
+    Deletes the staged source files (from s3)
+    and the transcribe jobs of resolved jobs,
+    so neither piles up in the account.
+
+    Deletes are queued (see delete_later) and made by a background thread,
+    so cleanup never delays a batch.
+    The thread waits up to `linger_secs` for deletes to accumulate,
+    then deletes objects with delete_objects
+    in chunks of up to S3_DELETE_OBJECTS_MAX_KEYS.
+    Transcribe has no batch delete, so jobs are deleted one call each.
+    Failed deletes are logged and not retried.
+    Deletes still queued when the process exits are flushed
+    (for up to CLEANUP_EXIT_TIMEOUT_SECS), unless the cleaner was closed.
+
+    The cleaner is shared by all batches of a service
+    and is safe to use from multiple threads.
+    """
+
+    def __init__(
+        self,
+        s3_client: Any,
+        transcribe_client: Any,
+        s3_bucket: str,
+        linger_secs: float = DEFAULT_CLEANUP_LINGER_SECS,
+    ):
+        self.s3_client = s3_client
+        self.transcribe_client = transcribe_client
+        self.s3_bucket = s3_bucket
+        self.linger_secs = max(0.0, linger_secs)
+        self._cond = threading.Condition()
+        self._s3_keys: Deque[str] = deque()
+        self._job_names: Deque[str] = deque()
+        self._busy = False
+        self._flushes = 0
+        self._thread: Optional[threading.Thread] = None
+        self._closed = threading.Event()
+        atexit.register(self._flush_at_exit)
+
+    def delete_later(
+        self, s3_keys: Iterable[str] = (), job_names: Iterable[str] = ()
+    ) -> None:
+        with self._cond:
+            if self._closed.is_set():
+                return
+            self._s3_keys.extend(s3_keys)
+            self._job_names.extend(job_names)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._delete_while_queued,
+                    name="transcribe-cleanup",
+                    daemon=True,
+                )
+                self._thread.start()
+            self._cond.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Waits up to timeout secs for all queued deletes to be made,
+        returning whether they were
+        """
+        with self._cond:
+            self._flushes += 1
+            self._cond.notify_all()
+            try:
+                return self._cond.wait_for(
+                    lambda: not (self._s3_keys or self._job_names or self._busy),
+                    timeout=timeout,
+                )
+            finally:
+                self._flushes -= 1
+
+    def close(self) -> None:
+        """
+        Stops the cleaner, dropping deletes not yet made
+        """
+        atexit.unregister(self._flush_at_exit)
+        with self._cond:
+            self._closed.set()
+            self._cond.notify_all()
+
+    def _flush_at_exit(self) -> None:
+        if not self.flush(timeout=CLEANUP_EXIT_TIMEOUT_SECS):
+            logger.warning("exiting with cleanup deletes still queued")
+
+    def _delete_while_queued(self) -> None:
+        while True:
+            with self._cond:
+                if self._closed.is_set() or not (self._s3_keys or self._job_names):
+                    self._thread = None
+                    self._cond.notify_all()
+                    return
+                # lets deletes accumulate, unless a full chunk is already waiting
+                self._cond.wait_for(
+                    lambda: self._closed.is_set()
+                    or self._flushes > 0
+                    or len(self._s3_keys) >= S3_DELETE_OBJECTS_MAX_KEYS,
+                    timeout=self.linger_secs,
+                )
+                s3_keys = [
+                    self._s3_keys.popleft()
+                    for _ in range(min(len(self._s3_keys), S3_DELETE_OBJECTS_MAX_KEYS))
+                ]
+                job_names = list(self._job_names)
+                self._job_names.clear()
+                self._busy = True
+            try:
+                self._delete_objects(s3_keys)
+                for name in job_names:
+                    self._delete_job(name)
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def _delete_objects(self, s3_keys: List[str]) -> None:
+        if not s3_keys:
+            return
+        try:
+            errors = self.s3_client.delete_objects(
+                Bucket=self.s3_bucket,
+                Delete={"Objects": [{"Key": k} for k in s3_keys], "Quiet": True},
+            ).get("Errors", [])
+            for e in errors:
+                logger.warning(
+                    f"failed to delete s3://{self.s3_bucket}/{e.get('Key')}: {e.get('Message')}"
+                )
+        except Exception as ex:
+            logger.warning(f"failed to delete {len(s3_keys)} objects from s3: {ex}")
+
+    def _delete_job(self, job_name: str) -> None:
+        try:
+            self.transcribe_client.delete_transcription_job(
+                TranscriptionJobName=job_name
+            )
+        except Exception as ex:
+            logger.warning(f"failed to delete transcribe job {job_name}: {ex}")
@@ -0,0 +1,151 @@
+#
+# This software is Copyright ©️ 2020 The University of Southern California. All Rights Reserved.
+# Permission to use, copy, modify, and distribute this software and its documentation for educational, research and non-profit purposes, without fee, and without a written agreement is hereby granted, provided that the above copyright notice and subject to the full license file found in the root of this software deliverable. Permission to make commercial use of this software may be obtained by contacting:  USC Stevens Center for Innovation University of Southern California 1150 S. Olive Street, Suite 2300, Los Angeles, CA 90115, USA Email: accounting@stevens.usc.edu
+#
+# The full terms of this copyright and license should always be found in the root directory of this software deliverable as "license.txt" and if these terms are not found with this software, please contact the USC Stevens Center for the full license.
+#
+import json
+import logging
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+DEFAULT_COMPLETION_QUEUE_WAIT_SECS: int = 20
+DEFAULT_COMPLETION_QUEUE_FALLBACK_POLL_INTERVAL: float = 60.0
+# how often transcribe_async checks for events received
+JOB_EVENT_CHECK_INTERVAL: float = 0.25
+
+logger = logging.getLogger(__name__)
+
+
+def parse_job_event(body: str) -> Optional[Dict[str, Any]]:
+    """
+    Parses the body of an SQS message carrying a Transcribe Job State Change
+    event (delivered by EventBridge, either directly or through SNS)
+    into a job summary like those from list_transcription_jobs,
+    or returns None if the message isn't such an event
+    """
+    try:
+        event = json.loads(body)
+        if "detail" not in event and "Message" in event:
+            event = json.loads(event["Message"])
+        detail = event.get("detail") or {}
+        if not detail.get("TranscriptionJobName"):
+            return None
+        return {
+            "TranscriptionJobName": detail["TranscriptionJobName"],
+            "TranscriptionJobStatus": detail.get("TranscriptionJobStatus", ""),
+        }
+    except (ValueError, AttributeError, TypeError):
+        return None
+
+
+class SqsJobEventSource:
+    """
+    Receives the state-change events of transcribe jobs from an SQS queue
+    (the target of an EventBridge rule for source aws.transcribe)
+    so completions are known without listing jobs.
+
+    A single background thread long-polls the queue while any jobs
+    are registered (see add_jobs), keeping the latest event of each
+    registered job until a batch takes it.
+    The queue is assumed to be dedicated to this source, so every message
+    received is deleted: others (e.g. events of other jobs in the account,
+    or late events of jobs already resolved by polling) would otherwise
+    be received again and again, crowding out the events that matter.
+
+    The source is shared by all batches of a service
+    and is safe to use from multiple threads.
+    """
+
+    def __init__(
+        self,
+        sqs_client: Any,
+        queue_url: str,
+        wait_secs: int = DEFAULT_COMPLETION_QUEUE_WAIT_SECS,
+    ):
+        self.sqs_client = sqs_client
+        self.queue_url = queue_url
+        self.wait_secs = max(0, min(20, int(wait_secs)))
+        self._cond = threading.Condition()
+        self._jobs: Set[str] = set()
+        self._events: Dict[str, Dict[str, Any]] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._closed = threading.Event()
+
+    def add_jobs(self, job_ids: Iterable[str]) -> None:
+        with self._cond:
+            self._jobs.update(job_ids)
+            if self._jobs and self._thread is None and not self._closed.is_set():
+                self._thread = threading.Thread(
+                    target=self._receive_while_jobs_registered,
+                    name="transcribe-job-events",
+                    daemon=True,
+                )
+                self._thread.start()
+
+    def remove_jobs(self, job_ids: Iterable[str]) -> None:
+        with self._cond:
+            for jid in job_ids:
+                self._jobs.discard(jid)
+                self._events.pop(jid, None)
+
+    def take(self, job_ids: Iterable[str]) -> List[Dict[str, Any]]:
+        """
+        Returns (and forgets) the events received for the given jobs
+        """
+        with self._cond:
+            return [self._events.pop(j) for j in job_ids if j in self._events]
+
+    def wait(self, job_ids: List[str], timeout: float) -> List[Dict[str, Any]]:
+        """
+        Waits up to timeout secs for events for any of the given jobs,
+        returning them as soon as there are some
+        """
+        with self._cond:
+            self._cond.wait_for(
+                lambda: any(j in self._events for j in job_ids), timeout=timeout
+            )
+            return self.take(job_ids)
+
+    def close(self) -> None:
+        """
+        Stops receiving events (after any receive in progress)
+        """
+        self._closed.set()
+
+    def _receive_while_jobs_registered(self) -> None:
+        while True:
+            with self._cond:
+                if not self._jobs or self._closed.is_set():
+                    self._thread = None
+                    return
+            try:
+                self._receive()
+            except Exception as ex:
+                logger.warning(f"failed to receive job events from queue: {ex}")
+                # back off, as the queue may be missing or throttled
+                self._closed.wait(1)
+
+    def _receive(self) -> None:
+        messages = self.sqs_client.receive_message(
+            QueueUrl=self.queue_url,
+            MaxNumberOfMessages=10,
+            WaitTimeSeconds=self.wait_secs,
+        ).get("Messages", [])
+        receipts = [
+            {"Id": str(i), "ReceiptHandle": m["ReceiptHandle"]}
+            for i, m in enumerate(messages)
+        ]
+        with self._cond:
+            notify = False
+            for m in messages:
+                summary = parse_job_event(m.get("Body", ""))
+                if summary and summary["TranscriptionJobName"] in self._jobs:
+                    self._events[summary["TranscriptionJobName"]] = summary
+                    notify = True
+            if notify:
+                self._cond.notify_all()
+        if receipts:
+            self.sqs_client.delete_message_batch(
+                QueueUrl=self.queue_url, Entries=receipts
+            )
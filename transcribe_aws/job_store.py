@@ -0,0 +1,194 @@
+#
+# This software is Copyright ©️ 2020 The University of Southern California. All Rights Reserved.
+# Permission to use, copy, modify, and distribute this software and its documentation for educational, research and non-profit purposes, without fee, and without a written agreement is hereby granted, provided that the above copyright notice and subject to the full license file found in the root of this software deliverable. Permission to make commercial use of this software may be obtained by contacting:  USC Stevens Center for Innovation University of Southern California 1150 S. Olive Street, Suite 2300, Los Angeles, CA 90115, USA Email: accounting@stevens.usc.edu
+#
+# The full terms of this copyright and license should always be found in the root directory of this software deliverable as "license.txt" and if these terms are not found with this software, please contact the USC Stevens Center for the full license.
+#
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+from transcribe import (
+    TranscribeBatchResult,
+    TranscribeBatchResultSummary,
+    TranscribeJob,
+    TranscribeJobStatus,
+)
+
+
+class JobRecord:
+    """
+    Mutable state of one job of a batch.
+
+    The TranscribeJob for the record's current state is created
+    only when asked for (see to_job) and reused until the record changes,
+    so jobs that don't change between snapshots are never copied.
+    """
+
+    __slots__ = (
+        "batchId",
+        "jobId",
+        "sourceFile",
+        "mediaFormat",
+        "languageCode",
+        "generateSubtitles",
+        "status",
+        "transcript",
+        "info",
+        "_job",
+    )
+
+    def __init__(self, job: TranscribeJob):
+        self.batchId = job.batchId
+        self.jobId = job.jobId
+        self.sourceFile = job.sourceFile
+        self.mediaFormat = job.mediaFormat
+        self.languageCode = job.languageCode
+        self.generateSubtitles = job.generateSubtitles
+        self.status = job.status
+        self.transcript = job.transcript
+        self.info = job.info
+        self._job: Optional[TranscribeJob] = job
+
+    def get_fq_id(self) -> str:
+        return f"{self.batchId}-{self.jobId}"
+
+    def is_resolved(self) -> bool:
+        return self.status in (
+            TranscribeJobStatus.SUCCEEDED,
+            TranscribeJobStatus.FAILED,
+        )
+
+    def update(
+        self,
+        status: TranscribeJobStatus,
+        transcript: str = "",
+        info: Optional[Dict[str, str]] = None,
+    ) -> bool:
+        """
+        Sets the record's status (and transcript and info),
+        returning False if the status is unchanged.
+        Same semantics as TranscribeBatchResult.update_job
+        """
+        if self.status == status:
+            return False
+        self.status = status or TranscribeJobStatus.NONE
+        self.transcript = transcript or ""
+        self.info = info or {}
+        self._job = None
+        return True
+
+    def set_media_format(self, media_format: str) -> None:
+        if media_format != self.mediaFormat:
+            self.mediaFormat = media_format
+            self._job = None
+
+    def to_job(self) -> TranscribeJob:
+        if self._job is None:
+            self._job = TranscribeJob(
+                batchId=self.batchId,
+                jobId=self.jobId,
+                sourceFile=self.sourceFile,
+                mediaFormat=self.mediaFormat,
+                languageCode=self.languageCode,
+                status=self.status,
+                transcript=self.transcript,
+                generateSubtitles=self.generateSubtitles,
+                info=self.info,
+            )
+        return self._job
+
+
+class JobStore:
+    """
+    The jobs of a batch, updated in place as the batch progresses.
+
+    Where a TranscribeBatchResult would have to be copied for every change
+    (since results passed to on_update must not change after),
+    the store is only turned into a result by snapshot,
+    when a result is actually needed.
+
+    The ids of the jobs in each status are indexed (and kept in order
+    of their transition to that status), so counting or listing the jobs
+    in a status costs nothing for the jobs in other statuses.
+    All updates must go through the store to keep the index current.
+
+    Used only by the thread running the batch.
+    """
+
+    def __init__(self) -> None:
+        self.records: Dict[str, JobRecord] = {}
+        # the values are all None; dicts are used as insertion-ordered sets
+        self._ids_by_status: Dict[TranscribeJobStatus, Dict[str, None]] = {
+            s: {} for s in TranscribeJobStatus
+        }
+
+    def __contains__(self, jid: object) -> bool:
+        return jid in self.records
+
+    def __iter__(self) -> Iterator[JobRecord]:
+        return iter(self.records.values())
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def add(self, job: TranscribeJob) -> str:
+        jid = job.get_fq_id()
+        self.remove(jid)
+        self.records[jid] = JobRecord(job)
+        self._ids_by_status[job.status][jid] = None
+        return jid
+
+    def remove(self, jid: str) -> None:
+        record = self.records.pop(jid, None)
+        if record is not None:
+            del self._ids_by_status[record.status][jid]
+
+    def get(self, jid: str) -> JobRecord:
+        return self.records[jid]
+
+    def update(
+        self,
+        jid: str,
+        status: TranscribeJobStatus,
+        transcript: str = "",
+        info: Optional[Dict[str, str]] = None,
+    ) -> bool:
+        if jid not in self.records:
+            raise Exception(
+                f"update for untracked transcribe job id '{jid}' (known ids={sorted(self.records.keys())})"
+            )
+        record = self.records[jid]
+        status_prev = record.status
+        if not record.update(status, transcript, info):
+            return False
+        del self._ids_by_status[status_prev][jid]
+        self._ids_by_status[record.status][jid] = None
+        return True
+
+    def count(
+        self, statuses: Union[TranscribeJobStatus, Iterable[TranscribeJobStatus]]
+    ) -> int:
+        if isinstance(statuses, TranscribeJobStatus):
+            return len(self._ids_by_status[statuses])
+        return sum(len(self._ids_by_status[s]) for s in statuses)
+
+    def ids(
+        self, statuses: Union[TranscribeJobStatus, Iterable[TranscribeJobStatus]]
+    ) -> List[str]:
+        if isinstance(statuses, TranscribeJobStatus):
+            return list(self._ids_by_status[statuses])
+        return [jid for s in statuses for jid in self._ids_by_status[s]]
+
+    def set_media_format(self, jid: str, media_format: str) -> None:
+        self.records[jid].set_media_format(media_format)
+
+    def snapshot(self) -> TranscribeBatchResult:
+        return TranscribeBatchResult(
+            transcribeJobsById={jid: r.to_job() for jid, r in self.records.items()}
+        )
+
+    def summary(self) -> TranscribeBatchResultSummary:
+        return TranscribeBatchResultSummary(
+            jobCountsByStatus={
+                s: len(ids) for s, ids in self._ids_by_status.items() if ids
+            }
+        )
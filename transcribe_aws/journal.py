@@ -0,0 +1,77 @@
+#
+# This software is Copyright ©️ 2020 The University of Southern California. All Rights Reserved.
+# Permission to use, copy, modify, and distribute this software and its documentation for educational, research and non-profit purposes, without fee, and without a written agreement is hereby granted, provided that the above copyright notice and subject to the full license file found in the root of this software deliverable. Permission to make commercial use of this software may be obtained by contacting:  USC Stevens Center for Innovation University of Southern California 1150 S. Olive Street, Suite 2300, Los Angeles, CA 90115, USA Email: accounting@stevens.usc.edu
+#
+# The full terms of this copyright and license should always be found in the root directory of this software deliverable as "license.txt" and if these terms are not found with this software, please contact the USC Stevens Center for the full license.
+#
+import json
+import os
+from typing import Any, Dict, Optional
+
+from transcribe import TranscribeJobStatus
+
+
+class BatchJournal:
+    """
+    Append-only JSONL journal of the status transitions of a batch's jobs,
+    so a batch interrupted by a crash or redeploy can be resumed
+    (see read_journal and transcribe's resume).
+
+    Each line records one transition of one job:
+    its id, new status and, when known, the s3 path and media format
+    of its source file and (once SUCCEEDED) its transcript and info.
+    Lines are flushed as they're written, so at most the line being written
+    when the process dies is lost.
+    """
+
+    def __init__(self, path: str, append: bool = False):
+        dir_name = os.path.dirname(path)
+        if dir_name:
+            os.makedirs(dir_name, exist_ok=True)
+        self.path = path
+        self._file = open(path, "a" if append else "w", encoding="utf-8")
+
+    def record(
+        self,
+        jid: str,
+        status: TranscribeJobStatus,
+        s3_path: str = "",
+        transcript: str = "",
+        info: Optional[Dict[str, str]] = None,
+        media_format: str = "",
+    ) -> None:
+        entry: Dict[str, Any] = {"id": jid, "status": status.name}
+        if s3_path:
+            entry["s3Path"] = s3_path
+        if media_format:
+            entry["mediaFormat"] = media_format
+        if transcript:
+            entry["transcript"] = transcript
+        if info:
+            entry["info"] = info
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def read_journal(path: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Reads a batch journal, returning the latest entry for each job
+    (with fields from earlier entries it doesn't override, e.g. s3Path).
+    Lines that can't be parsed, e.g. one torn by a crash, are skipped.
+    """
+    entries: Dict[str, Dict[str, Any]] = {}
+    if not os.path.exists(path):
+        return entries
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+                jid = entry["id"]
+                TranscribeJobStatus[entry["status"]]
+            except (ValueError, TypeError, KeyError):
+                continue
+            entries.setdefault(jid, {}).update(entry)
+    return entries
@@ -0,0 +1,117 @@
+#
+# This software is Copyright ©️ 2020 The University of Southern California. All Rights Reserved.
+# Permission to use, copy, modify, and distribute this software and its documentation for educational, research and non-profit purposes, without fee, and without a written agreement is hereby granted, provided that the above copyright notice and subject to the full license file found in the root of this software deliverable. Permission to make commercial use of this software may be obtained by contacting:  USC Stevens Center for Innovation University of Southern California 1150 S. Olive Street, Suite 2300, Los Angeles, CA 90115, USA Email: accounting@stevens.usc.edu
+#
+# The full terms of this copyright and license should always be found in the root directory of this software deliverable as "license.txt" and if these terms are not found with this software, please contact the USC Stevens Center for the full license.
+#
+import heapq
+import os
+import time
+from typing import Callable, List, Optional, Set, Tuple
+import wave
+
+# rough model of how long aws takes to complete a job, used to schedule polls
+EXPECTED_JOB_OVERHEAD_SECS: float = 15.0
+EXPECTED_JOB_SECS_PER_AUDIO_SEC: float = 0.5
+# used to estimate duration from file size for formats we can't read a header from
+ESTIMATED_COMPRESSED_AUDIO_BYTES_PER_SEC: float = 16000.0
+
+
+def estimate_audio_duration(source_file: str) -> Optional[float]:
+    """
+    Estimates the duration in seconds of an audio file:
+    exact for wav files, otherwise from the file size
+    assuming typical compressed bitrate.
+    Returns None if the file can't be read.
+    """
+    try:
+        if os.path.splitext(source_file)[1].lower() == ".wav":
+            with wave.open(source_file, "rb") as w:
+                return w.getnframes() / float(w.getframerate())
+        return os.path.getsize(source_file) / ESTIMATED_COMPRESSED_AUDIO_BYTES_PER_SEC
+    except (OSError, EOFError, wave.Error, ZeroDivisionError):
+        return None
+
+
+def estimate_job_secs(audio_duration: Optional[float]) -> Optional[float]:
+    if audio_duration is None:
+        return None
+    return EXPECTED_JOB_OVERHEAD_SECS + audio_duration * EXPECTED_JOB_SECS_PER_AUDIO_SEC
+
+
+class PollScheduler:
+    """
+    Decides how long to wait before each status poll of a batch.
+
+    The interval starts at min_interval and grows by the backoff factor
+    after every poll that finds no change, up to max_interval.
+    Any change resets it to min_interval.
+
+    Jobs started with an expected duration pull the next poll forward
+    to their expected completion time (but never below min_interval),
+    so short jobs are picked up soon after they finish
+    even when the interval has backed off.
+
+    With min_interval == max_interval, polls happen at a fixed interval.
+    """
+
+    def __init__(
+        self,
+        min_interval: float,
+        max_interval: float,
+        backoff: float = 2.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.backoff = max(1.0, backoff)
+        self.clock = clock
+        self.interval = self.min_interval
+        self._expected_completions: List[Tuple[float, str]] = []
+        self._expected_ids: Set[str] = set()
+        self._resolved: Set[str] = set()
+
+    def on_job_started(self, jid: str, expected_secs: Optional[float] = None) -> None:
+        if expected_secs is not None:
+            heapq.heappush(
+                self._expected_completions, (self.clock() + expected_secs, jid)
+            )
+            self._expected_ids.add(jid)
+
+    def on_job_resolved(self, jid: str) -> None:
+        if jid in self._expected_ids:
+            self._resolved.add(jid)
+
+    def on_poll(self, changed: bool) -> None:
+        self.interval = (
+            self.min_interval
+            if changed
+            else min(self.max_interval, self.interval * self.backoff)
+        )
+        # expected completions that have passed are served by this poll
+        now = self.clock()
+        while self._pop_resolved() and self._expected_completions[0][0] <= now:
+            _, jid = heapq.heappop(self._expected_completions)
+            self._expected_ids.discard(jid)
+
+    def next_interval(self) -> float:
+        if not self._pop_resolved():
+            return self.interval
+        return min(
+            self.interval,
+            max(self.min_interval, self._expected_completions[0][0] - self.clock()),
+        )
+
+    def _pop_resolved(self) -> bool:
+        """
+        Drops resolved jobs from the top of the expected completions heap
+        and returns True if any expected completions remain
+        """
+        while (
+            self._expected_completions
+            and self._expected_completions[0][1] in self._resolved
+        ):
+            _, jid = heapq.heappop(self._expected_completions)
+            self._expected_ids.discard(jid)
+            self._resolved.discard(jid)
+        return bool(self._expected_completions)
@@ -0,0 +1,136 @@
+#
+# This software is Copyright ©️ 2020 The University of Southern California. All Rights Reserved.
+# Permission to use, copy, modify, and distribute this software and its documentation for educational, research and non-profit purposes, without fee, and without a written agreement is hereby granted, provided that the above copyright notice and subject to the full license file found in the root of this software deliverable. Permission to make commercial use of this software may be obtained by contacting:  USC Stevens Center for Innovation University of Southern California 1150 S. Olive Street, Suite 2300, Los Angeles, CA 90115, USA Email: accounting@stevens.usc.edu
+#
+# The full terms of this copyright and license should always be found in the root directory of this software deliverable as "license.txt" and if these terms are not found with this software, please contact the USC Stevens Center for the full license.
+#
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+import os
+import subprocess
+import tempfile
+import threading
+from typing import Dict, List, Optional
+
+DEFAULT_PREPROCESS_SAMPLE_RATE: int = 16000
+DEFAULT_PREPROCESS_FORMAT: str = "flac"
+# ffmpeg codec args for each output media format (as passed to aws transcribe)
+PREPROCESS_CODEC_ARGS: Dict[str, List[str]] = {
+    "flac": ["-c:a", "flac"],
+    "wav": ["-c:a", "pcm_s16le"],
+}
+
+
+class PreprocessError(Exception):
+    pass
+
+
+@dataclass
+class PreprocessedAudio:
+    path: str
+    media_format: str
+
+
+class AudioPreprocessor:
+    """
+    Shrinks source audio before it's uploaded, using ffmpeg:
+    downmixes to mono, resamples to `sample_rate`
+    (16kHz is all transcribe uses for speech)
+    and encodes as `media_format` (flac, or 16-bit wav).
+
+    Each file is converted by its own ffmpeg process,
+    launched from a pool of `max_workers` threads,
+    so conversions run in parallel and ahead of the uploads that need them.
+
+    Converted files are written to a temp dir,
+    and must be removed by the caller once uploaded (see discard).
+    """
+
+    def __init__(
+        self,
+        ffmpeg_path: str = "ffmpeg",
+        sample_rate: int = DEFAULT_PREPROCESS_SAMPLE_RATE,
+        media_format: str = DEFAULT_PREPROCESS_FORMAT,
+        max_workers: int = 0,
+    ):
+        if media_format not in PREPROCESS_CODEC_ARGS:
+            raise ValueError(
+                f"unsupported preprocess format '{media_format}' (expected one of {sorted(PREPROCESS_CODEC_ARGS.keys())})"
+            )
+        self.ffmpeg_path = ffmpeg_path
+        self.sample_rate = sample_rate
+        self.media_format = media_format
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def submit(self, source_file: str) -> "Future[PreprocessedAudio]":
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="transcribe-preprocess",
+                )
+            return self._executor.submit(self.preprocess, source_file)
+
+    def preprocess(self, source_file: str) -> PreprocessedAudio:
+        fd, path = tempfile.mkstemp(
+            prefix="transcribe-", suffix=f".{self.media_format}"
+        )
+        os.close(fd)
+        try:
+            subprocess.run(
+                [
+                    self.ffmpeg_path,
+                    "-nostdin",
+                    "-hide_banner",
+                    "-loglevel",
+                    "error",
+                    "-y",
+                    "-i",
+                    source_file,
+                    "-vn",
+                    "-ac",
+                    "1",
+                    "-ar",
+                    str(self.sample_rate),
+                    *PREPROCESS_CODEC_ARGS[self.media_format],
+                    path,
+                ],
+                check=True,
+                capture_output=True,
+            )
+        except (OSError, subprocess.CalledProcessError) as ex:
+            _remove(path)
+            stderr = getattr(ex, "stderr", b"") or b""
+            raise PreprocessError(
+                f"failed to preprocess {source_file}: {ex} {stderr.decode('utf-8', 'replace')[-500:]}"
+            )
+        return PreprocessedAudio(path=path, media_format=self.media_format)
+
+    def discard(self, audio: PreprocessedAudio) -> None:
+        _remove(audio.path)
+
+    def cancel(self, future: "Future[PreprocessedAudio]") -> None:
+        """
+        Cancels a conversion that isn't needed,
+        removing its output whenever it's done
+        """
+        if future.cancel():
+            return
+        future.add_done_callback(
+            lambda f: self.discard(f.result()) if f.exception() is None else None
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
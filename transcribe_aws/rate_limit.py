@@ -0,0 +1,201 @@
+#
+# This software is Copyright ©️ 2020 The University of Southern California. All Rights Reserved.
+# Permission to use, copy, modify, and distribute this software and its documentation for educational, research and non-profit purposes, without fee, and without a written agreement is hereby granted, provided that the above copyright notice and subject to the full license file found in the root of this software deliverable. Permission to make commercial use of this software may be obtained by contacting:  USC Stevens Center for Innovation University of Southern California 1150 S. Olive Street, Suite 2300, Los Angeles, CA 90115, USA Email: accounting@stevens.usc.edu
+#
+# The full terms of this copyright and license should always be found in the root directory of this software deliverable as "license.txt" and if these terms are not found with this software, please contact the USC Stevens Center for the full license.
+#
+from dataclasses import dataclass
+import threading
+import time
+from typing import Callable, Optional
+
+DEFAULT_START_JOB_MAX_RATE: float = 10.0
+DEFAULT_START_JOB_MIN_RATE: float = 0.1
+DEFAULT_START_JOB_MIN_BACKOFF: float = 1.0
+DEFAULT_START_JOB_MAX_BACKOFF: float = 30.0
+
+
+@dataclass
+class StartJobRateLimiterStats:
+    rate: float
+    max_in_flight: Optional[int]
+    in_flight: int
+    starts: int
+    throttles: int
+    retries: int
+
+
+class StartJobRateLimiter:
+    """
+    Adaptive (AIMD) limiter for start_transcription_job.
+
+    Starts are paced by a token bucket refilled at `rate` starts per second.
+    The rate grows additively with each successful start (up to `max_rate`)
+    and is halved whenever aws responds with a throttling error.
+
+    A limit-exceeded response means the account's quota
+    of concurrent transcribe jobs is used up, so the number of jobs
+    in flight at that moment is learned as `max_in_flight`
+    and further starts wait until jobs resolve.
+    After a backoff, a single probe start is allowed past `max_in_flight`;
+    if it succeeds, `max_in_flight` grows by one.
+
+    The limiter is shared by all batches of a service
+    and is safe to use from multiple threads.
+    """
+
+    def __init__(
+        self,
+        max_rate: float = DEFAULT_START_JOB_MAX_RATE,
+        max_in_flight: int = 0,
+        min_backoff: float = DEFAULT_START_JOB_MIN_BACKOFF,
+        max_backoff: float = DEFAULT_START_JOB_MAX_BACKOFF,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_rate = max(max_rate, DEFAULT_START_JOB_MIN_RATE)
+        self.max_in_flight_ceiling = max_in_flight
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.clock = clock
+        self.rate = self.max_rate
+        self.max_in_flight: Optional[int] = max_in_flight or None
+        self.in_flight = 0
+        self.starts = 0
+        self.throttles = 0
+        self.retries = 0
+        self._lock = threading.RLock()
+        self._backoff = 0.0
+        self._next_attempt_at = 0.0
+        self._probing = False
+        self._retry_pending = False
+        self._tokens = 0.0
+        self._tokens_updated_at: Optional[float] = None
+
+    def acquire(self) -> bool:
+        """
+        Takes permission for one start attempt if one is available now.
+        Each successful acquire must be followed by exactly one call
+        to on_started, on_throttled or on_failed.
+        """
+        with self._lock:
+            if self.delay() > 0:
+                return False
+            self._tokens -= 1.0
+            self._probing = self._at_max_in_flight()
+            if self._retry_pending:
+                self.retries += 1
+            return True
+
+    def delay(self) -> float:
+        """
+        Returns the number of seconds to wait before the next start attempt
+        (0 if a start can be attempted now).
+
+        Returns infinity when the configured ceiling of jobs in flight is reached,
+        in which case no start is possible until some job resolves.
+        """
+        with self._lock:
+            if (
+                self.max_in_flight_ceiling
+                and self.in_flight >= self.max_in_flight_ceiling
+            ):
+                return float("inf")
+            now = self.clock()
+            self._refill_tokens(now)
+            if self._at_max_in_flight():
+                if self._probing:
+                    return self.min_backoff
+                if not self._backoff:
+                    # wait a backoff before probing past the learned limit
+                    self._backoff = self.min_backoff
+                    self._next_attempt_at = now + self._backoff
+            wait_tokens = (1.0 - self._tokens) / self.rate if self._tokens < 1 else 0
+            return max(wait_tokens, self._next_attempt_at - now, 0.0)
+
+    def on_started(self) -> None:
+        with self._lock:
+            if self._probing:
+                assert self.max_in_flight is not None
+                self.max_in_flight += 1
+            self.in_flight += 1
+            self.starts += 1
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+            self._backoff = 0.0
+            self._next_attempt_at = 0.0
+            self._probing = False
+            self._retry_pending = False
+
+    def on_adopted(self, n: int = 1) -> None:
+        """
+        Records n jobs already in flight that weren't started by this limiter,
+        e.g. those of a resumed batch
+        """
+        with self._lock:
+            self.in_flight += n
+
+    def on_throttled(self, limit_exceeded: bool = False) -> None:
+        """
+        Records a start attempt rejected with a throttling response
+        or, if limit_exceeded, rejected because the account
+        has reached its limit of concurrent transcribe jobs.
+        """
+        with self._lock:
+            self.throttles += 1
+            if limit_exceeded:
+                self.max_in_flight = max(1, self.in_flight)
+            else:
+                self.rate = max(DEFAULT_START_JOB_MIN_RATE, self.rate / 2)
+            self._probing = False
+            self._back_off()
+
+    def on_failed(self) -> None:
+        """
+        Records a start attempt that failed for a reason other than throttling.
+        """
+        with self._lock:
+            self._probing = False
+            self._back_off()
+
+    def on_resolved(self, n: int = 1) -> None:
+        """
+        Records that n started jobs have reached a terminal state,
+        which frees room for more jobs in flight.
+        """
+        with self._lock:
+            if n <= 0:
+                return
+            was_at_max_in_flight = self._at_max_in_flight()
+            self.in_flight = max(0, self.in_flight - n)
+            if was_at_max_in_flight and not self._at_max_in_flight():
+                self._backoff = 0.0
+                self._next_attempt_at = 0.0
+
+    def stats(self) -> StartJobRateLimiterStats:
+        with self._lock:
+            return StartJobRateLimiterStats(
+                rate=self.rate,
+                max_in_flight=self.max_in_flight,
+                in_flight=self.in_flight,
+                starts=self.starts,
+                throttles=self.throttles,
+                retries=self.retries,
+            )
+
+    def _at_max_in_flight(self) -> bool:
+        return self.max_in_flight is not None and self.in_flight >= self.max_in_flight
+
+    def _back_off(self) -> None:
+        self._backoff = min(
+            self.max_backoff, self._backoff * 2 if self._backoff else self.min_backoff
+        )
+        self._next_attempt_at = self.clock() + self._backoff
+        self._retry_pending = True
+
+    def _refill_tokens(self, now: float) -> None:
+        capacity = max(1.0, self.rate)
+        if self._tokens_updated_at is None:
+            self._tokens = capacity
+        else:
+            elapsed = max(0.0, now - self._tokens_updated_at)
+            self._tokens = min(capacity, self._tokens + elapsed * self.rate)
+        self._tokens_updated_at = now
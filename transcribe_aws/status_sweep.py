@@ -0,0 +1,168 @@
+#
+# This software is Copyright ©️ 2020 The University of Southern California. All Rights Reserved.
+# Permission to use, copy, modify, and distribute this software and its documentation for educational, research and non-profit purposes, without fee, and without a written agreement is hereby granted, provided that the above copyright notice and subject to the full license file found in the root of this software deliverable. Permission to make commercial use of this software may be obtained by contacting:  USC Stevens Center for Innovation University of Southern California 1150 S. Olive Street, Suite 2300, Los Angeles, CA 90115, USA Email: accounting@stevens.usc.edu
+#
+# The full terms of this copyright and license should always be found in the root directory of this software deliverable as "license.txt" and if these terms are not found with this software, please contact the USC Stevens Center for the full license.
+#
+from collections import deque
+from dataclasses import dataclass
+import logging
+import threading
+import time
+from typing import Any, Callable, Deque, Dict, List, Set
+
+DEFAULT_STATUS_SWEEP_MAX_PAGES: int = 10
+DEFAULT_STATUS_SWEEP_MAX_BATCH_CALLS: int = 5
+LIST_JOBS_MAX_RESULTS: int = 100
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class StatusSweeperStats:
+    sweeps: int
+    list_calls: int
+    batch_calls: int
+
+
+class StatusSweeper:
+    """
+    Checks the status of the jobs of all of a service's active batches
+    with one consolidated sweep of list_transcription_jobs,
+    instead of a separate listing for each batch.
+
+    A sweep pages through the account's most recent jobs
+    (newest first, so active batches are near the front)
+    until it has seen every job waiting on a result, or `max_pages`.
+    Batches with jobs the sweep didn't reach are then listed individually,
+    at most `max_batch_calls` per sweep and in round-robin order,
+    so no batch is starved when many are active.
+
+    A batch that polls within `min_interval` of a sweep that already
+    included all its jobs gets that sweep's results without any api call.
+
+    The sweeper is shared by all batches of a service
+    and is safe to use from multiple threads.
+    """
+
+    def __init__(
+        self,
+        list_jobs: Callable[..., Dict[str, Any]],
+        get_batch_status: Callable[[str, List[str]], List[Dict[str, Any]]],
+        min_interval: float,
+        max_pages: int = DEFAULT_STATUS_SWEEP_MAX_PAGES,
+        max_batch_calls: int = DEFAULT_STATUS_SWEEP_MAX_BATCH_CALLS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.list_jobs = list_jobs
+        self.get_batch_status = get_batch_status
+        self.min_interval = min_interval
+        self.max_pages = max(1, max_pages)
+        self.max_batch_calls = max_batch_calls
+        self.clock = clock
+        self.sweeps = 0
+        self.list_calls = 0
+        self.batch_calls = 0
+        self._lock = threading.RLock()
+        # ids of jobs waiting on a result, by batch
+        self._pending: Dict[str, Set[str]] = {}
+        # batches in the order they get individual listings
+        self._rotation: Deque[str] = deque()
+        self._swept_at = float("-inf")
+        self._swept_ids: Set[str] = set()
+        self._swept_by_batch: Dict[str, List[Dict[str, Any]]] = {}
+
+    def add_jobs(self, batch_id: str, job_ids: List[str]) -> None:
+        """
+        Adds started jobs of a batch to those the next sweep looks for
+        """
+        with self._lock:
+            self._register(batch_id).update(job_ids)
+
+    def get_status(self, batch_id: str, job_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        Returns job summaries (as from list_transcription_jobs)
+        for the given jobs of a batch, sweeping if needed.
+        Jobs of the batch that aren't given are no longer looked for.
+        """
+        with self._lock:
+            self._register(batch_id)
+            self._pending[batch_id] = set(job_ids)
+            if (
+                self.clock() - self._swept_at >= self.min_interval
+                or not self._pending[batch_id] <= self._swept_ids
+            ):
+                self._sweep()
+            return list(self._swept_by_batch.get(batch_id, []))
+
+    def _register(self, batch_id: str) -> Set[str]:
+        if batch_id not in self._pending:
+            self._pending[batch_id] = set()
+            # ahead of batches already served
+            self._rotation.appendleft(batch_id)
+        return self._pending[batch_id]
+
+    def unregister(self, batch_id: str) -> None:
+        with self._lock:
+            self._pending.pop(batch_id, None)
+            self._swept_by_batch.pop(batch_id, None)
+            if batch_id in self._rotation:
+                self._rotation.remove(batch_id)
+
+    def stats(self) -> StatusSweeperStats:
+        with self._lock:
+            return StatusSweeperStats(
+                sweeps=self.sweeps,
+                list_calls=self.list_calls,
+                batch_calls=self.batch_calls,
+            )
+
+    def _sweep(self) -> None:
+        self.sweeps += 1
+        self._swept_at = self.clock()
+        batch_by_job_id = {
+            jid: bid for bid, jids in self._pending.items() for jid in jids
+        }
+        self._swept_ids = set(batch_by_job_id.keys())
+        swept_by_batch: Dict[str, List[Dict[str, Any]]] = {
+            bid: [] for bid in self._pending
+        }
+        ids_unseen = set(batch_by_job_id.keys())
+        kwargs: Dict[str, Any] = {"MaxResults": LIST_JOBS_MAX_RESULTS}
+        try:
+            for _ in range(self.max_pages):
+                if not ids_unseen:
+                    break
+                self.list_calls += 1
+                page = self.list_jobs(**kwargs)
+                summaries = page.get("TranscriptionJobSummaries")
+                if not summaries:
+                    # see the NextToken mitigations in _get_batch_status
+                    break
+                for s in summaries:
+                    jid = s.get("TranscriptionJobName", "")
+                    if jid in ids_unseen:
+                        ids_unseen.remove(jid)
+                        swept_by_batch[batch_by_job_id[jid]].append(s)
+                next_token = page.get("NextToken", "")
+                if not next_token:
+                    break
+                kwargs["NextToken"] = next_token
+        except Exception as ex:
+            # usually throttling; listing batches individually would only make it worse
+            logger.warning(f"status sweep failed, will retry next sweep: {ex}")
+            self._swept_by_batch = swept_by_batch
+            return
+        batches_unseen = {batch_by_job_id[jid] for jid in ids_unseen}
+        batch_calls = 0
+        for bid in list(self._rotation):
+            if batch_calls >= self.max_batch_calls:
+                break
+            if bid not in batches_unseen:
+                continue
+            batch_calls += 1
+            self.batch_calls += 1
+            self._rotation.remove(bid)
+            self._rotation.append(bid)
+            swept_by_batch[bid] = self.get_batch_status(bid, sorted(self._pending[bid]))
+        self._swept_by_batch = swept_by_batch
@@ -0,0 +1,91 @@
+#
+# This software is Copyright ©️ 2020 The University of Southern California. All Rights Reserved.
+# Permission to use, copy, modify, and distribute this software and its documentation for educational, research and non-profit purposes, without fee, and without a written agreement is hereby granted, provided that the above copyright notice and subject to the full license file found in the root of this software deliverable. Permission to make commercial use of this software may be obtained by contacting:  USC Stevens Center for Innovation University of Southern California 1150 S. Olive Street, Suite 2300, Los Angeles, CA 90115, USA Email: accounting@stevens.usc.edu
+#
+# The full terms of this copyright and license should always be found in the root directory of this software deliverable as "license.txt" and if these terms are not found with this software, please contact the USC Stevens Center for the full license.
+#
+import json
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# bytes read at a time from a transcribe job's output document
+TRANSCRIPT_READ_CHUNK_SIZE: int = 64 * 1024
+
+_TRANSCRIPTS_KEY = re.compile(rb'(?<!\\)"transcripts"\s*:\s*')
+_JSON_DECODER = json.JSONDecoder()
+
+
+class TranscriptParseError(Exception):
+    pass
+
+
+def read_transcript(chunks: Iterable[bytes]) -> str:
+    """
+    Returns the transcript text (results.transcripts[0].transcript)
+    from the output document of a transcribe job, given as chunks of bytes.
+
+    The output of a long recording is mostly its `items`
+    (every word with timings and alternatives), which follow the transcript.
+    So rather than parse the whole document, this reads only until
+    the `transcripts` array is complete and decodes just that array.
+    Callers can stop the download as soon as it returns.
+
+    If the document doesn't have the expected layout,
+    falls back to reading and parsing all of it.
+    """
+    buf = bytearray()
+    key_end: Optional[int] = None
+    search_from = 0
+    for chunk in chunks:
+        buf.extend(chunk)
+        if key_end is None:
+            m = _TRANSCRIPTS_KEY.search(buf, search_from)
+            if not m:
+                # the key may be split across chunks
+                search_from = max(0, len(buf) - 32)
+                continue
+            key_end = m.end()
+        transcripts = _try_decode(buf, key_end)
+        if transcripts is not None:
+            return _first_transcript(transcripts)
+    try:
+        doc = json.loads(bytes(buf))
+    except ValueError as ex:
+        raise TranscriptParseError(f"invalid json: {ex}")
+    return _first_transcript((doc.get("results") or {}).get("transcripts"))
+
+
+def read_transcript_and_items(
+    chunks: Iterable[bytes],
+) -> Tuple[str, List[Dict[str, Any]]]:
+    """
+    Returns the transcript text and the items (the words with their timings)
+    from the output document of a transcribe job, given as chunks of bytes.
+    Unlike read_transcript, this reads and parses the whole document.
+    """
+    try:
+        doc = json.loads(b"".join(chunks))
+    except ValueError as ex:
+        raise TranscriptParseError(f"invalid json: {ex}")
+    results = doc.get("results") or {}
+    return _first_transcript(results.get("transcripts")), results.get("items") or []
+
+
+def _try_decode(buf: bytearray, start: int) -> Any:
+    """
+    Decodes the json value at start of buf,
+    or returns None if buf doesn't yet hold all of it
+    """
+    try:
+        # a trailing partial utf-8 sequence can only be past the value's end
+        value, _ = _JSON_DECODER.raw_decode(buf[start:].decode("utf-8", "ignore"))
+        return value
+    except ValueError:
+        return None
+
+
+def _first_transcript(transcripts: Any) -> str:
+    try:
+        return str(transcripts[0]["transcript"])
+    except (TypeError, KeyError, IndexError):
+        raise TranscriptParseError(f"no transcript in {str(transcripts)[:200]}")
@@ -0,0 +1,151 @@
+#
+# This software is Copyright ©️ 2020 The University of Southern California. All Rights Reserved.
+# Permission to use, copy, modify, and distribute this software and its documentation for educational, research and non-profit purposes, without fee, and without a written agreement is hereby granted, provided that the above copyright notice and subject to the full license file found in the root of this software deliverable. Permission to make commercial use of this software may be obtained by contacting:  USC Stevens Center for Innovation University of Southern California 1150 S. Olive Street, Suite 2300, Los Angeles, CA 90115, USA Email: accounting@stevens.usc.edu
+#
+# The full terms of this copyright and license should always be found in the root directory of this software deliverable as "license.txt" and if these terms are not found with this software, please contact the USC Stevens Center for the full license.
+#
+from array import array
+import base64
+import struct
+import sys
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from transcribe import TranscribeJob
+
+# key in TranscribeJob.info of a job's encoded WordTimings
+WORD_TIMINGS_INFO_KEY: str = "wordTimings"
+
+_MAGIC = b"TWT1"
+_HEADER = struct.Struct("<4sII")
+
+
+class WordTimings:
+    """
+    The words (and punctuation) of a transcript with their timings,
+    as parallel arrays with one entry per word,
+    rather than a dict per word like the items of a transcribe job's output:
+    start and end in milliseconds, confidence,
+    and the index of the word's text in `tokens`,
+    a table in which each distinct word appears once.
+    Punctuation has the end time of the word before it
+    as both its start and end.
+
+    Jobs carry their word timings (see WORD_TIMINGS) encoded
+    in info[WORD_TIMINGS_INFO_KEY]; use from_job to decode them.
+    """
+
+    __slots__ = ("starts", "ends", "confidences", "token_ids", "tokens")
+
+    def __init__(
+        self,
+        starts: Optional[array] = None,
+        ends: Optional[array] = None,
+        confidences: Optional[array] = None,
+        token_ids: Optional[array] = None,
+        tokens: Optional[List[str]] = None,
+    ):
+        self.starts = starts if starts is not None else array("I")
+        self.ends = ends if ends is not None else array("I")
+        self.confidences = confidences if confidences is not None else array("f")
+        self.token_ids = token_ids if token_ids is not None else array("I")
+        self.tokens = tokens if tokens is not None else []
+
+    def __len__(self) -> int:
+        return len(self.token_ids)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, WordTimings) and all(
+            getattr(self, a) == getattr(other, a) for a in self.__slots__
+        )
+
+    def words(self) -> Iterator[Tuple[float, float, float, str]]:
+        """
+        Yields each word as (start secs, end secs, confidence, text)
+        """
+        for i in range(len(self)):
+            yield (
+                self.starts[i] / 1000.0,
+                self.ends[i] / 1000.0,
+                self.confidences[i],
+                self.tokens[self.token_ids[i]],
+            )
+
+    def to_bytes(self) -> bytes:
+        columns = [self.starts, self.ends, self.confidences, self.token_ids]
+        if sys.byteorder == "big":
+            columns = [array(c.typecode, c) for c in columns]
+            for c in columns:
+                c.byteswap()
+        tokens = [t.encode("utf-8") for t in self.tokens]
+        return b"".join(
+            [_HEADER.pack(_MAGIC, len(self), len(tokens))]
+            + [c.tobytes() for c in columns]
+            + [struct.pack("<I", len(t)) + t for t in tokens]
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "WordTimings":
+        magic, n_words, n_tokens = _HEADER.unpack_from(data)
+        if magic != _MAGIC:
+            raise ValueError("not encoded word timings")
+        pos = _HEADER.size
+        columns: List[array] = []
+        for typecode in ["I", "I", "f", "I"]:
+            c = array(typecode)
+            c.frombytes(data[pos : pos + n_words * c.itemsize])
+            pos += n_words * c.itemsize
+            if sys.byteorder == "big":
+                c.byteswap()
+            columns.append(c)
+        tokens: List[str] = []
+        for _ in range(n_tokens):
+            (n,) = struct.unpack_from("<I", data, pos)
+            pos += 4
+            tokens.append(data[pos : pos + n].decode("utf-8"))
+            pos += n
+        starts, ends, confidences, token_ids = columns
+        return cls(starts, ends, confidences, token_ids, tokens)
+
+    def encode(self) -> str:
+        """
+        Encodes as text, for TranscribeJob.info
+        """
+        return base64.b64encode(self.to_bytes()).decode("ascii")
+
+    @classmethod
+    def decode(cls, s: str) -> "WordTimings":
+        return cls.from_bytes(base64.b64decode(s))
+
+    @classmethod
+    def from_job(cls, job: TranscribeJob) -> Optional["WordTimings"]:
+        encoded = (job.info or {}).get(WORD_TIMINGS_INFO_KEY)
+        return cls.decode(encoded) if encoded else None
+
+
+def parse_word_timings(items: Iterable[Dict[str, Any]]) -> WordTimings:
+    """
+    Builds WordTimings from the `results.items` of a transcribe job's output
+    """
+    result = WordTimings()
+    token_ids: Dict[str, int] = {}
+    end = 0
+    for item in items:
+        alternative = (item.get("alternatives") or [{}])[0]
+        content = str(alternative.get("content", ""))
+        if "start_time" in item:
+            start = _to_ms(item["start_time"])
+            end = _to_ms(item.get("end_time", item["start_time"]))
+        else:
+            start = end
+        token_id = token_ids.setdefault(content, len(token_ids))
+        if token_id == len(result.tokens):
+            result.tokens.append(content)
+        result.starts.append(start)
+        result.ends.append(end)
+        result.confidences.append(float(alternative.get("confidence") or 0))
+        result.token_ids.append(token_id)
+    return result
+
+
+def _to_ms(secs: Any) -> int:
+    return max(0, int(round(float(secs) * 1000)))